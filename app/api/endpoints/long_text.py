@@ -75,9 +75,25 @@ async def create_long_text_job(request: LongTextRequest):
             session_id=request.session_id,
             streaming_chunk_size=request.streaming_chunk_size,
             streaming_strategy=request.streaming_strategy,
-            streaming_quality=request.streaming_quality
+            streaming_quality=request.streaming_quality,
+            seed=request.seed,
+            reuse_existing=request.reuse_existing
         )
 
+        # Identical submissions are completed immediately from an earlier job's output
+        metadata = job_manager._load_job_metadata(job_id)
+        if metadata and metadata.reused_from_job_id:
+            return LongTextJobCreateResponse(
+                job_id=job_id,
+                status=LongTextJobStatus.COMPLETED,
+                estimated_processing_time_seconds=0,
+                total_chunks=estimated_chunks,
+                message=f"Reused output of identical job {metadata.reused_from_job_id}",
+                status_url=f"/audio/speech/long/{job_id}",
+                sse_url=f"/audio/speech/long/{job_id}/sse",
+                reused_from_job_id=metadata.reused_from_job_id
+            )
+
         # Submit for background processing
         await processor.submit_job(job_id)
 
@@ -2,7 +2,6 @@
 Memory management endpoints
 """
 
-import torch
 from typing import Optional, Dict, Any
 from fastapi import APIRouter, Query, HTTPException, status
 
@@ -77,6 +76,7 @@ async def memory_management(
 ):
     """Memory management endpoint for monitoring and cleanup"""
     global REQUEST_COUNTER
+    import torch
     
     memory_info = get_memory_info()
     
@@ -121,6 +121,7 @@ async def memory_management(
 async def reset_memory_tracking(confirm: bool = Query(False, description="Confirm the reset operation")):
     """Reset memory tracking and perform aggressive cleanup"""
     global REQUEST_COUNTER
+    import torch
     
     if not confirm:
         return {
@@ -168,6 +169,8 @@ async def reset_memory_tracking(confirm: bool = Query(False, description="Confir
 )
 async def get_memory_config():
     """Get memory management configuration"""
+    import torch
+    
     return {
         "config": {
             "memory_cleanup_interval": Config.MEMORY_CLEANUP_INTERVAL,
@@ -221,6 +224,8 @@ async def update_memory_config(
 )
 async def get_memory_recommendations():
     """Get memory optimization recommendations based on current usage"""
+    import torch
+    
     memory_info = get_memory_info()
     recommendations = []
     
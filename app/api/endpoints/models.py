@@ -1,11 +1,19 @@
 """
-Model listing endpoints (OpenAI compatibility)
+Model listing (OpenAI compatibility) and model registry endpoints
 """
 
-from fastapi import APIRouter
+import asyncio
+from typing import Any, Dict, Set
+
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import JSONResponse
 
 from app.models import ModelsResponse, ModelInfo
 from app.core import add_route_aliases
+from app.core.tts_model import (
+    ModelRegistryError, get_model_info, get_loaded_models, check_can_load_variant,
+    load_model_variant, activate_model_variant, unload_model_variant
+)
 
 # Create router with aliasing support
 base_router = APIRouter()
@@ -32,5 +40,108 @@ async def list_models():
         ]
     )
 
+
+# Background load/activate tasks (kept referenced until they finish)
+_registry_tasks: Set[asyncio.Task] = set()
+
+
+def registry_error(error: Exception) -> HTTPException:
+    """Convert a registry error into a 400 (unknown variant) or 409 (invalid in the current state)"""
+    if isinstance(error, ValueError):
+        return HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"error": {"message": str(error), "type": "invalid_request_error"}}
+        )
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail={"error": {"message": str(error), "type": "model_registry_error"}}
+    )
+
+
+def run_in_background(coro) -> None:
+    """Run a registry operation after the response has been sent, logging failures"""
+    async def runner():
+        try:
+            await coro
+        except Exception as e:
+            print(f"✗ Model registry operation failed: {e}")
+    
+    task = asyncio.create_task(runner())
+    _registry_tasks.add(task)
+    task.add_done_callback(_registry_tasks.discard)
+
+
+@router.get(
+    "/models/loaded",
+    summary="Get loaded models",
+    description="Get the model registry (resident and loading variants, memory footprints, routing) and model details"
+)
+async def get_loaded_models_info() -> Dict[str, Any]:
+    """Get the model registry and model details"""
+    return get_model_info()
+
+
+@router.post(
+    "/models/{variant}/load",
+    summary="Load a model variant",
+    description="Load the 'standard' or 'multilingual' model in the background (202) and keep it resident next to the active model. Requests are then routed by language."
+)
+async def load_model(variant: str):
+    """Start loading a second model variant"""
+    try:
+        check_can_load_variant(variant)
+    except (ValueError, ModelRegistryError) as e:
+        raise registry_error(e)
+    
+    if variant in get_loaded_models()["resident"]:
+        return {"message": f"The {variant} model is already loaded", "models": get_loaded_models()}
+    
+    run_in_background(load_model_variant(variant))
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content={"message": f"Loading the {variant} model in the background", "models": get_loaded_models()}
+    )
+
+
+@router.post(
+    "/models/{variant}/activate",
+    summary="Activate a model variant",
+    description="Make a model variant the active model. Requests already running finish on the previous model. If the variant is not resident it is loaded first (202)."
+)
+async def activate_model(variant: str):
+    """Swap the active model"""
+    try:
+        check_can_load_variant(variant, allow_over_budget=True)
+    except (ValueError, ModelRegistryError) as e:
+        raise registry_error(e)
+    
+    if variant not in get_loaded_models()["resident"]:
+        run_in_background(activate_model_variant(variant))
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content={"message": f"Loading the {variant} model; it becomes active once loaded", "models": get_loaded_models()}
+        )
+    
+    try:
+        await activate_model_variant(variant)
+    except ModelRegistryError as e:
+        raise registry_error(e)
+    return {"message": f"The {variant} model is active", "models": get_loaded_models()}
+
+
+@router.delete(
+    "/models/{variant}",
+    summary="Unload a model variant",
+    description="Unload an inactive model variant. Its memory is freed once requests already running on it have finished."
+)
+async def unload_model(variant: str) -> Dict[str, Any]:
+    """Unload an inactive model variant"""
+    try:
+        await unload_model_variant(variant)
+    except (ValueError, ModelRegistryError) as e:
+        raise registry_error(e)
+    return {"message": f"The {variant} model was unloaded", "models": get_loaded_models()}
+
+
 # Export the base router for the main app to use
 __all__ = ["base_router"] 
\ No newline at end of file
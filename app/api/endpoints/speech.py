@@ -6,14 +6,17 @@ import io
 import os
 import asyncio
 import tempfile
-import torch
-import torchaudio as ta
 import base64
+import hashlib
 import json
+import math
 import struct
-from typing import Optional, List, Dict, Any, AsyncGenerator
-from fastapi import APIRouter, HTTPException, status, Form, File, UploadFile
-from fastapi.responses import StreamingResponse
+from collections import deque
+from contextlib import aclosing
+from functools import partial
+from typing import TYPE_CHECKING, Optional, List, Dict, Any, AsyncGenerator, Callable, Tuple, Union
+from fastapi import APIRouter, HTTPException, Request, status, Form, File, UploadFile
+from fastapi.responses import Response, StreamingResponse
 
 from app.models import TTSRequest, ErrorResponse, SSEAudioDelta, SSEAudioDone, SSEUsageInfo, SSEAudioInfo
 from app.config import Config
@@ -22,8 +25,24 @@ from app.core import (
     split_text_into_chunks, concatenate_audio_chunks, add_route_aliases,
     TTSStatus, start_tts_request, update_tts_status, get_voice_library
 )
-from app.core.tts_model import get_model, is_multilingual
+from app.core.tts_model import (
+    get_model, model_variant, is_multilingual, supports_staged_generation, vocode_speech_tokens_incrementally, S3_TOKENS_PER_SECOND
+)
+from app.core.inference_scheduler import (
+    get_inference_scheduler, GenerationParams, Priority, AdmissionRejectedError
+)
 from app.core.text_processing import split_text_for_streaming, get_streaming_settings
+from app.core.singleflight import get_single_flight
+from app.core.voice_conditioning import get_conditioning_cache
+from app.core.response_cache import ResponseCache, get_response_cache
+from app.core.readiness import get_readiness_gate, ModelNotReadyError
+from app.core.audio_encoding import (
+    AUDIO_FORMATS, RESPONSE_FORMATS, STREAMING_FORMATS, get_audio_encoder
+)
+from app.core.audio_framing import TELEPHONY_FORMATS, FramePacer, PcmFramer, TelephonyEncoder
+
+if TYPE_CHECKING:
+    import torch
 
 # Create router with aliasing support
 base_router = APIRouter()
@@ -35,6 +54,13 @@ REQUEST_COUNTER = 0
 # Supported audio formats for voice uploads
 SUPPORTED_AUDIO_FORMATS = {'.mp3', '.wav', '.flac', '.m4a', '.ogg'}
 
+# How often (seconds) a streaming response checks whether its client is still connected
+DISCONNECT_POLL_INTERVAL = 0.25
+
+
+class ClientDisconnectedError(Exception):
+    """Raised inside a streaming generator when the client has gone away"""
+
 
 def create_wav_header(sample_rate: int, channels: int, bits_per_sample: int, data_size: int = 0xFFFFFFFF) -> bytes:
     """Creates a WAV header for streaming."""
@@ -106,6 +132,507 @@ def resolve_voice_path(voice_name: Optional[str]) -> str:
     return path
 
 
+def use_incremental_vocoding() -> bool:
+    """Whether streaming responses should vocode speech tokens in windows"""
+    return Config.ENABLE_INCREMENTAL_VOCODING and supports_staged_generation(get_model())
+
+
+def ms_to_speech_tokens(duration_ms: int) -> int:
+    """Convert an audio duration to a number of S3 speech tokens"""
+    return max(0, round(duration_ms * S3_TOKENS_PER_SECOND / 1000))
+
+
+def start_chunk_generation(
+    text: str,
+    generation_params: GenerationParams,
+    request_id: Optional[str] = None,
+    incremental: bool = False
+) -> asyncio.Task:
+    """Queue one streaming chunk on the inference scheduler (only its speech tokens when ``incremental``)"""
+    scheduler = get_inference_scheduler()
+    generate = scheduler.generate_tokens if incremental else scheduler.generate
+    return asyncio.ensure_future(
+        generate(text, generation_params, request_id=request_id, priority=Priority.INTERACTIVE_STREAMING)
+    )
+
+
+async def chunk_audio_pieces(
+    result: Any,
+    generation_params: GenerationParams,
+    incremental: bool = False
+) -> AsyncGenerator["torch.Tensor", None]:
+    """
+    Yield the audio of a chunk started with start_chunk_generation.
+    
+    That is the generated waveform itself, or with ``incremental`` the speech
+    tokens vocoded in short windows, one piece per window, by the model that
+    generated them.
+    """
+    if not incremental:
+        yield result
+        return
+    
+    speech_tokens, s3gen_ref, model = result
+    async with aclosing(vocode_speech_tokens_incrementally(
+        speech_tokens,
+        s3gen_ref,
+        generation_params.diffusion_steps,
+        window_tokens=ms_to_speech_tokens(Config.INCREMENTAL_VOCODING_WINDOW_MS),
+        overlap_tokens=ms_to_speech_tokens(Config.INCREMENTAL_VOCODING_OVERLAP_MS),
+        model=model,
+        seed=generation_params.seed
+    )) as windows:
+        async for audio_piece in windows:
+            yield audio_piece
+
+
+async def generate_chunks_pipelined(
+    chunks: List[str],
+    generation_params: GenerationParams,
+    request_id: Optional[str] = None,
+    lookahead: Optional[int] = None,
+    http_request: Optional[Request] = None,
+    incremental: bool = False
+) -> AsyncGenerator[Tuple[int, "torch.Tensor"], None]:
+    """
+    Yield generated audio for each chunk in order while keeping up to
+    ``lookahead`` chunks of generation in flight ahead of the consumer.
+    
+    This keeps the GPU busy while earlier chunks are still draining to the client.
+    If ``http_request`` is given, the client connection is polled while waiting
+    and ``ClientDisconnectedError`` is raised once it goes away; the in-flight
+    chunks are then cancelled.
+    
+    With ``incremental`` only speech tokens are generated ahead; each chunk is then
+    vocoded in short windows and yielded piece by piece (several items per index),
+    so audio starts flowing before the whole chunk has been vocoded.
+    """
+    lookahead = max(1, lookahead or Config.STREAMING_LOOKAHEAD_CHUNKS)
+    in_flight = deque()
+    next_index = 0
+    
+    def fill_pipeline():
+        nonlocal next_index
+        while next_index < len(chunks) and len(in_flight) < lookahead:
+            task = start_chunk_generation(chunks[next_index], generation_params, request_id, incremental)
+            in_flight.append((next_index, task))
+            next_index += 1
+    
+    try:
+        fill_pipeline()
+        while in_flight:
+            index, task = in_flight.popleft()
+            try:
+                result = await wait_unless_disconnected(task, http_request)
+            finally:
+                # Still running only if we stopped waiting early (disconnect or cancellation)
+                task.cancel()
+            # Start the next chunk before handing this one to the consumer
+            fill_pipeline()
+            
+            async with aclosing(chunk_audio_pieces(result, generation_params, incremental)) as pieces:
+                async for audio_piece in pieces:
+                    yield index, audio_piece
+                    if incremental and http_request is not None and await http_request.is_disconnected():
+                        raise ClientDisconnectedError()
+    finally:
+        for _, task in in_flight:
+            task.cancel()
+
+
+async def wait_unless_disconnected(task: asyncio.Future, http_request: Optional[Request]):
+    """Await a task, raising ClientDisconnectedError if the client disconnects first"""
+    if http_request is None:
+        return await task
+    
+    while True:
+        if await http_request.is_disconnected():
+            raise ClientDisconnectedError()
+        done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_INTERVAL)
+        if done:
+            return task.result()
+
+
+def admission_rejected_exception(error: AdmissionRejectedError) -> HTTPException:
+    """Convert a scheduler admission rejection into a 503 with Retry-After"""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail={
+            "error": {
+                "message": f"Server is busy: {error}. Retry after {error.retry_after} seconds.",
+                "type": "server_overloaded"
+            }
+        },
+        headers={"Retry-After": str(error.retry_after)}
+    )
+
+
+async def wait_for_model_ready() -> float:
+    """
+    Hold the request while the model is initializing; served in arrival order once ready.
+
+    Returns the seconds spent waiting. Raises 503 if initialization failed, the
+    readiness queue is full or the wait budget ran out. Like admission control,
+    this must happen before a StreamingResponse is created.
+    """
+    try:
+        return await get_readiness_gate().wait()
+    except ModelNotReadyError as e:
+        print(f"🚦 Rejecting request: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={"error": {"message": str(e), "type": "model_not_ready"}},
+            headers={"Retry-After": str(e.retry_after)} if e.retry_after else None
+        )
+
+
+def model_wait_headers(model_wait: float) -> Dict[str, str]:
+    """Server-Timing header reporting time spent waiting for the model to load"""
+    if model_wait <= 0:
+        return {}
+    return {"Server-Timing": f"model-wait;dur={model_wait * 1000:.1f}"}
+
+
+def check_response_format(response_format: Optional[str], streaming: bool = False) -> str:
+    """Validate a response format and return it (default wav); 400 if it can't be produced here"""
+    response_format = (response_format or "wav").lower()
+    supported = STREAMING_FORMATS if streaming else RESPONSE_FORMATS
+    if response_format not in supported:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "error": {
+                    "message": f"Unsupported response_format '{response_format}'"
+                               f"{' for streaming' if streaming else ''}. Supported formats: {', '.join(supported)}",
+                    "type": "validation_error"
+                }
+            }
+        )
+    if not get_audio_encoder().is_available(response_format):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "error": {
+                    "message": f"response_format '{response_format}' requires ffmpeg, which is not installed on this server",
+                    "type": "validation_error"
+                }
+            }
+        )
+    return response_format
+
+
+def sse_audio_format(response_format: Optional[str]) -> str:
+    """Audio carried by SSE deltas: telephony frames if mulaw/alaw was requested, otherwise 16-bit PCM"""
+    response_format = (response_format or "wav").lower()
+    return response_format if response_format in TELEPHONY_FORMATS else "pcm"
+
+
+def create_telephony_framing(
+    response_format: str,
+    sample_rate: int,
+    pacing: Optional[bool] = None
+) -> Tuple[Optional[TelephonyEncoder], Optional[FramePacer]]:
+    """Frame encoder and real-time pacer for a telephony stream, or (None, None) for other formats"""
+    if response_format not in TELEPHONY_FORMATS:
+        return None, None
+    telephony = TelephonyEncoder(sample_rate, response_format, Config.TELEPHONY_FRAME_MS)
+    pacer = None
+    if Config.TELEPHONY_PACING if pacing is None else pacing:
+        pacer = FramePacer(
+            Config.TELEPHONY_FRAME_MS / 1000,
+            lead_frames=Config.TELEPHONY_PREBUFFER_MS // Config.TELEPHONY_FRAME_MS
+        )
+    return telephony, pacer
+
+
+# Frame size used when pacing is requested without one
+PACED_FRAME_MS = 100
+
+
+def create_stream_framing(
+    response_format: str,
+    sample_rate: int,
+    frame_ms: Optional[int] = None,
+    pacing: Optional[bool] = None
+) -> Tuple[Optional[Union[TelephonyEncoder, PcmFramer]], Optional[FramePacer]]:
+    """
+    Framer and real-time pacer for a raw or SSE stream, or (None, None) to send each chunk as is.
+
+    Telephony formats always use TELEPHONY_FRAME_MS frames; wav and pcm are cut
+    into ``frame_ms`` frames (default STREAMING_FRAME_MS, 0 = off). ``pacing``
+    overrides TELEPHONY_PACING / STREAMING_PACING.
+    """
+    if response_format in TELEPHONY_FORMATS:
+        return create_telephony_framing(response_format, sample_rate, pacing)
+    if response_format not in ("wav", "pcm"):
+        return None, None
+
+    frame_ms = Config.STREAMING_FRAME_MS if frame_ms is None else frame_ms
+    pacing = Config.STREAMING_PACING if pacing is None else pacing
+    if pacing and not frame_ms:
+        frame_ms = PACED_FRAME_MS
+    if not frame_ms:
+        return None, None
+
+    pacer = None
+    if pacing:
+        pacer = FramePacer(frame_ms / 1000, lead_frames=Config.STREAMING_PACING_PREBUFFER_MS // frame_ms)
+    return PcmFramer(sample_rate, frame_ms), pacer
+
+
+def check_inference_admission(text: str, chunk_size: Optional[int] = None, max_in_flight: Optional[int] = None) -> None:
+    """
+    Reject the request with 503 if the inference queue cannot serve it within the wait SLO.
+
+    Must be called before a StreamingResponse is created so the client receives a
+    proper status code instead of a stream that stalls or breaks mid-way.
+    """
+    chunk_count = max(1, math.ceil(len(text) / (chunk_size or Config.MAX_CHUNK_LENGTH)))
+    if max_in_flight:
+        # Streaming requests only keep their lookahead window in the queue
+        chunk_count = min(chunk_count, max_in_flight)
+
+    try:
+        get_inference_scheduler().check_admission(chunk_count)
+    except AdmissionRejectedError as e:
+        print(f"🚦 Rejecting request: {e} (Retry-After {e.retry_after}s)")
+        raise admission_rejected_exception(e)
+
+
+def single_flight_key(
+    text: str,
+    voice_sample_path: str,
+    language_id: str,
+    exaggeration: Optional[float],
+    temperature: Optional[float],
+    seed: Optional[int],
+    response_format: str,
+    format_options: Tuple = ()
+) -> Optional[Tuple]:
+    """
+    Identity of a synthesis request for single-flight deduplication.
+    
+    Two requests with the same key (which includes the model variant serving the
+    language) produce interchangeable output, so concurrent ones can share one
+    generation. Returns None when the request can't be shared.
+    """
+    if not Config.ENABLE_SINGLE_FLIGHT:
+        return None
+    
+    try:
+        voice_hash = get_conditioning_cache().get_content_hash(voice_sample_path)
+    except OSError:
+        return None
+    
+    return (
+        " ".join(text.split()),
+        voice_hash,
+        language_id,
+        model_variant(get_model(language_id)),
+        exaggeration if exaggeration is not None else Config.EXAGGERATION,
+        temperature if temperature is not None else Config.TEMPERATURE,
+        seed,
+        response_format,
+        format_options
+    )
+
+
+def response_cache_key(
+    text: str,
+    voice_sample_path: str,
+    language_id: str,
+    exaggeration: Optional[float],
+    temperature: Optional[float],
+    seed: Optional[int],
+    response_format: str
+) -> Optional[str]:
+    """
+    Response cache key for a synthesis request, or None when the response cache doesn't apply.
+    
+    Seeded requests are deterministic, so with result URLs enabled they are always
+    stored; the key doubles as the ``/audio/results/{content_hash}`` address. A
+    model without a separate T3 stage ignores the seed, so its output is neither
+    stored nor addressed as deterministic.
+    """
+    if not (Config.ENABLE_RESPONSE_CACHE or (Config.ENABLE_RESULT_URLS and seed is not None)):
+        return None
+    if seed is not None and not supports_staged_generation(get_model(language_id)):
+        return None
+    
+    try:
+        voice_hash = get_conditioning_cache().get_content_hash(voice_sample_path)
+    except OSError:
+        return None
+    
+    return ResponseCache.make_key(
+        text,
+        voice_hash,
+        language_id,
+        exaggeration if exaggeration is not None else Config.EXAGGERATION,
+        temperature if temperature is not None else Config.TEMPERATURE,
+        Config.VLLM_DIFFUSION_STEPS,
+        response_format,
+        seed,
+        model_variant(get_model(language_id))
+    )
+
+
+def streaming_format_options(
+    streaming_chunk_size: Optional[int],
+    streaming_strategy: Optional[str],
+    streaming_quality: Optional[str],
+    streaming_frame_ms: Optional[int] = None,
+    streaming_pacing: Optional[bool] = None
+) -> Tuple:
+    """Streaming settings that change the produced byte stream or its timing, for use in a single-flight key"""
+    settings = get_streaming_settings(streaming_chunk_size, streaming_strategy, streaming_quality)
+    return (settings["chunk_size"], settings["strategy"], settings["quality"], streaming_frame_ms, streaming_pacing)
+
+
+async def generate_speech_shared(
+    text: str,
+    voice_sample_path: str,
+    language_id: str = "en",
+    exaggeration: Optional[float] = None,
+    cfg_weight: Optional[float] = None,
+    temperature: Optional[float] = None,
+    seed: Optional[int] = None,
+    shareable: bool = True,
+    response_format: str = "wav",
+    cache_lookup: bool = True
+) -> Tuple[bytes, str, Optional[str]]:
+    """
+    Generate a complete audio file, sharing one generation between identical concurrent requests.
+    
+    Returns the encoded audio bytes, the response cache status (``HIT``, ``MISS`` or ``BYPASS``)
+    for the ``X-Cache`` header and the response cache key (None on ``BYPASS``). Without
+    ``cache_lookup`` the audio is always generated, and the cache entry refreshed.
+    """
+    cache_key = response_cache_key(text, voice_sample_path, language_id, exaggeration, temperature, seed, response_format)
+    if cache_key is not None and cache_lookup:
+        cached = await asyncio.to_thread(get_response_cache().get, cache_key)
+        if cached is not None:
+            return cached[0], "HIT", cache_key
+    
+    async def produce() -> bytes:
+        buffer = await generate_speech_internal(
+            text=text,
+            voice_sample_path=voice_sample_path,
+            language_id=language_id,
+            exaggeration=exaggeration,
+            cfg_weight=cfg_weight,
+            temperature=temperature,
+            seed=seed,
+            response_format=response_format
+        )
+        audio_bytes = buffer.getvalue()
+        if cache_key is not None:
+            await asyncio.to_thread(get_response_cache().put, cache_key, audio_bytes, response_format)
+        return audio_bytes
+    
+    cache_status = "MISS" if cache_key is not None else "BYPASS"
+    key = single_flight_key(
+        text, voice_sample_path, language_id, exaggeration, temperature, seed, response_format
+    ) if shareable else None
+    if key is None:
+        return await produce(), cache_status, cache_key
+    return await get_single_flight().do(key, produce), cache_status, cache_key
+
+
+def wants_fresh_response(http_request: Request) -> bool:
+    """Check whether the client sent ``Cache-Control: no-cache``, asking not to be served a cached response"""
+    directives = http_request.headers.get("cache-control", "").lower().split(",")
+    return any(directive.strip() == "no-cache" for directive in directives)
+
+
+def audio_etag(audio_bytes: bytes) -> str:
+    """Strong ETag for a complete audio response"""
+    return f'"{hashlib.sha256(audio_bytes).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison, as RFC 9110 requires)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def parse_byte_range(range_header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single ``bytes=`` range into inclusive ``(start, end)`` offsets.
+    
+    Returns None if the range is malformed or unsatisfiable. Multiple ranges are
+    not supported and are treated as unsatisfiable.
+    """
+    unit, _, spec = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    
+    start_text, _, end_text = spec.strip().partition("-")
+    try:
+        if start_text:
+            start = int(start_text)
+            end = int(end_text) if end_text else size - 1
+        else:
+            # Suffix range: the last N bytes
+            length = int(end_text)
+            if length <= 0:
+                return None
+            start = max(0, size - length)
+            end = size - 1
+    except ValueError:
+        return None
+    
+    if start < 0 or start >= size or end < start:
+        return None
+    return start, min(end, size - 1)
+
+
+def speech_response_headers(
+    audio_bytes: bytes,
+    cache_status: str,
+    cache_key: Optional[str],
+    seed: Optional[int],
+    model_wait: float = 0.0,
+    response_format: str = "wav"
+) -> Dict[str, str]:
+    """Headers for a complete audio response, advertising the result URL of deterministic requests"""
+    headers = {
+        "Content-Disposition": f"attachment; filename=speech.{AUDIO_FORMATS[response_format]['extension']}",
+        "X-Cache": cache_status
+    }
+    headers.update(model_wait_headers(model_wait))
+    if seed is not None and cache_key is not None and Config.ENABLE_RESULT_URLS:
+        headers["ETag"] = audio_etag(audio_bytes)
+        headers["Content-Location"] = f"/audio/results/{cache_key}"
+    return headers
+
+
+def stream_shared(
+    key: Optional[Tuple],
+    factory: Callable[..., AsyncGenerator],
+    http_request: Optional[Request] = None
+) -> AsyncGenerator:
+    """
+    Stream from ``factory``, fanning out one producer to all identical concurrent requests.
+    
+    The shared producer runs without a client connection of its own; each
+    subscriber watches its own connection and the producer is cancelled once
+    every subscriber has gone.
+    """
+    if key is None:
+        return factory(http_request=http_request)
+    
+    return get_single_flight().stream(
+        key,
+        lambda: factory(http_request=None),
+        is_disconnected=http_request.is_disconnected if http_request is not None else None
+    )
+
+
 def validate_audio_file(file: UploadFile) -> None:
     """Validate uploaded audio file"""
     if not file.filename:
@@ -147,10 +674,15 @@ async def generate_speech_internal(
     language_id: str = "en",
     exaggeration: Optional[float] = None,
     cfg_weight: Optional[float] = None,
-    temperature: Optional[float] = None
+    temperature: Optional[float] = None,
+    seed: Optional[int] = None,
+    priority: Priority = Priority.INTERACTIVE,
+    response_format: str = "wav"
 ) -> io.BytesIO:
-    """Internal function to generate speech with given parameters"""
+    """Internal function to generate speech with given parameters, encoded as ``response_format``"""
     global REQUEST_COUNTER
+    import torch
+    
     REQUEST_COUNTER += 1
     
     # Start TTS request tracking
@@ -162,6 +694,7 @@ async def generate_speech_internal(
             "exaggeration": exaggeration,
             "cfg_weight": cfg_weight,
             "temperature": temperature,
+            "seed": seed,
             "voice_sample_path": voice_sample_path
         }
     )
@@ -233,54 +766,53 @@ async def generate_speech_internal(
                         current_chunk=0, total_chunks=len(chunks))
         
         # Generate audio for each chunk with memory management
-        loop = asyncio.get_event_loop()
+        scheduler = get_inference_scheduler()
+        generation_params = GenerationParams(
+            voice_sample_path=voice_sample_path,
+            language_id=language_id,
+            exaggeration=exaggeration,
+            temperature=temperature,
+            seed=seed,
+            diffusion_steps=Config.VLLM_DIFFUSION_STEPS
+        )
         
-        for i, chunk in enumerate(chunks):
-            # Update progress
-            current_step = f"Generating audio for chunk {i+1}/{len(chunks)}"
-            update_tts_status(request_id, TTSStatus.GENERATING_AUDIO, current_step, 
-                            current_chunk=i+1, total_chunks=len(chunks))
+        if Config.BATCH_REQUEST_CHUNKS and len(chunks) > 1:
+            # Send every chunk to the model together; the scheduler slices them to
+            # VLLM_MAX_BATCH_SIZE and returns the audio in chunk order
+            update_tts_status(request_id, TTSStatus.GENERATING_AUDIO,
+                            f"Generating audio for {len(chunks)} chunks in batch",
+                            current_chunk=0, total_chunks=len(chunks))
+            print(f"Generating audio for {len(chunks)} chunks in batch mode")
             
-            print(f"Generating audio for chunk {i+1}/{len(chunks)}: '{chunk[:50]}{'...' if len(chunk) > 50 else ''}'")
+            audio_chunks.extend(
+                await scheduler.generate_many(chunks, generation_params, request_id=request_id, priority=priority)
+            )
             
-            # Use torch.no_grad() to prevent gradient accumulation
-            with torch.no_grad():
-                # Run TTS generation in executor to avoid blocking
-                # vLLM backend uses prompts (list), returns list of audio tensors
-                # Note: cfg_weight is not supported per-request in vLLM (use CHATTERBOX_CFG_SCALE env var)
-                generate_kwargs = {
-                    "prompts": [chunk],  # vLLM expects a list of prompts
-                    "audio_prompt_path": voice_sample_path,
-                    "exaggeration": exaggeration,
-                    "temperature": temperature,
-                    "diffusion_steps": Config.VLLM_DIFFUSION_STEPS
-                }
+            update_tts_status(request_id, TTSStatus.GENERATING_AUDIO, "Batch generation completed",
+                            current_chunk=len(chunks), total_chunks=len(chunks))
+        else:
+            for i, chunk in enumerate(chunks):
+                # Update progress
+                current_step = f"Generating audio for chunk {i+1}/{len(chunks)}"
+                update_tts_status(request_id, TTSStatus.GENERATING_AUDIO, current_step, 
+                                current_chunk=i+1, total_chunks=len(chunks))
                 
-                # Add language_id for all models (vLLM defaults to 'en' if not multilingual)
-                generate_kwargs["language_id"] = language_id
+                print(f"Generating audio for chunk {i+1}/{len(chunks)}: '{chunk[:50]}{'...' if len(chunk) > 50 else ''}'")
                 
-                audio_list = await loop.run_in_executor(
-                    None,
-                    lambda: model.generate(**generate_kwargs)
+                # Generation runs through the shared scheduler, which batches this chunk
+                # with compatible chunks from other in-flight requests
+                # Note: cfg_weight is not supported per-request in vLLM (use CHATTERBOX_CFG_SCALE env var)
+                audio_tensor = await scheduler.generate(
+                    chunk, generation_params, request_id=request_id, priority=priority
                 )
-                
-                # vLLM returns a list of tensors, take the first one
-                audio_tensor = audio_list[0] if audio_list else None
-                if audio_tensor is None:
-                    raise RuntimeError("Model returned empty audio")
-                
-                # Ensure tensor is on the correct device and detached
-                if hasattr(audio_tensor, 'detach'):
-                    audio_tensor = audio_tensor.detach()
-                
                 audio_chunks.append(audio_tensor)
-            
-            # Periodic memory cleanup during generation
-            if i > 0 and i % 3 == 0:  # Every 3 chunks
-                import gc
-                gc.collect()
-                if torch.cuda.is_available():
-                    torch.cuda.empty_cache()
+                
+                # Periodic memory cleanup during generation
+                if i > 0 and i % 3 == 0:  # Every 3 chunks
+                    import gc
+                    gc.collect()
+                    if torch.cuda.is_available():
+                        torch.cuda.empty_cache()
         
         # Concatenate all chunks with memory management
         if len(audio_chunks) > 1:
@@ -291,25 +823,22 @@ async def generate_speech_internal(
         else:
             final_audio = audio_chunks[0]
         
-        # Convert to WAV format
-        update_tts_status(request_id, TTSStatus.FINALIZING, "Converting to WAV format")
-        buffer = io.BytesIO()
-        
-        # Ensure final_audio is on CPU for saving
-        if hasattr(final_audio, 'cpu'):
-            final_audio_cpu = final_audio.cpu()
-        else:
-            final_audio_cpu = final_audio
-            
-        ta.save(buffer, final_audio_cpu, model.sr, format="wav")
-        buffer.seek(0)
+        # Encode to the response format on the encoder pool
+        update_tts_status(request_id, TTSStatus.FINALIZING, f"Encoding {response_format} audio")
+        buffer = io.BytesIO(await get_audio_encoder().encode(final_audio, model.sr, response_format))
         
         # Mark as completed
-        update_tts_status(request_id, TTSStatus.COMPLETED, "Audio generation completed")
-        print(f"✓ Audio generation completed. Size: {len(buffer.getvalue()):,} bytes")
+        queue_wait = scheduler.pop_request_queue_wait(request_id)
+        update_tts_status(request_id, TTSStatus.COMPLETED, "Audio generation completed",
+                        queue_wait_seconds=queue_wait)
+        print(f"✓ Audio generation completed. Size: {len(buffer.getvalue()):,} bytes (queue wait {queue_wait:.2f}s)")
         
         return buffer
         
+    except AdmissionRejectedError as e:
+        update_tts_status(request_id, TTSStatus.ERROR, error_message=f"Request rejected: {str(e)}")
+        raise admission_rejected_exception(e)
+        
     except Exception as e:
         # Update status with error
         update_tts_status(request_id, TTSStatus.ERROR, error_message=f"TTS generation failed: {str(e)}")
@@ -325,6 +854,8 @@ async def generate_speech_internal(
         )
     
     finally:
+        get_inference_scheduler().pop_request_queue_wait(request_id)
+        
         # Comprehensive cleanup
         try:
             # Clean up all audio chunks
@@ -334,8 +865,6 @@ async def generate_speech_internal(
             # Clean up final audio tensor
             if final_audio is not None:
                 safe_delete_tensors(final_audio)
-                if 'final_audio_cpu' in locals():
-                    safe_delete_tensors(final_audio_cpu)
             
             # Clear the list
             audio_chunks.clear()
@@ -374,12 +903,27 @@ async def generate_speech_streaming(
     exaggeration: Optional[float] = None,
     cfg_weight: Optional[float] = None,
     temperature: Optional[float] = None,
+    seed: Optional[int] = None,
     streaming_chunk_size: Optional[int] = None,
     streaming_strategy: Optional[str] = None,
-    streaming_quality: Optional[str] = None
+    streaming_quality: Optional[str] = None,
+    streaming_buffer_size: Optional[int] = None,
+    streaming_frame_ms: Optional[int] = None,
+    streaming_pacing: Optional[bool] = None,
+    http_request: Optional[Request] = None,
+    response_format: str = "wav"
 ) -> AsyncGenerator[bytes, None]:
-    """Streaming function to generate speech with real-time chunk yielding"""
+    """
+    Streaming function to generate speech with real-time chunk yielding.
+    
+    Yields 16-bit PCM, preceded by a streaming WAV header when ``response_format`` is wav,
+    one write per generated piece or, with ``streaming_frame_ms``, in frames of exactly
+    that duration. For mulaw and alaw it yields 8 kHz G.711 frames of exactly
+    TELEPHONY_FRAME_MS. Frames are paced in real time when pacing is enabled.
+    """
     global REQUEST_COUNTER
+    import torch
+    
     REQUEST_COUNTER += 1
     
     # Start TTS request tracking
@@ -391,11 +935,15 @@ async def generate_speech_streaming(
             "exaggeration": exaggeration,
             "cfg_weight": cfg_weight,
             "temperature": temperature,
+            "seed": seed,
             "voice_sample_path": voice_sample_path,
             "streaming": True,
             "streaming_chunk_size": streaming_chunk_size,
             "streaming_strategy": streaming_strategy,
-            "streaming_quality": streaming_quality
+            "streaming_quality": streaming_quality,
+            "streaming_buffer_size": streaming_buffer_size,
+            "streaming_frame_ms": streaming_frame_ms,
+            "streaming_pacing": streaming_pacing
         }
     )
     
@@ -428,6 +976,7 @@ async def generate_speech_streaming(
     sample_rate = model.sr
     channels = 1
     bits_per_sample = 16
+    framer, pacer = create_stream_framing(response_format, sample_rate, streaming_frame_ms, streaming_pacing)
     
     # Generate and yield WAV header first
     try:
@@ -462,76 +1011,112 @@ async def generate_speech_streaming(
         print(f"  - Streaming Strategy: {streaming_settings['strategy']}")
         print(f"  - Streaming Chunk Size: {streaming_settings['chunk_size']}")
         print(f"  - Streaming Quality: {streaming_settings['quality']}")
+        print(f"  - Lookahead Chunks: {streaming_buffer_size or Config.STREAMING_LOOKAHEAD_CHUNKS}")
+        print(f"  - Incremental Vocoding: {use_incremental_vocoding()}")
+        if framer is not None:
+            print(f"  - Frames: {framer.frame_ms} ms{' (paced)' if pacer is not None else ''}")
         
         # Update status with chunk information
         update_tts_status(request_id, TTSStatus.GENERATING_AUDIO, "Starting streaming audio generation", 
                         current_chunk=0, total_chunks=len(chunks))
         
         # Yield a proper WAV header for streaming
-        wav_header = create_wav_header(sample_rate, channels, bits_per_sample)
-        yield wav_header
+        if response_format == "wav":
+            wav_header = create_wav_header(sample_rate, channels, bits_per_sample)
+            yield wav_header
         
         # Generate and stream audio for each chunk
-        loop = asyncio.get_event_loop()
+        generation_params = GenerationParams(
+            voice_sample_path=voice_sample_path,
+            language_id=language_id,
+            exaggeration=exaggeration,
+            temperature=temperature,
+            seed=seed,
+            diffusion_steps=Config.VLLM_DIFFUSION_STEPS
+        )
         total_samples = 0
         
-        for i, chunk in enumerate(chunks):
-            # Update progress
-            current_step = f"Streaming audio for chunk {i+1}/{len(chunks)} ({streaming_settings['strategy']} strategy)"
-            update_tts_status(request_id, TTSStatus.GENERATING_AUDIO, current_step, 
-                            current_chunk=i+1, total_chunks=len(chunks))
+        # Generation runs ahead of the consumer so the GPU stays busy while bytes drain
+        async with aclosing(generate_chunks_pipelined(
+            chunks, generation_params, request_id=request_id, lookahead=streaming_buffer_size,
+            http_request=http_request, incremental=use_incremental_vocoding()
+        )) as pipeline:
+            last_index = None
+            async for i, audio_tensor in pipeline:
+                chunk = chunks[i]
             
-            print(f"Streaming audio for chunk {i+1}/{len(chunks)}: '{chunk[:50]}{'...' if len(chunk) > 50 else ''}'")
-            
-            # Use torch.no_grad() to prevent gradient accumulation
-            with torch.no_grad():
-                # Run TTS generation in executor to avoid blocking
-                # vLLM backend uses prompts (list), returns list of audio tensors
-                audio_list = await loop.run_in_executor(
-                    None,
-                    lambda: model.generate(
-                        prompts=[chunk],
-                        audio_prompt_path=voice_sample_path,
-                        exaggeration=exaggeration,
-                        temperature=temperature,
-                        language_id=language_id,
-                        diffusion_steps=Config.VLLM_DIFFUSION_STEPS
-                    )
-                )
-                # vLLM returns a list of tensors, take the first one
-                audio_tensor = audio_list[0] if audio_list else None
-                if audio_tensor is None:
-                    raise RuntimeError("Model returned empty audio")
-                
-                # Ensure tensor is on CPU for streaming
-                if hasattr(audio_tensor, 'cpu'):
-                    audio_tensor = audio_tensor.cpu()
-
-                # Convert tensor to raw 16-bit PCM data
-                # Clamp values to [-1, 1] before conversion
-                audio_tensor = torch.clamp(audio_tensor, -1.0, 1.0)
-                audio_tensor_int = (audio_tensor * 32767).to(torch.int16)
-                
-                # Yield the raw audio data as bytes
-                pcm_data = audio_tensor_int.numpy().tobytes()
-                yield pcm_data
+                # Update progress (incremental vocoding yields several pieces per chunk)
+                if i != last_index:
+                    last_index = i
+                    current_step = f"Streaming audio for chunk {i+1}/{len(chunks)} ({streaming_settings['strategy']} strategy)"
+                    update_tts_status(request_id, TTSStatus.GENERATING_AUDIO, current_step, 
+                                    current_chunk=i+1, total_chunks=len(chunks))
                 
-                total_samples += audio_tensor.shape[1]
-                
-                # Clean up this chunk
-                safe_delete_tensors(audio_tensor, audio_tensor_int)
-                del pcm_data
+                    print(f"Streaming audio for chunk {i+1}/{len(chunks)}: '{chunk[:50]}{'...' if len(chunk) > 50 else ''}'")
             
-            # Periodic memory cleanup during generation
-            if i > 0 and i % 3 == 0:  # Every 3 chunks
-                import gc
-                gc.collect()
-                if torch.cuda.is_available():
-                    torch.cuda.empty_cache()
-        
+                # Use torch.no_grad() to prevent gradient accumulation
+                with torch.no_grad():
+                    # Ensure tensor is on CPU for streaming
+                    if hasattr(audio_tensor, 'cpu'):
+                        audio_tensor = audio_tensor.cpu()
+
+                    if framer is not None:
+                        # Cut into exact frames (resampled and G.711-encoded for telephony); sent (paced) below
+                        frames = framer.push(audio_tensor)
+                        total_samples += audio_tensor.shape[-1]
+                        safe_delete_tensors(audio_tensor)
+                    else:
+                        # Convert tensor to raw 16-bit PCM data
+                        # Clamp values to [-1, 1] before conversion
+                        audio_tensor = torch.clamp(audio_tensor, -1.0, 1.0)
+                        audio_tensor_int = (audio_tensor * 32767).to(torch.int16)
+
+                        # Yield the raw audio data as bytes
+                        pcm_data = audio_tensor_int.numpy().tobytes()
+                        yield pcm_data
+
+                        total_samples += audio_tensor.shape[1]
+
+                        # Clean up this chunk
+                        safe_delete_tensors(audio_tensor, audio_tensor_int)
+                        del pcm_data
+
+                if framer is not None:
+                    for frame in frames:
+                        if pacer is not None:
+                            await pacer.wait()
+                        yield bytes(frame)
+
+                # Periodic memory cleanup during generation
+                if i > 0 and i % 3 == 0:  # Every 3 chunks
+                    import gc
+                    gc.collect()
+                    if torch.cuda.is_available():
+                        torch.cuda.empty_cache()
+
+        if framer is not None:
+            # Resampler tail (telephony) and the last partial frame, padded with silence
+            for frame in framer.flush():
+                if pacer is not None:
+                    await pacer.wait()
+                yield bytes(frame)
+            if pacer is not None and pacer.underruns:
+                print(f"⚠️ Paced stream fell behind real time {pacer.underruns} time(s)")
+
         # Mark as completed
-        update_tts_status(request_id, TTSStatus.COMPLETED, "Streaming audio generation completed")
-        print(f"✓ Streaming audio generation completed. Total samples: {total_samples:,}")
+        queue_wait = get_inference_scheduler().pop_request_queue_wait(request_id)
+        update_tts_status(request_id, TTSStatus.COMPLETED, "Streaming audio generation completed",
+                        queue_wait_seconds=queue_wait)
+        print(f"✓ Streaming audio generation completed. Total samples: {total_samples:,} (queue wait {queue_wait:.2f}s)")
+        
+    except (ClientDisconnectedError, asyncio.CancelledError, GeneratorExit) as e:
+        # Client went away (detected by us, or the server cancelled/closed the stream):
+        # drop this request's queued chunks instead of generating them
+        cancelled = get_inference_scheduler().cancel_request(request_id)
+        update_tts_status(request_id, TTSStatus.CANCELLED, "Client disconnected")
+        print(f"🔌 Client disconnected, stopped streaming generation ({cancelled} queued chunks cancelled)")
+        if not isinstance(e, ClientDisconnectedError):
+            raise
         
     except Exception as e:
         # Update status with error
@@ -548,6 +1133,8 @@ async def generate_speech_streaming(
         )
     
     finally:
+        get_inference_scheduler().pop_request_queue_wait(request_id)
+        
         # Periodic memory cleanup
         if REQUEST_COUNTER % Config.MEMORY_CLEANUP_INTERVAL == 0:
             cleanup_memory()
@@ -562,6 +1149,47 @@ async def generate_speech_streaming(
                 print()
 
 
+async def generate_speech_stream_encoded(
+    response_format: str = "wav",
+    http_request: Optional[Request] = None,
+    **generation_kwargs
+) -> AsyncGenerator[bytes, None]:
+    """
+    Stream speech in ``response_format``.
+    
+    wav, pcm and the telephony formats come straight from generate_speech_streaming.
+    Compressed formats pass its PCM through one streaming encoder for the whole
+    response, which yields encoded pages as soon as they are produced.
+    """
+    if response_format in ("wav", "pcm", *TELEPHONY_FORMATS):
+        async with aclosing(generate_speech_streaming(
+            http_request=http_request, response_format=response_format, **generation_kwargs
+        )) as stream:
+            async for data in stream:
+                yield data
+        return
+    
+    # The encoder buffers its input into pages, so framing or pacing the PCM would gain nothing
+    generation_kwargs.update(streaming_frame_ms=0, streaming_pacing=False)
+    model = get_model()
+    pcm_stream = generate_speech_streaming(http_request=http_request, response_format="pcm", **generation_kwargs)
+    async with aclosing(pcm_stream):
+        async with aclosing(get_audio_encoder().encode_stream(pcm_stream, model.sr, response_format)) as pages:
+            async for page in pages:
+                yield page
+
+
+def streaming_response_headers(response_format: str, model_wait: float) -> Dict[str, str]:
+    """Headers for a raw audio stream"""
+    return {
+        "Content-Disposition": f"attachment; filename=speech_stream.{AUDIO_FORMATS[response_format]['extension']}",
+        "Transfer-Encoding": "chunked",
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",  # Disable nginx buffering for true streaming
+        **model_wait_headers(model_wait)
+    }
+
+
 async def generate_speech_sse(
     text: str,
     voice_sample_path: str,
@@ -569,12 +1197,26 @@ async def generate_speech_sse(
     exaggeration: Optional[float] = None,
     cfg_weight: Optional[float] = None,
     temperature: Optional[float] = None,
+    seed: Optional[int] = None,
     streaming_chunk_size: Optional[int] = None,
     streaming_strategy: Optional[str] = None,
-    streaming_quality: Optional[str] = None
+    streaming_quality: Optional[str] = None,
+    streaming_buffer_size: Optional[int] = None,
+    streaming_frame_ms: Optional[int] = None,
+    streaming_pacing: Optional[bool] = None,
+    http_request: Optional[Request] = None,
+    response_format: str = "pcm"
 ) -> AsyncGenerator[str, None]:
-    """Generate Server-Side Events for speech streaming (OpenAI compatible format)"""
+    """
+    Generate Server-Side Events for speech streaming (OpenAI compatible format)
+    
+    Deltas carry 16-bit PCM at the model's sample rate, one generated piece each or
+    one ``streaming_frame_ms`` frame each, or one TELEPHONY_FRAME_MS frame of 8 kHz
+    G.711 each when ``response_format`` is mulaw or alaw.
+    """
     global REQUEST_COUNTER
+    import torch
+    
     REQUEST_COUNTER += 1
     
     # Start TTS request tracking
@@ -586,12 +1228,17 @@ async def generate_speech_sse(
             "exaggeration": exaggeration,
             "cfg_weight": cfg_weight,
             "temperature": temperature,
+            "seed": seed,
             "voice_sample_path": voice_sample_path,
             "streaming": True,
             "streaming_format": "sse",
+            "response_format": response_format,
             "streaming_chunk_size": streaming_chunk_size,
             "streaming_strategy": streaming_strategy,
-            "streaming_quality": streaming_quality
+            "streaming_quality": streaming_quality,
+            "streaming_buffer_size": streaming_buffer_size,
+            "streaming_frame_ms": streaming_frame_ms,
+            "streaming_pacing": streaming_pacing
         }
     )
     
@@ -624,6 +1271,7 @@ async def generate_speech_sse(
     sample_rate = model.sr
     channels = 1
     bits_per_sample = 16
+    framer, pacer = create_stream_framing(response_format, sample_rate, streaming_frame_ms, streaming_pacing)
     total_audio_chunks = 0
     total_input_tokens = len(text.split())  # Rough token count
     
@@ -659,81 +1307,116 @@ async def generate_speech_sse(
         print(f"  - Streaming Strategy: {streaming_settings['strategy']}")
         print(f"  - Streaming Chunk Size: {streaming_settings['chunk_size']}")
         print(f"  - Streaming Quality: {streaming_settings['quality']}")
+        print(f"  - Lookahead Chunks: {streaming_buffer_size or Config.STREAMING_LOOKAHEAD_CHUNKS}")
+        print(f"  - Incremental Vocoding: {use_incremental_vocoding()}")
+        if framer is not None:
+            print(f"  - Frames: {framer.frame_ms} ms{' (paced)' if pacer is not None else ''}")
         
         # Update status with chunk information
         update_tts_status(request_id, TTSStatus.GENERATING_AUDIO, "Starting SSE audio generation", 
                         current_chunk=0, total_chunks=len(chunks))
         
         # First, send an info event with audio parameters
-        info_event = SSEAudioInfo(
-            sample_rate=sample_rate,
-            channels=channels,
-            bits_per_sample=bits_per_sample
-        )
+        if framer is not None:
+            info_event = SSEAudioInfo(
+                sample_rate=framer.sample_rate,
+                channels=channels,
+                bits_per_sample=framer.bits_per_sample,
+                encoding=framer.encoding,
+                frame_ms=framer.frame_ms
+            )
+        else:
+            info_event = SSEAudioInfo(
+                sample_rate=sample_rate,
+                channels=channels,
+                bits_per_sample=bits_per_sample
+            )
         yield f"data: {info_event.model_dump_json()}\n\n"
         
         # Generate and stream audio for each chunk as SSE events
-        loop = asyncio.get_event_loop()
+        generation_params = GenerationParams(
+            voice_sample_path=voice_sample_path,
+            language_id=language_id,
+            exaggeration=exaggeration,
+            temperature=temperature,
+            seed=seed,
+            diffusion_steps=Config.VLLM_DIFFUSION_STEPS
+        )
         
-        for i, chunk in enumerate(chunks):
-            # Update progress
-            current_step = f"SSE streaming audio for chunk {i+1}/{len(chunks)} ({streaming_settings['strategy']} strategy)"
-            update_tts_status(request_id, TTSStatus.GENERATING_AUDIO, current_step, 
-                            current_chunk=i+1, total_chunks=len(chunks))
+        # Generation runs ahead of the consumer so the GPU stays busy while bytes drain
+        async with aclosing(generate_chunks_pipelined(
+            chunks, generation_params, request_id=request_id, lookahead=streaming_buffer_size,
+            http_request=http_request, incremental=use_incremental_vocoding()
+        )) as pipeline:
+            last_index = None
+            async for i, audio_tensor in pipeline:
+                chunk = chunks[i]
             
-            print(f"SSE streaming audio for chunk {i+1}/{len(chunks)}: '{chunk[:50]}{'...' if len(chunk) > 50 else ''}'")
-            
-            # Use torch.no_grad() to prevent gradient accumulation
-            with torch.no_grad():
-                # Run TTS generation in executor to avoid blocking
-                # vLLM backend uses prompts (list), returns list of audio tensors
-                audio_list = await loop.run_in_executor(
-                    None,
-                    lambda: model.generate(
-                        prompts=[chunk],
-                        audio_prompt_path=voice_sample_path,
-                        exaggeration=exaggeration,
-                        temperature=temperature,
-                        language_id=language_id,
-                        diffusion_steps=Config.VLLM_DIFFUSION_STEPS
-                    )
-                )
-                # vLLM returns a list of tensors, take the first one
-                audio_tensor = audio_list[0] if audio_list else None
-                if audio_tensor is None:
-                    raise RuntimeError("Model returned empty audio")
-                
-                # Ensure tensor is on CPU for processing
-                if hasattr(audio_tensor, 'cpu'):
-                    audio_tensor = audio_tensor.cpu()
-
-                # Convert tensor to raw 16-bit PCM data
-                audio_tensor = torch.clamp(audio_tensor, -1.0, 1.0)
-                audio_tensor_int = (audio_tensor * 32767).to(torch.int16)
-                pcm_data = audio_tensor_int.numpy().tobytes()
-                
-                # Base64 encode the raw PCM data
-                audio_base64 = base64.b64encode(pcm_data).decode('utf-8')
-                
-                # Create SSE event for this audio chunk
-                sse_event = SSEAudioDelta(audio=audio_base64)
-                
-                # Format as SSE event
-                sse_data = f"data: {sse_event.model_dump_json()}\n\n"
-                yield sse_data
+                # Update progress (incremental vocoding yields several pieces per chunk)
+                if i != last_index:
+                    last_index = i
+                    current_step = f"SSE streaming audio for chunk {i+1}/{len(chunks)} ({streaming_settings['strategy']} strategy)"
+                    update_tts_status(request_id, TTSStatus.GENERATING_AUDIO, current_step, 
+                                    current_chunk=i+1, total_chunks=len(chunks))
                 
-                total_audio_chunks += 1
-                
-                # Clean up this chunk
-                safe_delete_tensors(audio_tensor, audio_tensor_int)
-                del pcm_data
+                    print(f"SSE streaming audio for chunk {i+1}/{len(chunks)}: '{chunk[:50]}{'...' if len(chunk) > 50 else ''}'")
             
-            # Periodic memory cleanup during generation
-            if i > 0 and i % 3 == 0:  # Every 3 chunks
-                import gc
-                gc.collect()
-                if torch.cuda.is_available():
-                    torch.cuda.empty_cache()
+                # Use torch.no_grad() to prevent gradient accumulation
+                with torch.no_grad():
+                    # Ensure tensor is on CPU for processing
+                    if hasattr(audio_tensor, 'cpu'):
+                        audio_tensor = audio_tensor.cpu()
+
+                    if framer is not None:
+                        # Cut into exact frames (resampled and G.711-encoded for telephony); one event per frame below
+                        frames = framer.push(audio_tensor)
+                        total_audio_chunks += 1
+                        safe_delete_tensors(audio_tensor)
+                    else:
+                        # Convert tensor to raw 16-bit PCM data
+                        audio_tensor = torch.clamp(audio_tensor, -1.0, 1.0)
+                        audio_tensor_int = (audio_tensor * 32767).to(torch.int16)
+                        pcm_data = audio_tensor_int.numpy().tobytes()
+
+                        # Base64 encode the raw PCM data
+                        audio_base64 = base64.b64encode(pcm_data).decode('utf-8')
+
+                        # Create SSE event for this audio chunk
+                        sse_event = SSEAudioDelta(audio=audio_base64)
+
+                        # Format as SSE event
+                        sse_data = f"data: {sse_event.model_dump_json()}\n\n"
+                        yield sse_data
+
+                        total_audio_chunks += 1
+
+                        # Clean up this chunk
+                        safe_delete_tensors(audio_tensor, audio_tensor_int)
+                        del pcm_data
+
+                if framer is not None:
+                    for frame in frames:
+                        if pacer is not None:
+                            await pacer.wait()
+                        sse_event = SSEAudioDelta(audio=base64.b64encode(frame).decode('utf-8'))
+                        yield f"data: {sse_event.model_dump_json()}\n\n"
+            
+                # Periodic memory cleanup during generation
+                if i > 0 and i % 3 == 0:  # Every 3 chunks
+                    import gc
+                    gc.collect()
+                    if torch.cuda.is_available():
+                        torch.cuda.empty_cache()
+
+        if framer is not None:
+            # Resampler tail (telephony) and the last partial frame, padded with silence
+            for frame in framer.flush():
+                if pacer is not None:
+                    await pacer.wait()
+                sse_event = SSEAudioDelta(audio=base64.b64encode(frame).decode('utf-8'))
+                yield f"data: {sse_event.model_dump_json()}\n\n"
+            if pacer is not None and pacer.underruns:
+                print(f"⚠️ Paced SSE stream fell behind real time {pacer.underruns} time(s)")
         
         # Send completion event
         total_output_tokens = total_audio_chunks * 50  # Rough estimate
@@ -751,8 +1434,19 @@ async def generate_speech_sse(
         yield final_sse_data
         
         # Mark as completed
-        update_tts_status(request_id, TTSStatus.COMPLETED, "SSE audio generation completed")
-        print(f"✓ SSE audio generation completed. Total chunks: {total_audio_chunks}")
+        queue_wait = get_inference_scheduler().pop_request_queue_wait(request_id)
+        update_tts_status(request_id, TTSStatus.COMPLETED, "SSE audio generation completed",
+                        queue_wait_seconds=queue_wait)
+        print(f"✓ SSE audio generation completed. Total chunks: {total_audio_chunks} (queue wait {queue_wait:.2f}s)")
+        
+    except (ClientDisconnectedError, asyncio.CancelledError, GeneratorExit) as e:
+        # Client went away (detected by us, or the server cancelled/closed the stream):
+        # drop this request's queued chunks instead of generating them
+        cancelled = get_inference_scheduler().cancel_request(request_id)
+        update_tts_status(request_id, TTSStatus.CANCELLED, "Client disconnected")
+        print(f"🔌 Client disconnected, stopped SSE generation ({cancelled} queued chunks cancelled)")
+        if not isinstance(e, ClientDisconnectedError):
+            raise
         
     except Exception as e:
         # Update status with error
@@ -769,6 +1463,8 @@ async def generate_speech_sse(
         )
     
     finally:
+        get_inference_scheduler().pop_request_queue_wait(request_id)
+        
         # Periodic memory cleanup
         if REQUEST_COUNTER % Config.MEMORY_CLEANUP_INTERVAL == 0:
             cleanup_memory()
@@ -787,15 +1483,16 @@ async def generate_speech_sse(
     "/audio/speech",
     response_class=StreamingResponse,
     responses={
-        200: {"content": {"audio/wav": {}, "text/event-stream": {}}},
+        200: {"content": {**{fmt["media_type"]: {} for fmt in AUDIO_FORMATS.values()}, "text/event-stream": {}}},
         400: {"model": ErrorResponse},
         404: {"model": ErrorResponse},
-        500: {"model": ErrorResponse}
+        500: {"model": ErrorResponse},
+        503: {"model": ErrorResponse}
     },
     summary="Generate speech from text",
-    description="Generate speech audio from input text. Supports voice names from the voice library or defaults to configured voice sample. Use stream_format='sse' for Server-Side Events streaming."
+    description="Generate speech audio from input text. Supports voice names from the voice library or defaults to configured voice sample. response_format selects wav, mp3, opus, aac, flac, webm or pcm output. Use stream_format='sse' for Server-Side Events streaming (response_format mulaw or alaw sends 8 kHz telephony frames)."
 )
-async def text_to_speech(request: TTSRequest):
+async def text_to_speech(request: TTSRequest, http_request: Request):
     """Generate speech from text using Chatterbox TTS with voice selection support"""
     
     # Validate text length BEFORE creating streaming response
@@ -813,44 +1510,80 @@ async def text_to_speech(request: TTSRequest):
     # Resolve voice name to file path and language
     voice_sample_path, language_id = resolve_voice_path_and_language(request.voice)
     
+    if request.stream_format == "sse":
+        response_format = sse_audio_format(request.response_format)
+    else:
+        response_format = check_response_format(request.response_format)
+    
+    # Wait for the model if it is still loading, then reject early if the inference queue is saturated
+    model_wait = await wait_for_model_ready()
+    if request.stream_format == "sse":
+        check_inference_admission(
+            request.input,
+            chunk_size=request.streaming_chunk_size,
+            max_in_flight=request.streaming_buffer_size or Config.STREAMING_LOOKAHEAD_CHUNKS
+        )
+    else:
+        check_inference_admission(request.input)
+    
     # Check if SSE streaming is requested
     if request.stream_format == "sse":
-        # Return SSE streaming response
+        # Return SSE streaming response; identical concurrent requests share one producer
+        key = single_flight_key(
+            request.input, voice_sample_path, language_id, request.exaggeration, request.temperature, request.seed,
+            f"{response_format}-sse",
+            streaming_format_options(
+                request.streaming_chunk_size, request.streaming_strategy, request.streaming_quality,
+                request.streaming_frame_ms, request.streaming_pacing
+            )
+        )
         return StreamingResponse(
-            generate_speech_sse(
+            stream_shared(key, partial(
+                generate_speech_sse,
                 text=request.input,
                 voice_sample_path=voice_sample_path,
                 language_id=language_id,
                 exaggeration=request.exaggeration,
                 cfg_weight=request.cfg_weight,
                 temperature=request.temperature,
+                seed=request.seed,
                 streaming_chunk_size=request.streaming_chunk_size,
                 streaming_strategy=request.streaming_strategy,
-                streaming_quality=request.streaming_quality
-            ),
+                streaming_quality=request.streaming_quality,
+                streaming_buffer_size=request.streaming_buffer_size,
+                streaming_frame_ms=request.streaming_frame_ms,
+                streaming_pacing=request.streaming_pacing,
+                response_format=response_format
+            ), http_request),
             media_type="text/event-stream",
             headers={
                 "Cache-Control": "no-cache",
                 "Connection": "keep-alive",
-                "X-Accel-Buffering": "no"  # Disable nginx buffering
+                "X-Accel-Buffering": "no",  # Disable nginx buffering
+                **model_wait_headers(model_wait)
             }
         )
     else:
         # Standard audio generation
-        buffer = await generate_speech_internal(
+        audio_bytes, cache_status, cache_key = await generate_speech_shared(
             text=request.input,
             voice_sample_path=voice_sample_path,
             language_id=language_id,
             exaggeration=request.exaggeration,
             cfg_weight=request.cfg_weight,
-            temperature=request.temperature
+            temperature=request.temperature,
+            seed=request.seed,
+            response_format=response_format,
+            cache_lookup=not wants_fresh_response(http_request)
         )
         
         # Create response
         response = StreamingResponse(
-            io.BytesIO(buffer.getvalue()),
-            media_type="audio/wav",
-            headers={"Content-Disposition": "attachment; filename=speech.wav"}
+            io.BytesIO(audio_bytes),
+            media_type=AUDIO_FORMATS[response_format]["media_type"],
+            headers=speech_response_headers(
+                audio_bytes, cache_status, cache_key, request.seed, model_wait, response_format
+            )
         )
         
         return response
@@ -860,25 +1593,31 @@ async def text_to_speech(request: TTSRequest):
     "/audio/speech/upload",
     response_class=StreamingResponse,
     responses={
-        200: {"content": {"audio/wav": {}, "text/event-stream": {}}},
+        200: {"content": {**{fmt["media_type"]: {} for fmt in AUDIO_FORMATS.values()}, "text/event-stream": {}}},
         400: {"model": ErrorResponse},
-        500: {"model": ErrorResponse}
+        500: {"model": ErrorResponse},
+        503: {"model": ErrorResponse}
     },
     summary="Generate speech with custom voice upload or library selection",
-    description="Generate speech audio from input text with voice library selection or optional custom voice file upload. Use stream_format='sse' for Server-Side Events streaming."
+    description="Generate speech audio from input text with voice library selection or optional custom voice file upload. response_format selects wav, mp3, opus, aac, flac, webm or pcm output. Use stream_format='sse' for Server-Side Events streaming (response_format mulaw or alaw sends 8 kHz telephony frames)."
 )
 async def text_to_speech_with_upload(
+    http_request: Request,
     input: str = Form(..., description="The text to generate audio for", min_length=1, max_length=3000),
     voice: Optional[str] = Form("alloy", description="Voice name from library or OpenAI voice name (defaults to configured sample)"),
-    response_format: Optional[str] = Form("wav", description="Audio format (always returns WAV)"),
+    response_format: Optional[str] = Form("wav", description="Audio format: wav, mp3, opus, aac, flac, webm or pcm; mulaw or alaw for SSE"),
     speed: Optional[float] = Form(1.0, description="Speed of speech (ignored)"),
     stream_format: Optional[str] = Form("audio", description="Streaming format: 'audio' for raw audio stream, 'sse' for Server-Side Events"),
     exaggeration: Optional[float] = Form(None, description="Emotion intensity (0.25-2.0)", ge=0.25, le=2.0),
     cfg_weight: Optional[float] = Form(None, description="Pace control (0.0-1.0)", ge=0.0, le=1.0),
     temperature: Optional[float] = Form(None, description="Sampling temperature (0.05-5.0)", ge=0.05, le=5.0),
+    seed: Optional[int] = Form(None, description="Random seed for reproducible generation", ge=0, le=4294967295),
     streaming_chunk_size: Optional[int] = Form(None, description="Characters per streaming chunk (50-500)", ge=50, le=500),
     streaming_strategy: Optional[str] = Form(None, description="Chunking strategy (sentence, paragraph, fixed, word)"),
     streaming_quality: Optional[str] = Form(None, description="Quality preset (fast, balanced, high)"),
+    streaming_buffer_size: Optional[int] = Form(None, description="Number of chunks generated ahead of playback (1-10)", ge=1, le=10),
+    streaming_frame_ms: Optional[int] = Form(None, description="Split streamed audio into frames of this many ms (0 = off, or 20-200)", ge=0, le=200),
+    streaming_pacing: Optional[bool] = Form(None, description="Send streamed audio frames in real time"),
     voice_file: Optional[UploadFile] = File(None, description="Optional voice sample file for custom voice cloning")
 ):
     """Generate speech from text using Chatterbox TTS with optional voice file upload"""
@@ -899,6 +1638,12 @@ async def text_to_speech_with_upload(
             detail={"error": {"message": "stream_format must be 'audio' or 'sse'", "type": "validation_error"}}
         )
     
+    # Validate response_format (SSE events carry PCM, or telephony frames for mulaw/alaw)
+    if stream_format == 'sse':
+        response_format = sse_audio_format(response_format)
+    else:
+        response_format = check_response_format(response_format)
+    
     # Validate streaming parameters for SSE
     if stream_format == 'sse':
         if streaming_strategy and streaming_strategy not in ['sentence', 'paragraph', 'fixed', 'word']:
@@ -912,6 +1657,24 @@ async def text_to_speech_with_upload(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail={"error": {"message": "streaming_quality must be one of: fast, balanced, high", "type": "validation_error"}}
             )
+        
+        if streaming_frame_ms is not None and 0 < streaming_frame_ms < 20:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={"error": {"message": "streaming_frame_ms must be 0 or between 20 and 200", "type": "validation_error"}}
+            )
+    
+    # Wait for the model if it is still loading, then reject early if the
+    # inference queue is saturated (before any temp files are written)
+    model_wait = await wait_for_model_ready()
+    if stream_format == 'sse':
+        check_inference_admission(
+            input,
+            chunk_size=streaming_chunk_size,
+            max_in_flight=streaming_buffer_size or Config.STREAMING_LOOKAHEAD_CHUNKS
+        )
+    else:
+        check_inference_admission(input)
     
     # Handle voice selection and file upload
     temp_voice_path = None
@@ -975,19 +1738,33 @@ async def text_to_speech_with_upload(
         # Check if SSE streaming is requested
         if stream_format == "sse":
             # Create async generator that handles cleanup
+            # Only library/default voices are shared; a temp file must not outlive its request
+            key = None if temp_voice_path else single_flight_key(
+                input, voice_sample_path, language_id, exaggeration, temperature, seed, f"{response_format}-sse",
+                streaming_format_options(
+                    streaming_chunk_size, streaming_strategy, streaming_quality, streaming_frame_ms, streaming_pacing
+                )
+            )
+            
             async def sse_streaming_with_cleanup():
                 try:
-                    async for sse_event in generate_speech_sse(
+                    async for sse_event in stream_shared(key, partial(
+                        generate_speech_sse,
                         text=input,
                         voice_sample_path=voice_sample_path,
                         language_id=language_id,
                         exaggeration=exaggeration,
                         cfg_weight=cfg_weight,
                         temperature=temperature,
+                        seed=seed,
                         streaming_chunk_size=streaming_chunk_size,
                         streaming_strategy=streaming_strategy,
-                        streaming_quality=streaming_quality
-                    ):
+                        streaming_quality=streaming_quality,
+                        streaming_buffer_size=streaming_buffer_size,
+                        streaming_frame_ms=streaming_frame_ms,
+                        streaming_pacing=streaming_pacing,
+                        response_format=response_format
+                    ), http_request):
                         yield sse_event
                 finally:
                     # Clean up temporary voice file
@@ -1005,25 +1782,30 @@ async def text_to_speech_with_upload(
                 headers={
                     "Cache-Control": "no-cache",
                     "Connection": "keep-alive",
-                    "X-Accel-Buffering": "no"  # Disable nginx buffering
+                    "X-Accel-Buffering": "no",  # Disable nginx buffering
+                    **model_wait_headers(model_wait)
                 }
             )
         else:
-            # Generate speech using internal function
-            buffer = await generate_speech_internal(
+            # Generate speech (shared with identical concurrent requests unless a voice was uploaded)
+            audio_bytes, cache_status, cache_key = await generate_speech_shared(
                 text=input,
                 voice_sample_path=voice_sample_path,
                 language_id=language_id,
                 exaggeration=exaggeration,
                 cfg_weight=cfg_weight,
-                temperature=temperature
+                temperature=temperature,
+                seed=seed,
+                shareable=temp_voice_path is None,
+                response_format=response_format,
+                cache_lookup=not wants_fresh_response(http_request)
             )
             
             # Create response
             response = StreamingResponse(
-                io.BytesIO(buffer.getvalue()),
-                media_type="audio/wav",
-                headers={"Content-Disposition": "attachment; filename=speech.wav"}
+                io.BytesIO(audio_bytes),
+                media_type=AUDIO_FORMATS[response_format]["media_type"],
+                headers=speech_response_headers(audio_bytes, cache_status, cache_key, seed, model_wait, response_format)
             )
             
             return response
@@ -1042,40 +1824,61 @@ async def text_to_speech_with_upload(
     "/audio/speech/stream",
     response_class=StreamingResponse,
     responses={
-        200: {"content": {"audio/wav": {}}},
+        200: {"content": {AUDIO_FORMATS[fmt]["media_type"]: {} for fmt in STREAMING_FORMATS}},
         400: {"model": ErrorResponse},
         404: {"model": ErrorResponse},
-        500: {"model": ErrorResponse}
+        500: {"model": ErrorResponse},
+        503: {"model": ErrorResponse}
     },
     summary="Stream speech generation from text",
-    description="Generate and stream speech audio in real-time. Supports voice names from the voice library or defaults to configured voice sample."
+    description="Generate and stream speech audio in real-time. Supports voice names from the voice library or defaults to configured voice sample. response_format selects wav (default), pcm, opus (Ogg), webm, mp3 or aac; compressed formats are encoded incrementally as chunks are generated. mulaw and alaw stream 8 kHz G.711 in fixed-size frames for telephony."
 )
-async def stream_text_to_speech(request: TTSRequest):
+async def stream_text_to_speech(request: TTSRequest, http_request: Request):
     """Stream speech generation from text using Chatterbox TTS with voice selection support"""
     
     # Resolve voice name to file path and language
     voice_sample_path, language_id = resolve_voice_path_and_language(request.voice)
+    response_format = check_response_format(request.response_format, streaming=True)
+    
+    # Wait for the model if it is still loading, then reject early if the inference queue is saturated
+    model_wait = await wait_for_model_ready()
+    check_inference_admission(
+        request.input,
+        chunk_size=request.streaming_chunk_size,
+        max_in_flight=request.streaming_buffer_size or Config.STREAMING_LOOKAHEAD_CHUNKS
+    )
+    
+    # Identical concurrent requests receive the same byte stream from one producer
+    key = single_flight_key(
+        request.input, voice_sample_path, language_id, request.exaggeration, request.temperature, request.seed,
+        f"{response_format}-stream",
+        streaming_format_options(
+            request.streaming_chunk_size, request.streaming_strategy, request.streaming_quality,
+            request.streaming_frame_ms, request.streaming_pacing
+        )
+    )
     
     # Create streaming response
     return StreamingResponse(
-        generate_speech_streaming(
+        stream_shared(key, partial(
+            generate_speech_stream_encoded,
+            response_format=response_format,
             text=request.input,
             voice_sample_path=voice_sample_path,
             language_id=language_id,
             exaggeration=request.exaggeration,
             cfg_weight=request.cfg_weight,
             temperature=request.temperature,
+            seed=request.seed,
             streaming_chunk_size=request.streaming_chunk_size,
             streaming_strategy=request.streaming_strategy,
-            streaming_quality=request.streaming_quality
-        ),
-        media_type="audio/wav",
-        headers={
-            "Content-Disposition": "attachment; filename=speech_stream.wav",
-            "Transfer-Encoding": "chunked",
-            "Cache-Control": "no-cache",
-            "X-Accel-Buffering": "no"  # Disable nginx buffering for true streaming
-        }
+            streaming_quality=request.streaming_quality,
+            streaming_buffer_size=request.streaming_buffer_size,
+            streaming_frame_ms=request.streaming_frame_ms,
+            streaming_pacing=request.streaming_pacing
+        ), http_request),
+        media_type=AUDIO_FORMATS[response_format]["media_type"],
+        headers=streaming_response_headers(response_format, model_wait)
     )
 
 
@@ -1083,24 +1886,30 @@ async def stream_text_to_speech(request: TTSRequest):
     "/audio/speech/stream/upload",
     response_class=StreamingResponse,
     responses={
-        200: {"content": {"audio/wav": {}}},
+        200: {"content": {AUDIO_FORMATS[fmt]["media_type"]: {} for fmt in STREAMING_FORMATS}},
         400: {"model": ErrorResponse},
-        500: {"model": ErrorResponse}
+        500: {"model": ErrorResponse},
+        503: {"model": ErrorResponse}
     },
     summary="Stream speech generation with custom voice upload",
-    description="Generate and stream speech audio in real-time with optional custom voice file upload"
+    description="Generate and stream speech audio in real-time with optional custom voice file upload. response_format selects wav (default), pcm, opus (Ogg), webm, mp3, aac, mulaw or alaw."
 )
 async def stream_text_to_speech_with_upload(
+    http_request: Request,
     input: str = Form(..., description="The text to generate audio for", min_length=1, max_length=3000),
     voice: Optional[str] = Form("alloy", description="Voice name from library or OpenAI voice name (defaults to configured sample)"),
-    response_format: Optional[str] = Form("wav", description="Audio format (always returns WAV)"),
+    response_format: Optional[str] = Form("wav", description="Audio format: wav, pcm, opus, webm, mp3, aac, mulaw or alaw"),
     speed: Optional[float] = Form(1.0, description="Speed of speech (ignored)"),
     exaggeration: Optional[float] = Form(None, description="Emotion intensity (0.25-2.0)", ge=0.25, le=2.0),
     cfg_weight: Optional[float] = Form(None, description="Pace control (0.0-1.0)", ge=0.0, le=1.0),
     temperature: Optional[float] = Form(None, description="Sampling temperature (0.05-5.0)", ge=0.05, le=5.0),
+    seed: Optional[int] = Form(None, description="Random seed for reproducible generation", ge=0, le=4294967295),
     streaming_chunk_size: Optional[int] = Form(None, description="Characters per streaming chunk (50-500)", ge=50, le=500),
     streaming_strategy: Optional[str] = Form(None, description="Chunking strategy (sentence, paragraph, fixed, word)"),
     streaming_quality: Optional[str] = Form(None, description="Quality preset (fast, balanced, high)"),
+    streaming_buffer_size: Optional[int] = Form(None, description="Number of chunks generated ahead of playback (1-10)", ge=1, le=10),
+    streaming_frame_ms: Optional[int] = Form(None, description="Split streamed audio into frames of this many ms (0 = off, or 20-200)", ge=0, le=200),
+    streaming_pacing: Optional[bool] = Form(None, description="Send streamed audio frames in real time"),
     voice_file: Optional[UploadFile] = File(None, description="Optional voice sample file for custom voice cloning")
 ):
     """Stream speech generation from text using Chatterbox TTS with optional voice file upload"""
@@ -1127,6 +1936,23 @@ async def stream_text_to_speech_with_upload(
             detail={"error": {"message": "streaming_quality must be one of: fast, balanced, high", "type": "validation_error"}}
         )
     
+    if streaming_frame_ms is not None and 0 < streaming_frame_ms < 20:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"error": {"message": "streaming_frame_ms must be 0 or between 20 and 200", "type": "validation_error"}}
+        )
+    
+    response_format = check_response_format(response_format, streaming=True)
+    
+    # Wait for the model if it is still loading, then reject early if the
+    # inference queue is saturated (before any temp files are written)
+    model_wait = await wait_for_model_ready()
+    check_inference_admission(
+        input,
+        chunk_size=streaming_chunk_size,
+        max_in_flight=streaming_buffer_size or Config.STREAMING_LOOKAHEAD_CHUNKS
+    )
+    
     # Handle voice selection and file upload
     temp_voice_path = None
     voice_sample_path = Config.VOICE_SAMPLE_PATH  # Default
@@ -1173,20 +1999,34 @@ async def stream_text_to_speech_with_upload(
                 }
             )
     
+    # Only library/default voices are shared; a temp file must not outlive its request
+    key = None if temp_voice_path else single_flight_key(
+        input, voice_sample_path, language_id, exaggeration, temperature, seed, f"{response_format}-stream",
+        streaming_format_options(
+            streaming_chunk_size, streaming_strategy, streaming_quality, streaming_frame_ms, streaming_pacing
+        )
+    )
+    
     # Create async generator that handles cleanup
     async def streaming_with_cleanup():
         try:
-            async for chunk in generate_speech_streaming(
+            async for chunk in stream_shared(key, partial(
+                generate_speech_stream_encoded,
+                response_format=response_format,
                 text=input,
                 voice_sample_path=voice_sample_path,
                 language_id=language_id,
                 exaggeration=exaggeration,
                 cfg_weight=cfg_weight,
                 temperature=temperature,
+                seed=seed,
                 streaming_chunk_size=streaming_chunk_size,
                 streaming_strategy=streaming_strategy,
-                streaming_quality=streaming_quality
-            ):
+                streaming_quality=streaming_quality,
+                streaming_buffer_size=streaming_buffer_size,
+                streaming_frame_ms=streaming_frame_ms,
+                streaming_pacing=streaming_pacing
+            ), http_request):
                 yield chunk
         finally:
             # Clean up temporary voice file
@@ -1200,14 +2040,80 @@ async def stream_text_to_speech_with_upload(
     # Create streaming response
     return StreamingResponse(
         streaming_with_cleanup(),
-        media_type="audio/wav",
-        headers={
-            "Content-Disposition": "attachment; filename=speech_stream.wav",
-            "Transfer-Encoding": "chunked",
-            "Cache-Control": "no-cache",
-            "X-Accel-Buffering": "no"  # Disable nginx buffering for true streaming
-        }
+        media_type=AUDIO_FORMATS[response_format]["media_type"],
+        headers=streaming_response_headers(response_format, model_wait)
     )
 
+
+@router.get(
+    "/audio/results/{content_hash}",
+    response_class=Response,
+    responses={
+        200: {"content": {fmt["media_type"]: {} for fmt in AUDIO_FORMATS.values()}},
+        206: {"content": {fmt["media_type"]: {} for fmt in AUDIO_FORMATS.values()}},
+        304: {"description": "Not modified"},
+        404: {"model": ErrorResponse},
+        416: {"model": ErrorResponse}
+    },
+    summary="Fetch a stored synthesis result",
+    description="Fetch the audio of a deterministic (seeded) request by the address returned in its Content-Location header. Supports ETag revalidation with If-None-Match and byte ranges."
+)
+async def get_audio_result(content_hash: str, http_request: Request):
+    """Serve a stored result with strong ETags, conditional GET and Range support"""
+    cached = None
+    if len(content_hash) == 64 and all(c in "0123456789abcdef" for c in content_hash):
+        cached = await asyncio.to_thread(get_response_cache().get, content_hash)
+    
+    if cached is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "error": {
+                    "message": f"Result {content_hash} not found or expired",
+                    "type": "not_found_error"
+                }
+            }
+        )
+    
+    audio_bytes, response_format = cached
+    etag = audio_etag(audio_bytes)
+    media_type = AUDIO_FORMATS[response_format]["media_type"]
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        # The address identifies the content, so it never changes
+        "Cache-Control": f"public, max-age={Config.RESULT_URL_MAX_AGE_SECONDS}, immutable"
+    }
+    
+    if etag_matches(http_request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    range_header = http_request.headers.get("range")
+    if_range = http_request.headers.get("if-range")
+    if range_header and (not if_range or if_range.strip() == etag):
+        byte_range = parse_byte_range(range_header, len(audio_bytes))
+        if byte_range is None:
+            raise HTTPException(
+                status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                detail={
+                    "error": {
+                        "message": f"Range not satisfiable: {range_header}",
+                        "type": "invalid_request_error"
+                    }
+                },
+                headers={"Content-Range": f"bytes */{len(audio_bytes)}"}
+            )
+        
+        start, end = byte_range
+        headers["Content-Range"] = f"bytes {start}-{end}/{len(audio_bytes)}"
+        return Response(
+            content=audio_bytes[start:end + 1],
+            status_code=status.HTTP_206_PARTIAL_CONTENT,
+            media_type=media_type,
+            headers=headers
+        )
+    
+    return Response(content=audio_bytes, media_type=media_type, headers=headers)
+
 # Export the base router for the main app to use
 __all__ = ["base_router"] 
\ No newline at end of file
@@ -0,0 +1,443 @@
+"""
+WebSocket endpoint for incremental text-in / audio-out speech
+"""
+
+import asyncio
+import json
+import uuid
+from collections import deque
+from contextlib import aclosing
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, AsyncGenerator, Deque, List, Optional
+
+from fastapi import APIRouter, Query, WebSocket, WebSocketDisconnect, status
+from pydantic import BaseModel
+
+from app.config import Config
+from app.core import add_route_aliases
+from app.core.tts_model import get_model
+from app.core.inference_scheduler import AdmissionRejectedError, GenerationParams, get_inference_scheduler
+from app.core.text_processing import IncrementalTextSegmenter
+from app.core.readiness import get_readiness_gate, ModelNotReadyError
+from app.core.audio_encoding import STREAMING_FORMATS, get_audio_encoder, to_pcm16
+from app.core.audio_framing import TELEPHONY_FORMATS, TELEPHONY_SAMPLE_RATE
+from app.models import WebSocketSessionEvent, WebSocketSegmentEvent, WebSocketErrorEvent
+from app.api.endpoints.speech import (
+    resolve_voice_path_and_language,
+    use_incremental_vocoding,
+    start_chunk_generation,
+    chunk_audio_pieces,
+    create_telephony_framing
+)
+
+if TYPE_CHECKING:
+    import torch
+
+# Create router with aliasing support
+base_router = APIRouter()
+router = add_route_aliases(base_router)
+
+# Audio formats a session can stream (a WAV header needs a length, so raw pcm replaces wav)
+WEBSOCKET_FORMATS = tuple(fmt for fmt in STREAMING_FORMATS if fmt != "wav")
+
+
+@dataclass
+class _Segment:
+    """A chunk of session text and its generation (started once a slot is free)"""
+    segment_id: int
+    text: str
+    task: Optional[asyncio.Task] = None
+
+
+class SpeechWebSocketSession:
+    """
+    One text-in / audio-out WebSocket session.
+
+    Text deltas go through an IncrementalTextSegmenter, and every segment it
+    completes is queued for generation straight away, up to
+    WEBSOCKET_MAX_ACTIVE_SEGMENTS at a time. A sender task delivers the
+    segments' audio in order as binary messages. All of a session's audio is
+    one continuous stream in ``response_format``, so compressed and telephony
+    formats keep one encoder for the whole session.
+
+    Text not yet spoken is bounded by MAX_TOTAL_LENGTH characters and
+    WEBSOCKET_MAX_QUEUED_SEGMENTS segments, so a client can't queue more work
+    than a single request could carry.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        generation_params: GenerationParams,
+        segmenter: IncrementalTextSegmenter,
+        response_format: str
+    ):
+        self.websocket = websocket
+        self.generation_params = generation_params
+        self.segmenter = segmenter
+        self.response_format = response_format
+        self.session_id = f"ws-{uuid.uuid4().hex[:12]}"
+        self.incremental = use_incremental_vocoding()
+        self.sample_rate = get_model().sr
+
+        self._queue: Deque[_Segment] = deque()
+        self._current: Optional[_Segment] = None
+        self._next_segment_id = 0
+        self._queued = asyncio.Event()
+        self._closing = False
+        self._send_lock = asyncio.Lock()
+        self._sender: Optional[asyncio.Task] = None
+
+        self._telephony, self._pacer = create_telephony_framing(response_format, self.sample_rate)
+        self._pcm: Optional[asyncio.Queue] = None
+        self._encoder: Optional[asyncio.Task] = None
+        self._encoder_failure: Optional[asyncio.Task] = None
+
+        self.segments_spoken = 0
+        self.samples_sent = 0
+
+    async def run(self):
+        """Serve the session until the client closes it or disconnects"""
+        await self._send_event(WebSocketSessionEvent(
+            type="session.ready",
+            session_id=self.session_id,
+            response_format=self.response_format,
+            sample_rate=TELEPHONY_SAMPLE_RATE if self._telephony is not None else self.sample_rate,
+            channels=1
+        ))
+        if self.response_format not in ("pcm", *TELEPHONY_FORMATS):
+            self._pcm = asyncio.Queue(maxsize=4)
+            self._encoder = asyncio.create_task(self._send_encoded())
+            self._encoder.add_done_callback(self._on_encoder_done)
+        self._sender = asyncio.create_task(self._send_segments())
+        print(f"🔌 WebSocket session {self.session_id} opened ({self.response_format})")
+
+        try:
+            while True:
+                message = await self.websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    print(f"🔌 WebSocket session {self.session_id} disconnected")
+                    return
+                if message.get("text") is None:
+                    await self._send_error("Send control messages as JSON text frames", "validation_error")
+                    continue
+                try:
+                    data = json.loads(message["text"])
+                    kind = data.get("type")
+                except (ValueError, AttributeError):
+                    await self._send_error("Messages must be JSON objects with a 'type'", "validation_error")
+                    continue
+
+                if kind == "text":
+                    text = str(data.get("text", ""))
+                    if self._unspoken_length() + len(text) > Config.MAX_TOTAL_LENGTH:
+                        await self._send_error(
+                            f"Text rejected: more than {Config.MAX_TOTAL_LENGTH} characters would be waiting "
+                            "to be spoken. Send more once earlier segments are done", "validation_error"
+                        )
+                        continue
+                    for chunk in self.segmenter.push(text):
+                        await self._dispatch(chunk)
+                elif kind == "flush":
+                    for chunk in self.segmenter.flush():
+                        await self._dispatch(chunk)
+                elif kind == "cancel":
+                    await self._cancel()
+                elif kind == "close":
+                    for chunk in self.segmenter.flush():
+                        await self._dispatch(chunk)
+                    await self._finish()
+                    return
+                else:
+                    await self._send_error(
+                        f"Unknown message type '{kind}'. Expected text, flush, cancel or close", "validation_error"
+                    )
+        except WebSocketDisconnect:
+            print(f"🔌 WebSocket session {self.session_id} disconnected")
+        finally:
+            await self._shutdown()
+
+    async def _dispatch(self, text: str):
+        """Queue a completed segment for generation and acknowledge it"""
+        segment = _Segment(self._next_segment_id, text)
+        self._next_segment_id += 1
+        if len(self._unfinished()) >= Config.WEBSOCKET_MAX_QUEUED_SEGMENTS:
+            await self._send_event(WebSocketSegmentEvent(
+                type="segment.failed", segment_id=segment.segment_id,
+                error=f"Too many segments waiting to be spoken (limit {Config.WEBSOCKET_MAX_QUEUED_SEGMENTS})"
+            ))
+            return
+        try:
+            get_inference_scheduler().check_admission(1)
+        except AdmissionRejectedError as e:
+            print(f"🚦 Rejecting WebSocket segment: {e} (Retry-After {e.retry_after}s)")
+            await self._send_event(WebSocketSegmentEvent(
+                type="segment.failed", segment_id=segment.segment_id, error=f"Server is busy: {e}"
+            ))
+            return
+
+        self._queue.append(segment)
+        self._start_generation()
+        self._queued.set()
+        await self._send_event(WebSocketSegmentEvent(type="segment.queued", segment_id=segment.segment_id, text=text))
+
+    def _start_generation(self):
+        """Start generating the oldest waiting segments while fewer than the limit are active"""
+        active = 0
+        for segment in self._unfinished():
+            if active >= Config.WEBSOCKET_MAX_ACTIVE_SEGMENTS:
+                break
+            if segment.task is None:
+                segment.task = start_chunk_generation(
+                    segment.text, self.generation_params, self.session_id, self.incremental
+                )
+            active += 1
+
+    def _unfinished(self) -> List[_Segment]:
+        """The segment being sent, then the queued ones, in order"""
+        return ([self._current] if self._current is not None else []) + list(self._queue)
+
+    def _unspoken_length(self) -> int:
+        """Characters of text received but not yet spoken"""
+        return len(self.segmenter.pending) + sum(len(segment.text) for segment in self._unfinished())
+
+    async def _send_segments(self):
+        """Deliver each segment's audio in order as it is generated"""
+        while True:
+            if not self._queue:
+                if self._closing:
+                    return
+                self._queued.clear()
+                await self._queued.wait()
+                continue
+
+            segment = self._current = self._queue.popleft()
+            self._start_generation()
+            try:
+                await self._send_segment(segment)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"✗ WebSocket segment {segment.segment_id} failed: {e}")
+                await self._send_event(WebSocketSegmentEvent(
+                    type="segment.failed", segment_id=segment.segment_id, error=str(e)
+                ))
+            finally:
+                self._current = None
+
+    async def _send_segment(self, segment: _Segment):
+        await self._send_event(WebSocketSegmentEvent(type="segment.started", segment_id=segment.segment_id))
+        result = await segment.task
+        samples = 0
+        async with aclosing(chunk_audio_pieces(result, self.generation_params, self.incremental)) as pieces:
+            async for audio_piece in pieces:
+                samples += audio_piece.shape[-1]
+                await self._write_audio(audio_piece)
+
+        self.segments_spoken += 1
+        self.samples_sent += samples
+        await self._send_event(WebSocketSegmentEvent(
+            type="segment.done", segment_id=segment.segment_id, audio_ms=samples * 1000 / self.sample_rate
+        ))
+
+    async def _write_audio(self, audio: "torch.Tensor"):
+        """Send audio in the session's format"""
+        if self._telephony is not None:
+            for frame in self._telephony.push(audio):
+                if self._pacer is not None:
+                    await self._pacer.wait()
+                await self._send_bytes(bytes(frame))
+        elif self._pcm is not None:
+            await self._put_pcm(to_pcm16(audio))
+        else:
+            await self._send_bytes(to_pcm16(audio))
+
+    async def _pcm_stream(self) -> AsyncGenerator[bytes, None]:
+        while True:
+            pcm = await self._pcm.get()
+            if pcm is None:
+                return
+            yield pcm
+
+    async def _put_pcm(self, pcm: Optional[bytes]):
+        """Hand PCM to the encoder, giving up if the encoder stops before taking it"""
+        put = asyncio.ensure_future(self._pcm.put(pcm))
+        await asyncio.wait({put, self._encoder}, return_when=asyncio.FIRST_COMPLETED)
+        put.cancel()
+
+    async def _send_encoded(self):
+        """Encode the session's PCM with one streaming encoder and send pages as they are produced"""
+        async with aclosing(get_audio_encoder().encode_stream(
+            self._pcm_stream(), self.sample_rate, self.response_format
+        )) as pages:
+            async for page in pages:
+                await self._send_bytes(page)
+
+    def _on_encoder_done(self, task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            self._encoder_failure = asyncio.create_task(self._report_encoder_failure(task.exception()))
+
+    async def _report_encoder_failure(self, error: BaseException):
+        """Stop sending audio nobody can encode, tell the client and close the session"""
+        print(f"✗ WebSocket session {self.session_id}: encoding {self.response_format} failed: {error}")
+        await _stop_task(self._sender)
+        await self._send_error(f"Encoding {self.response_format} failed: {error}", "encoding_error")
+        await self.websocket.close(code=status.WS_1011_INTERNAL_ERROR)
+
+    async def _cancel(self):
+        """Drop pending text and every segment that hasn't finished sending"""
+        self.segmenter.clear()
+        cancelled = self._unfinished()
+        await _stop_task(self._sender)
+        self._current = None
+        self._queue.clear()
+        for segment in cancelled:
+            if segment.task is not None:
+                segment.task.cancel()
+        get_inference_scheduler().cancel_request(self.session_id)
+
+        if self._pcm is not None:
+            while not self._pcm.empty():
+                self._pcm.get_nowait()
+        if self._telephony is not None:
+            # Start a fresh frame stream rather than finishing the interrupted one
+            self._telephony, self._pacer = create_telephony_framing(self.response_format, self.sample_rate)
+
+        for segment in cancelled:
+            await self._send_event(WebSocketSegmentEvent(type="segment.cancelled", segment_id=segment.segment_id))
+        print(f"🛑 WebSocket session {self.session_id}: cancelled {len(cancelled)} segment(s)")
+        self._sender = asyncio.create_task(self._send_segments())
+
+    async def _finish(self):
+        """Send the audio of every queued segment, end the audio stream and close the session"""
+        self._closing = True
+        self._queued.set()
+        await asyncio.wait({self._sender})
+
+        if self._telephony is not None:
+            for frame in self._telephony.flush():
+                if self._pacer is not None:
+                    await self._pacer.wait()
+                await self._send_bytes(bytes(frame))
+        if self._encoder is not None:
+            await self._put_pcm(None)
+            await asyncio.wait({self._encoder})
+            if self._encoder_failure is not None:
+                # Reported, and the session closed, by _report_encoder_failure
+                await self._encoder_failure
+                return
+
+        await self._send_event(WebSocketSessionEvent(
+            type="session.closed",
+            session_id=self.session_id,
+            segments=self.segments_spoken,
+            audio_ms=self.samples_sent * 1000 / self.sample_rate
+        ))
+        await self.websocket.close()
+        print(f"✓ WebSocket session {self.session_id} closed: {self.segments_spoken} segment(s), "
+              f"{self.samples_sent / self.sample_rate:.1f}s of audio")
+
+    async def _shutdown(self):
+        """Stop all work of the session"""
+        await _stop_task(self._sender)
+        await _stop_task(self._encoder)
+        await _stop_task(self._encoder_failure)
+        for segment in self._unfinished():
+            if segment.task is not None:
+                segment.task.cancel()
+        get_inference_scheduler().cancel_request(self.session_id)
+        get_inference_scheduler().pop_request_queue_wait(self.session_id)
+
+    async def _send_event(self, event: BaseModel):
+        async with self._send_lock:
+            await self.websocket.send_text(event.model_dump_json(exclude_none=True))
+
+    async def _send_error(self, message: str, error_type: str):
+        await self._send_event(WebSocketErrorEvent(message=message, error_type=error_type))
+
+    async def _send_bytes(self, data: bytes):
+        async with self._send_lock:
+            await self.websocket.send_bytes(data)
+
+
+async def _stop_task(task: Optional[asyncio.Task]):
+    """Cancel a task and wait for it to finish"""
+    if task is None or task.done():
+        return
+    task.cancel()
+    try:
+        await task
+    except (asyncio.CancelledError, Exception):
+        pass
+
+
+@router.websocket("/audio/speech/ws")
+async def speech_websocket(
+    websocket: WebSocket,
+    voice: Optional[str] = Query(None, description="Voice name or alias from the voice library"),
+    response_format: str = Query("pcm", description="Audio format: pcm, opus, webm, mp3, aac, mulaw or alaw"),
+    exaggeration: Optional[float] = Query(None, ge=0.25, le=2.0),
+    temperature: Optional[float] = Query(None, ge=0.05, le=5.0),
+    seed: Optional[int] = Query(None, ge=0, le=4294967295),
+    streaming_chunk_size: Optional[int] = Query(None, ge=50, le=500),
+    streaming_strategy: Optional[str] = Query(None),
+    streaming_quality: Optional[str] = Query(None)
+):
+    """
+    Incremental text-to-speech over a WebSocket.
+
+    Send text as it is produced (``{"type": "text", "text": "..."}``); every
+    complete segment is generated right away and its audio is sent back as
+    binary messages. ``flush`` speaks pending text now, ``cancel`` drops
+    everything not yet spoken and ``close`` finishes the queued audio and ends
+    the session. Each segment is acknowledged with segment.queued, .started
+    and .done events.
+    """
+    await websocket.accept()
+
+    async def reject(message: str, error_type: str, code: int):
+        await websocket.send_text(WebSocketErrorEvent(message=message, error_type=error_type).model_dump_json())
+        await websocket.close(code=code)
+
+    response_format = response_format.lower()
+    if response_format not in WEBSOCKET_FORMATS:
+        return await reject(
+            f"Unsupported response_format '{response_format}'. Supported formats: {', '.join(WEBSOCKET_FORMATS)}",
+            "validation_error", status.WS_1008_POLICY_VIOLATION
+        )
+    if not get_audio_encoder().is_available(response_format):
+        return await reject(
+            f"response_format '{response_format}' requires ffmpeg, which is not installed on this server",
+            "validation_error", status.WS_1008_POLICY_VIOLATION
+        )
+    if streaming_strategy and streaming_strategy not in ['sentence', 'paragraph', 'fixed', 'word']:
+        return await reject(
+            "streaming_strategy must be one of: sentence, paragraph, fixed, word",
+            "validation_error", status.WS_1008_POLICY_VIOLATION
+        )
+    if streaming_quality and streaming_quality not in ['fast', 'balanced', 'high']:
+        return await reject(
+            "streaming_quality must be one of: fast, balanced, high",
+            "validation_error", status.WS_1008_POLICY_VIOLATION
+        )
+
+    # Hold the session while the model is initializing
+    try:
+        await get_readiness_gate().wait()
+    except ModelNotReadyError as e:
+        print(f"🚦 Rejecting WebSocket session: {e}")
+        return await reject(str(e), "model_not_ready", status.WS_1013_TRY_AGAIN_LATER)
+
+    voice_sample_path, language_id = resolve_voice_path_and_language(voice)
+    generation_params = GenerationParams(
+        voice_sample_path=voice_sample_path,
+        language_id=language_id,
+        exaggeration=exaggeration if exaggeration is not None else Config.EXAGGERATION,
+        temperature=temperature if temperature is not None else Config.TEMPERATURE,
+        seed=seed,
+        diffusion_steps=Config.VLLM_DIFFUSION_STEPS
+    )
+    segmenter = IncrementalTextSegmenter(streaming_chunk_size, streaming_strategy, streaming_quality)
+
+    session = SpeechWebSocketSession(websocket, generation_params, segmenter, response_format)
+    await session.run()
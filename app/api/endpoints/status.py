@@ -16,6 +16,15 @@ from app.core import (
     get_version,
     get_version_info
 )
+from app.core.inference_scheduler import get_inference_scheduler
+from app.core.voice_conditioning import get_conditioning_cache
+from app.core.singleflight import get_single_flight
+from app.core.response_cache import get_response_cache
+from app.core.fragment_cache import get_fragment_cache
+from app.core.tts_model import get_stage_stats
+from app.core.startup_timing import get_startup_timings
+from app.core.readiness import get_readiness_gate
+from app.core.audio_encoding import get_audio_encoder
 
 # Create router with aliasing support
 base_router = APIRouter()
@@ -133,6 +142,26 @@ async def get_processing_statistics(
     return stats
 
 
+@router.get(
+    "/status/performance",
+    summary="Get inference performance metrics",
+    description="Get batching scheduler, cache and request deduplication metrics such as queue depth, batch size and hit rates, audio encoder time and compression ratios, plus startup phase timings"
+)
+async def get_performance_metrics() -> Dict[str, Any]:
+    """Get inference performance metrics"""
+    return {
+        "scheduler": get_inference_scheduler().get_stats(),
+        "voice_conditioning_cache": get_conditioning_cache().get_stats(),
+        "single_flight": get_single_flight().get_stats(),
+        "response_cache": get_response_cache().get_stats(),
+        "fragment_cache": get_fragment_cache().get_stats(),
+        "pipeline_stages": get_stage_stats(),
+        "startup": get_startup_timings(),
+        "readiness": get_readiness_gate().get_stats(),
+        "audio_encoder": get_audio_encoder().get_stats()
+    }
+
+
 @router.post(
     "/status/history/clear",
     summary="Clear TTS request history",
@@ -3,7 +3,6 @@ Configuration management for Chatterbox TTS API
 """
 
 import os
-import torch
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -31,6 +30,12 @@ class Config:
     DEVICE_OVERRIDE = os.getenv('DEVICE', 'auto')
     MODEL_CACHE_DIR = os.getenv('MODEL_CACHE_DIR', './models')
     
+    # Synthesis backend: vllm (Chatterbox on vLLM) or synthetic (deterministic CPU stand-in)
+    TTS_BACKEND = os.getenv('TTS_BACKEND', 'vllm').lower()
+    SYNTHETIC_LATENCY_PER_CHAR_MS = float(os.getenv('SYNTHETIC_LATENCY_PER_CHAR_MS', 5.0))
+    SYNTHETIC_LATENCY_PER_BATCH_MS = float(os.getenv('SYNTHETIC_LATENCY_PER_BATCH_MS', 20.0))
+    SYNTHETIC_LATENCY_PER_STEP_MS = float(os.getenv('SYNTHETIC_LATENCY_PER_STEP_MS', 25.0))
+    
     # Model optimization settings (deprecated with vLLM backend)
     USE_INT8_QUANTIZATION = os.getenv('USE_INT8_QUANTIZATION', 'false').lower() == 'true'
     MODEL_DTYPE = os.getenv('MODEL_DTYPE', 'auto')  # auto, float32, float16, bfloat16
@@ -41,6 +46,81 @@ class Config:
     VLLM_COMPILE = os.getenv('VLLM_COMPILE', 'false').lower() == 'true'
     VLLM_S3GEN_FP16 = os.getenv('VLLM_S3GEN_FP16', 'false').lower() == 'true'
     VLLM_DIFFUSION_STEPS = int(os.getenv('VLLM_DIFFUSION_STEPS', 10))
+    VLLM_ENABLE_PREFIX_CACHING = os.getenv('VLLM_ENABLE_PREFIX_CACHING', 'false').lower() == 'true'
+    
+    # Startup warmup before the model is reported ready (empty lists = automatic)
+    ENABLE_WARMUP = os.getenv('ENABLE_WARMUP', 'true').lower() == 'true'
+    WARMUP_BATCH_SIZES = [int(v) for v in os.getenv('WARMUP_BATCH_SIZES', '').split(',') if v.strip()]
+    WARMUP_TEXT_LENGTHS = [int(v) for v in os.getenv('WARMUP_TEXT_LENGTHS', '').split(',') if v.strip()]
+    
+    # Inference scheduler settings (cross-request dynamic batching)
+    ENABLE_BATCH_SCHEDULER = os.getenv('ENABLE_BATCH_SCHEDULER', 'true').lower() == 'true'
+    BATCH_COLLECTION_WINDOW_MS = int(os.getenv('BATCH_COLLECTION_WINDOW_MS', 10))
+    BATCH_REQUEST_CHUNKS = os.getenv('BATCH_REQUEST_CHUNKS', 'true').lower() == 'true'
+    STREAMING_LOOKAHEAD_CHUNKS = int(os.getenv('STREAMING_LOOKAHEAD_CHUNKS', 2))
+    
+    # Fixed-duration framing and real-time pacing of raw PCM/WAV and SSE streams (0 = one write per chunk)
+    STREAMING_FRAME_MS = int(os.getenv('STREAMING_FRAME_MS', 0))
+    STREAMING_PACING = os.getenv('STREAMING_PACING', 'false').lower() == 'true'
+    STREAMING_PACING_PREBUFFER_MS = int(os.getenv('STREAMING_PACING_PREBUFFER_MS', 200))
+    
+    # Run T3 token generation and S3Gen vocoding as separate, overlapping pipeline stages
+    ENABLE_STAGED_PIPELINE = os.getenv('ENABLE_STAGED_PIPELINE', 'true').lower() == 'true'
+    
+    # Incremental vocoding for streaming: vocode speech tokens in short overlapping windows
+    ENABLE_INCREMENTAL_VOCODING = os.getenv('ENABLE_INCREMENTAL_VOCODING', 'false').lower() == 'true'
+    INCREMENTAL_VOCODING_WINDOW_MS = int(os.getenv('INCREMENTAL_VOCODING_WINDOW_MS', 400))
+    INCREMENTAL_VOCODING_OVERLAP_MS = int(os.getenv('INCREMENTAL_VOCODING_OVERLAP_MS', 80))
+    
+    # Share one generation between identical concurrent requests
+    ENABLE_SINGLE_FLIGHT = os.getenv('ENABLE_SINGLE_FLIGHT', 'true').lower() == 'true'
+    SINGLE_FLIGHT_REPLAY_ITEMS = int(os.getenv('SINGLE_FLIGHT_REPLAY_ITEMS', 64))
+    
+    # Admission control (bounded inference queue)
+    INFERENCE_MAX_QUEUE_CHUNKS = int(os.getenv('INFERENCE_MAX_QUEUE_CHUNKS', 200))
+    QUEUE_WAIT_SLO_SECONDS = float(os.getenv('QUEUE_WAIT_SLO_SECONDS', 30.0))
+    
+    # Requests held while the model is initializing (0 = reject immediately)
+    READINESS_QUEUE_SIZE = int(os.getenv('READINESS_QUEUE_SIZE', 256))
+    READINESS_WAIT_TIMEOUT_SECONDS = float(os.getenv('READINESS_WAIT_TIMEOUT_SECONDS', 120.0))
+    
+    # Voice conditioning cache (prepared speaker embeddings keyed by voice file content hash)
+    ENABLE_VOICE_CONDITIONING_CACHE = os.getenv('ENABLE_VOICE_CONDITIONING_CACHE', 'true').lower() == 'true'
+    VOICE_CONDITIONING_GPU_CACHE_MB = int(os.getenv('VOICE_CONDITIONING_GPU_CACHE_MB', 256))
+    VOICE_CONDITIONING_CPU_CACHE_MB = int(os.getenv('VOICE_CONDITIONING_CPU_CACHE_MB', 1024))
+    PINNED_VOICES = [v.strip() for v in os.getenv('PINNED_VOICES', '').split(',') if v.strip()]
+    
+    # Response cache (complete synthesized responses, memory LRU + disk tier)
+    ENABLE_RESPONSE_CACHE = os.getenv('ENABLE_RESPONSE_CACHE', 'false').lower() == 'true'
+    RESPONSE_CACHE_DIR = os.getenv('RESPONSE_CACHE_DIR', './data/response_cache')
+    RESPONSE_CACHE_MEMORY_MB = int(os.getenv('RESPONSE_CACHE_MEMORY_MB', 256))
+    RESPONSE_CACHE_DISK_MB = int(os.getenv('RESPONSE_CACHE_DISK_MB', 2048))
+    
+    # Content-addressed result URLs for seeded (deterministic) requests
+    ENABLE_RESULT_URLS = os.getenv('ENABLE_RESULT_URLS', 'true').lower() == 'true'
+    RESULT_URL_MAX_AGE_SECONDS = int(os.getenv('RESULT_URL_MAX_AGE_SECONDS', 86400))
+    
+    # Response audio encoding (mp3/opus/aac/flac via ffmpeg on a dedicated pool)
+    AUDIO_ENCODER_WORKERS = int(os.getenv('AUDIO_ENCODER_WORKERS', 2))
+    AUDIO_ENCODER_TIMEOUT_SECONDS = float(os.getenv('AUDIO_ENCODER_TIMEOUT_SECONDS', 60))
+    AUDIO_MP3_BITRATE = os.getenv('AUDIO_MP3_BITRATE', '64k')
+    AUDIO_OPUS_BITRATE = os.getenv('AUDIO_OPUS_BITRATE', '32k')
+    AUDIO_AAC_BITRATE = os.getenv('AUDIO_AAC_BITRATE', '64k')
+    STREAMING_ENCODER_PAGE_MS = int(os.getenv('STREAMING_ENCODER_PAGE_MS', 60))
+    
+    # Telephony output (response_format mulaw/alaw: 8 kHz G.711 in fixed-size frames)
+    TELEPHONY_FRAME_MS = int(os.getenv('TELEPHONY_FRAME_MS', 20))
+    TELEPHONY_PACING = os.getenv('TELEPHONY_PACING', 'true').lower() == 'true'
+    TELEPHONY_PREBUFFER_MS = int(os.getenv('TELEPHONY_PREBUFFER_MS', 60))
+    
+    # WebSocket text-in/audio-out sessions: segments generated at once per session
+    WEBSOCKET_MAX_ACTIVE_SEGMENTS = int(os.getenv('WEBSOCKET_MAX_ACTIVE_SEGMENTS', 4))
+    # Segments a session may have queued or generating but not yet spoken
+    WEBSOCKET_MAX_QUEUED_SEGMENTS = int(os.getenv('WEBSOCKET_MAX_QUEUED_SEGMENTS', 32))
+    
+    # Fragment cache (generated audio of single text chunks, reused across requests and jobs)
+    ENABLE_FRAGMENT_CACHE = os.getenv('ENABLE_FRAGMENT_CACHE', 'false').lower() == 'true'
+    FRAGMENT_CACHE_MB = int(os.getenv('FRAGMENT_CACHE_MB', 512))
     
     # Voice library settings
     VOICE_LIBRARY_DIR = os.getenv('VOICE_LIBRARY_DIR', './voices')
@@ -52,10 +132,16 @@ class Config:
     LONG_TEXT_SILENCE_PADDING_MS = int(os.getenv('LONG_TEXT_SILENCE_PADDING_MS', 200))
     LONG_TEXT_JOB_RETENTION_DAYS = int(os.getenv('LONG_TEXT_JOB_RETENTION_DAYS', 7))
     LONG_TEXT_MAX_CONCURRENT_JOBS = int(os.getenv('LONG_TEXT_MAX_CONCURRENT_JOBS', 3))
+    LONG_TEXT_REUSE_OUTPUT = os.getenv('LONG_TEXT_REUSE_OUTPUT', 'true').lower() == 'true'
 
     # Multilingual model settings
     USE_MULTILINGUAL_MODEL = os.getenv('USE_MULTILINGUAL_MODEL', 'true').lower() == 'true'
     
+    # Model registry: optional second resident model and request routing
+    LOAD_SECONDARY_MODEL = os.getenv('LOAD_SECONDARY_MODEL', 'false').lower() == 'true'
+    ROUTE_ENGLISH_TO_STANDARD_MODEL = os.getenv('ROUTE_ENGLISH_TO_STANDARD_MODEL', 'true').lower() == 'true'
+    MODEL_MEMORY_BUDGET_MB = int(os.getenv('MODEL_MEMORY_BUDGET_MB', 0))
+    
     # VRAM optimization note:
     # INT8 quantization reduces VRAM usage by ~50% vs FP16 (from ~0.93GB to ~0.47GB)
     # This is especially useful for systems with limited VRAM
@@ -84,6 +170,68 @@ class Config:
             raise ValueError(f"VLLM_MAX_MODEL_LEN must be positive, got {cls.VLLM_MAX_MODEL_LEN}")
         if cls.VLLM_DIFFUSION_STEPS <= 0:
             raise ValueError(f"VLLM_DIFFUSION_STEPS must be positive, got {cls.VLLM_DIFFUSION_STEPS}")
+        if any(size <= 0 or size > cls.VLLM_MAX_BATCH_SIZE for size in cls.WARMUP_BATCH_SIZES):
+            raise ValueError(f"WARMUP_BATCH_SIZES must be between 1 and VLLM_MAX_BATCH_SIZE, got {cls.WARMUP_BATCH_SIZES}")
+        if any(length <= 0 for length in cls.WARMUP_TEXT_LENGTHS):
+            raise ValueError(f"WARMUP_TEXT_LENGTHS must be positive, got {cls.WARMUP_TEXT_LENGTHS}")
+        if cls.BATCH_COLLECTION_WINDOW_MS < 0:
+            raise ValueError(f"BATCH_COLLECTION_WINDOW_MS must be non-negative, got {cls.BATCH_COLLECTION_WINDOW_MS}")
+        if cls.STREAMING_LOOKAHEAD_CHUNKS <= 0:
+            raise ValueError(f"STREAMING_LOOKAHEAD_CHUNKS must be positive, got {cls.STREAMING_LOOKAHEAD_CHUNKS}")
+        if cls.STREAMING_FRAME_MS != 0 and not 20 <= cls.STREAMING_FRAME_MS <= 200:
+            raise ValueError(f"STREAMING_FRAME_MS must be 0 or between 20 and 200, got {cls.STREAMING_FRAME_MS}")
+        if cls.STREAMING_PACING_PREBUFFER_MS < 0:
+            raise ValueError(f"STREAMING_PACING_PREBUFFER_MS must be non-negative, got {cls.STREAMING_PACING_PREBUFFER_MS}")
+        if cls.INCREMENTAL_VOCODING_WINDOW_MS < 40:
+            raise ValueError(f"INCREMENTAL_VOCODING_WINDOW_MS must be at least 40, got {cls.INCREMENTAL_VOCODING_WINDOW_MS}")
+        if cls.INCREMENTAL_VOCODING_OVERLAP_MS < 0 or 2 * cls.INCREMENTAL_VOCODING_OVERLAP_MS > cls.INCREMENTAL_VOCODING_WINDOW_MS:
+            raise ValueError(
+                f"INCREMENTAL_VOCODING_OVERLAP_MS must be between 0 and half of INCREMENTAL_VOCODING_WINDOW_MS, "
+                f"got {cls.INCREMENTAL_VOCODING_OVERLAP_MS}"
+            )
+        if cls.INFERENCE_MAX_QUEUE_CHUNKS <= 0:
+            raise ValueError(f"INFERENCE_MAX_QUEUE_CHUNKS must be positive, got {cls.INFERENCE_MAX_QUEUE_CHUNKS}")
+        if cls.QUEUE_WAIT_SLO_SECONDS <= 0:
+            raise ValueError(f"QUEUE_WAIT_SLO_SECONDS must be positive, got {cls.QUEUE_WAIT_SLO_SECONDS}")
+        if cls.TTS_BACKEND not in ('vllm', 'synthetic'):
+            raise ValueError(f"TTS_BACKEND must be 'vllm' or 'synthetic', got '{cls.TTS_BACKEND}'")
+        for name in ('SYNTHETIC_LATENCY_PER_CHAR_MS', 'SYNTHETIC_LATENCY_PER_BATCH_MS', 'SYNTHETIC_LATENCY_PER_STEP_MS'):
+            if getattr(cls, name) < 0:
+                raise ValueError(f"{name} cannot be negative, got {getattr(cls, name)}")
+        if cls.MODEL_MEMORY_BUDGET_MB < 0:
+            raise ValueError(f"MODEL_MEMORY_BUDGET_MB cannot be negative, got {cls.MODEL_MEMORY_BUDGET_MB}")
+        if cls.READINESS_QUEUE_SIZE < 0:
+            raise ValueError(f"READINESS_QUEUE_SIZE cannot be negative, got {cls.READINESS_QUEUE_SIZE}")
+        if cls.READINESS_WAIT_TIMEOUT_SECONDS <= 0:
+            raise ValueError(f"READINESS_WAIT_TIMEOUT_SECONDS must be positive, got {cls.READINESS_WAIT_TIMEOUT_SECONDS}")
+        if cls.VOICE_CONDITIONING_GPU_CACHE_MB < 0:
+            raise ValueError(f"VOICE_CONDITIONING_GPU_CACHE_MB must be non-negative, got {cls.VOICE_CONDITIONING_GPU_CACHE_MB}")
+        if cls.VOICE_CONDITIONING_CPU_CACHE_MB < 0:
+            raise ValueError(f"VOICE_CONDITIONING_CPU_CACHE_MB must be non-negative, got {cls.VOICE_CONDITIONING_CPU_CACHE_MB}")
+        if cls.AUDIO_ENCODER_WORKERS <= 0:
+            raise ValueError(f"AUDIO_ENCODER_WORKERS must be positive, got {cls.AUDIO_ENCODER_WORKERS}")
+        if cls.AUDIO_ENCODER_TIMEOUT_SECONDS <= 0:
+            raise ValueError(f"AUDIO_ENCODER_TIMEOUT_SECONDS must be positive, got {cls.AUDIO_ENCODER_TIMEOUT_SECONDS}")
+        if cls.STREAMING_ENCODER_PAGE_MS <= 0:
+            raise ValueError(f"STREAMING_ENCODER_PAGE_MS must be positive, got {cls.STREAMING_ENCODER_PAGE_MS}")
+        if cls.TELEPHONY_FRAME_MS <= 0 or cls.TELEPHONY_FRAME_MS % 5 != 0:
+            raise ValueError(f"TELEPHONY_FRAME_MS must be a positive multiple of 5, got {cls.TELEPHONY_FRAME_MS}")
+        if cls.TELEPHONY_PREBUFFER_MS < 0:
+            raise ValueError(f"TELEPHONY_PREBUFFER_MS must be non-negative, got {cls.TELEPHONY_PREBUFFER_MS}")
+        if cls.WEBSOCKET_MAX_ACTIVE_SEGMENTS <= 0:
+            raise ValueError(f"WEBSOCKET_MAX_ACTIVE_SEGMENTS must be positive, got {cls.WEBSOCKET_MAX_ACTIVE_SEGMENTS}")
+        if cls.WEBSOCKET_MAX_QUEUED_SEGMENTS < cls.WEBSOCKET_MAX_ACTIVE_SEGMENTS:
+            raise ValueError(f"WEBSOCKET_MAX_QUEUED_SEGMENTS ({cls.WEBSOCKET_MAX_QUEUED_SEGMENTS}) must be at least WEBSOCKET_MAX_ACTIVE_SEGMENTS ({cls.WEBSOCKET_MAX_ACTIVE_SEGMENTS})")
+        if cls.SINGLE_FLIGHT_REPLAY_ITEMS < 0:
+            raise ValueError(f"SINGLE_FLIGHT_REPLAY_ITEMS must be non-negative, got {cls.SINGLE_FLIGHT_REPLAY_ITEMS}")
+        if cls.RESPONSE_CACHE_MEMORY_MB < 0:
+            raise ValueError(f"RESPONSE_CACHE_MEMORY_MB must be non-negative, got {cls.RESPONSE_CACHE_MEMORY_MB}")
+        if cls.RESPONSE_CACHE_DISK_MB < 0:
+            raise ValueError(f"RESPONSE_CACHE_DISK_MB must be non-negative, got {cls.RESPONSE_CACHE_DISK_MB}")
+        if cls.RESULT_URL_MAX_AGE_SECONDS < 0:
+            raise ValueError(f"RESULT_URL_MAX_AGE_SECONDS must be non-negative, got {cls.RESULT_URL_MAX_AGE_SECONDS}")
+        if cls.FRAGMENT_CACHE_MB < 0:
+            raise ValueError(f"FRAGMENT_CACHE_MB must be non-negative, got {cls.FRAGMENT_CACHE_MB}")
         if cls.MAX_CHUNK_LENGTH <= 0:
             raise ValueError(f"MAX_CHUNK_LENGTH must be positive, got {cls.MAX_CHUNK_LENGTH}")
         if cls.MAX_TOTAL_LENGTH <= 0:
@@ -111,6 +259,8 @@ def detect_device():
     if Config.DEVICE_OVERRIDE.lower() != 'auto':
         return Config.DEVICE_OVERRIDE.lower()
     
+    import torch
+    
     if torch.cuda.is_available():
         return 'cuda'
     elif hasattr(torch.backends, 'mps') and torch.backends.mps.is_available():
@@ -1,65 +1,58 @@
 """
 Core functionality for Chatterbox TTS API
+
+Exports are resolved on first access so that importing one lightweight helper
+(e.g. ``from app.core import add_route_aliases``) doesn't import every core
+module and, through them, torch and the model backend.
 """
 
-from .memory import get_memory_info, cleanup_memory, safe_delete_tensors
-from .text_processing import (
-    split_text_into_chunks, 
-    concatenate_audio_chunks, 
-    split_text_for_streaming, 
-    get_streaming_settings
-)
-from .tts_model import initialize_model, get_model
-from .version import get_version, get_version_info
-from .voice_library import get_voice_library, VoiceLibrary, SUPPORTED_VOICE_FORMATS
-from .aliases import (
-    alias_route, 
-    add_route_aliases, 
-    get_all_aliases, 
-    add_custom_alias,
-    add_multiple_aliases,
-    remove_alias,
-    get_endpoint_info,
-    ENDPOINT_ALIASES
-)
-from .status import (
-    TTSStatus,
-    start_tts_request,
-    update_tts_status,
-    get_tts_status,
-    get_tts_history,
-    get_tts_statistics,
-    clear_tts_history
-)
+import importlib
+
+# Exported name -> submodule that defines it
+_EXPORTS = {
+    "get_memory_info": ".memory",
+    "cleanup_memory": ".memory",
+    "safe_delete_tensors": ".memory",
+    "split_text_into_chunks": ".text_processing",
+    "concatenate_audio_chunks": ".text_processing",
+    "split_text_for_streaming": ".text_processing",
+    "get_streaming_settings": ".text_processing",
+    "initialize_model": ".tts_model",
+    "get_model": ".tts_model",
+    "get_version": ".version",
+    "get_version_info": ".version",
+    "get_voice_library": ".voice_library",
+    "VoiceLibrary": ".voice_library",
+    "SUPPORTED_VOICE_FORMATS": ".voice_library",
+    "alias_route": ".aliases",
+    "add_route_aliases": ".aliases",
+    "get_all_aliases": ".aliases",
+    "add_custom_alias": ".aliases",
+    "add_multiple_aliases": ".aliases",
+    "remove_alias": ".aliases",
+    "get_endpoint_info": ".aliases",
+    "ENDPOINT_ALIASES": ".aliases",
+    "TTSStatus": ".status",
+    "start_tts_request": ".status",
+    "update_tts_status": ".status",
+    "get_tts_status": ".status",
+    "get_tts_history": ".status",
+    "get_tts_statistics": ".status",
+    "clear_tts_history": ".status",
+}
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_EXPORTS))
+
 
-__all__ = [
-    "get_memory_info",
-    "cleanup_memory", 
-    "safe_delete_tensors",
-    "split_text_into_chunks",
-    "concatenate_audio_chunks",
-    "split_text_for_streaming",
-    "get_streaming_settings",
-    "initialize_model",
-    "get_model",
-    "get_version",
-    "get_version_info",
-    "get_voice_library",
-    "VoiceLibrary", 
-    "SUPPORTED_VOICE_FORMATS",
-    "alias_route",
-    "add_route_aliases",
-    "get_all_aliases",
-    "add_custom_alias",
-    "add_multiple_aliases",
-    "remove_alias",
-    "get_endpoint_info",
-    "ENDPOINT_ALIASES",
-    "TTSStatus",
-    "start_tts_request",
-    "update_tts_status",
-    "get_tts_status",
-    "get_tts_history",
-    "get_tts_statistics",
-    "clear_tts_history"
-] 
\ No newline at end of file
+__all__ = list(_EXPORTS)
@@ -13,6 +13,8 @@ ENDPOINT_ALIASES: Dict[str, List[str]] = {
     "/audio/speech/upload": ["/v1/audio/speech/upload", "/tts/upload"],
     "/audio/speech/stream": ["/v1/audio/speech/stream", "/tts/stream"],
     "/audio/speech/stream/upload": ["/v1/audio/speech/stream/upload", "/tts/stream/upload"],
+    "/audio/speech/ws": ["/v1/audio/speech/ws", "/tts/ws"],
+    "/audio/results/{content_hash}": ["/v1/audio/results/{content_hash}"],
     "/voices": ["/v1/voices", "/voice-library", "/voice_library"],
     "/voices/default": ["/v1/voices/default", "/default-voice"],
     "/voices/{voice_name}": ["/v1/voices/{voice_name}"],
@@ -23,6 +25,10 @@ ENDPOINT_ALIASES: Dict[str, List[str]] = {
     "/voices/cleanup": ["/v1/voices/cleanup"],
     "/health": ["/v1/health", "/status"],
     "/models": ["/v1/models"],
+    "/models/loaded": ["/v1/models/loaded"],
+    "/models/{variant}/load": ["/v1/models/{variant}/load"],
+    "/models/{variant}/activate": ["/v1/models/{variant}/activate"],
+    "/models/{variant}": ["/v1/models/{variant}"],
     "/config": ["/v1/config"],
     "/endpoints": ["/v1/endpoints", "/routes"],
     "/memory": ["/v1/memory"],
@@ -34,6 +40,7 @@ ENDPOINT_ALIASES: Dict[str, List[str]] = {
     "/status/history": ["/v1/status/history", "/history"],
     "/status/statistics": ["/v1/status/statistics", "/stats"],
     "/status/history/clear": ["/v1/status/history/clear"],
+    "/status/performance": ["/v1/status/performance", "/metrics/performance"],
     "/info": ["/v1/info", "/api/info"],
     "/audio/speech/long": ["/v1/audio/speech/long"],
     "/audio/speech/long/jobs": ["/v1/audio/speech/long/jobs"],
@@ -145,6 +152,14 @@ def add_route_aliases(router):
             
         def patch(self, path: str, **kwargs):
             return self._create_aliased_method('patch', path, **kwargs)
+        
+        def websocket(self, path: str, **kwargs):
+            # WebSocket routes are never in the OpenAPI schema, so aliases are plain copies
+            def decorator(func):
+                for route_path in [path, *ENDPOINT_ALIASES.get(path, [])]:
+                    self._router.websocket(route_path, **kwargs)(func)
+                return func
+            return decorator
     
     return AliasedRouter(router)
 
@@ -0,0 +1,331 @@
+"""
+Response audio encoding (wav, mp3, opus, aac, flac, webm, pcm, mulaw, alaw)
+
+Compressed formats are produced by an ffmpeg subprocess that reads 16-bit PCM
+from a pipe and writes the encoded file to another, so no temporary files are
+involved. Encoding runs on a dedicated thread pool: the event loop and the
+generation executors never wait on it, and ffmpeg does the work outside the GIL.
+
+Streaming responses keep one ffmpeg process for the whole response instead:
+generated chunks are fed in as they arrive and encoded pages are passed on as
+soon as ffmpeg emits them.
+"""
+
+import asyncio
+import io
+import logging
+import shutil
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, AsyncGenerator, AsyncIterator, Dict, List, Optional
+
+from app.config import Config
+from app.core.audio_framing import TELEPHONY_FORMATS, TelephonyEncoder
+
+if TYPE_CHECKING:
+    import torch
+
+logger = logging.getLogger(__name__)
+
+# OpenAI-compatible response formats: media type and file extension
+AUDIO_FORMATS = {
+    "wav": {"media_type": "audio/wav", "extension": "wav"},
+    "mp3": {"media_type": "audio/mpeg", "extension": "mp3"},
+    "opus": {"media_type": "audio/ogg; codecs=opus", "extension": "opus"},
+    "aac": {"media_type": "audio/aac", "extension": "aac"},
+    "flac": {"media_type": "audio/flac", "extension": "flac"},
+    # Opus in WebM, for MediaSource playback in browsers
+    "webm": {"media_type": "audio/webm; codecs=opus", "extension": "webm"},
+    # Raw 16-bit little-endian mono samples at the model's sample rate (24 kHz)
+    "pcm": {"media_type": "audio/pcm", "extension": "pcm"},
+    # 8 kHz G.711 in fixed-size frames for telephony bridges (streaming and SSE only)
+    "mulaw": {"media_type": "audio/basic", "extension": "ulaw"},
+    "alaw": {"media_type": "audio/x-alaw-basic", "extension": "alaw"},
+}
+
+# Formats encoded in-process; everything else needs ffmpeg
+_NATIVE_FORMATS = ("wav", "pcm", *TELEPHONY_FORMATS)
+
+# Formats that can be produced incrementally (flac needs to seek back to finish its header)
+STREAMING_FORMATS = ("wav", "pcm", "opus", "webm", "mp3", "aac", *TELEPHONY_FORMATS)
+
+# Formats for complete (non-streaming) responses; headerless G.711 is only offered as a framed stream
+RESPONSE_FORMATS = tuple(fmt for fmt in AUDIO_FORMATS if fmt not in TELEPHONY_FORMATS)
+
+# Bytes read from the streaming encoder per wakeup
+_STREAM_READ_SIZE = 64 * 1024
+
+
+class AudioEncodingError(Exception):
+    """Raised when audio can't be encoded to the requested format"""
+    pass
+
+
+def _ffmpeg_output_args(response_format: str) -> List[str]:
+    """ffmpeg codec and container arguments for a compressed format"""
+    if response_format == "mp3":
+        return ["-c:a", "libmp3lame", "-b:a", Config.AUDIO_MP3_BITRATE, "-f", "mp3"]
+    if response_format == "opus":
+        # The voip application mode is tuned for speech
+        return ["-c:a", "libopus", "-b:a", Config.AUDIO_OPUS_BITRATE, "-application", "voip", "-f", "ogg"]
+    if response_format == "aac":
+        return ["-c:a", "aac", "-b:a", Config.AUDIO_AAC_BITRATE, "-f", "adts"]
+    if response_format == "flac":
+        return ["-c:a", "flac", "-f", "flac"]
+    if response_format == "webm":
+        return ["-c:a", "libopus", "-b:a", Config.AUDIO_OPUS_BITRATE, "-application", "voip", "-f", "webm"]
+    raise AudioEncodingError(f"Unsupported response format '{response_format}'")
+
+
+def _ffmpeg_streaming_args(response_format: str) -> List[str]:
+    """Muxer arguments that make ffmpeg emit output as soon as it has encoded it"""
+    args = ["-flush_packets", "1"]
+    page_us = Config.STREAMING_ENCODER_PAGE_MS * 1000
+    if response_format == "opus":
+        # Ogg buffers a second of packets per page by default
+        args += ["-page_duration", str(page_us)]
+    elif response_format == "webm":
+        args += ["-live", "1", "-cluster_time_limit", str(Config.STREAMING_ENCODER_PAGE_MS)]
+    return args
+
+
+def to_pcm16(audio: "torch.Tensor") -> bytes:
+    """Convert a float waveform in [-1, 1] to 16-bit little-endian PCM bytes"""
+    import torch
+
+    audio = audio.detach().cpu().reshape(-1)
+    return (audio.clamp(-1.0, 1.0) * 32767).to(torch.int16).numpy().tobytes()
+
+
+class AudioEncoder:
+    """
+    Encodes generated audio into response formats on a dedicated thread pool.
+
+    Per format it tracks how many responses were encoded, the time spent and
+    the compression ratio against 16-bit PCM.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or Config.AUDIO_ENCODER_WORKERS
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._ffmpeg_path = shutil.which("ffmpeg")
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._stream_stats: Dict[str, Dict[str, float]] = {}
+
+    def is_available(self, response_format: str) -> bool:
+        """Check whether ``response_format`` can be produced on this host"""
+        if response_format not in AUDIO_FORMATS:
+            return False
+        return response_format in _NATIVE_FORMATS or self._ffmpeg_path is not None
+
+    async def encode(self, audio: "torch.Tensor", sample_rate: int, response_format: str) -> bytes:
+        """Encode a mono waveform to ``response_format`` off the event loop"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="audio-encoder")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.encode_sync, audio, sample_rate, response_format)
+
+    def encode_sync(self, audio: "torch.Tensor", sample_rate: int, response_format: str) -> bytes:
+        """Encode a mono waveform to ``response_format`` in the calling thread"""
+        if not self.is_available(response_format):
+            if response_format in AUDIO_FORMATS:
+                raise AudioEncodingError(f"Encoding to {response_format} requires ffmpeg, which is not installed")
+            raise AudioEncodingError(f"Unsupported response format '{response_format}'")
+
+        started = time.perf_counter()
+        if response_format == "wav":
+            import torchaudio as ta
+
+            buffer = io.BytesIO()
+            ta.save(buffer, audio.detach().cpu().reshape(1, -1), sample_rate, format="wav")
+            data = buffer.getvalue()
+            pcm_bytes = audio.numel() * 2
+        elif response_format in TELEPHONY_FORMATS:
+            encoder = TelephonyEncoder(sample_rate, response_format, Config.TELEPHONY_FRAME_MS)
+            data = b"".join([*encoder.push(audio), *encoder.flush()])
+            pcm_bytes = audio.numel() * 2
+        else:
+            pcm = to_pcm16(audio)
+            pcm_bytes = len(pcm)
+            data = pcm if response_format == "pcm" else self._run_ffmpeg(pcm, sample_rate, response_format)
+
+        self._record(response_format, time.perf_counter() - started, pcm_bytes, len(data))
+        return data
+
+    def _run_ffmpeg(self, pcm: bytes, sample_rate: int, response_format: str) -> bytes:
+        command = [
+            self._ffmpeg_path, "-hide_banner", "-loglevel", "error",
+            "-f", "s16le", "-ar", str(sample_rate), "-ac", "1", "-i", "pipe:0",
+            *_ffmpeg_output_args(response_format), "pipe:1"
+        ]
+        try:
+            result = subprocess.run(command, input=pcm, capture_output=True, timeout=Config.AUDIO_ENCODER_TIMEOUT_SECONDS)
+        except subprocess.TimeoutExpired:
+            raise AudioEncodingError(
+                f"{response_format} encoding timed out after {Config.AUDIO_ENCODER_TIMEOUT_SECONDS}s"
+            )
+        if result.returncode != 0 or not result.stdout:
+            message = result.stderr.decode("utf-8", "replace").strip() or f"exit code {result.returncode}"
+            raise AudioEncodingError(f"ffmpeg failed to encode {response_format}: {message}")
+        return result.stdout
+
+    async def encode_stream(
+        self,
+        pcm_chunks: AsyncIterator[bytes],
+        sample_rate: int,
+        response_format: str
+    ) -> AsyncGenerator[bytes, None]:
+        """
+        Encode a stream of 16-bit PCM chunks, yielding encoded pages as they are produced.
+
+        One ffmpeg process spans the whole stream, so codec state carries across
+        chunks and there are no clicks or gaps at chunk boundaries. Chunks are
+        fed from a separate task, so output is yielded as soon as ffmpeg emits
+        it rather than when the next chunk arrives. Errors raised by
+        ``pcm_chunks`` propagate once the encoder has flushed what it received.
+        """
+        if response_format not in STREAMING_FORMATS or response_format in _NATIVE_FORMATS:
+            raise AudioEncodingError(f"Unsupported streaming format '{response_format}'")
+        if not self.is_available(response_format):
+            raise AudioEncodingError(f"Encoding to {response_format} requires ffmpeg, which is not installed")
+
+        process = await asyncio.create_subprocess_exec(
+            self._ffmpeg_path, "-hide_banner", "-loglevel", "error",
+            # Raw input needs no probing; don't hold the first samples back
+            "-probesize", "32", "-analyzeduration", "0", "-fflags", "+nobuffer",
+            "-f", "s16le", "-ar", str(sample_rate), "-ac", "1", "-i", "pipe:0",
+            *_ffmpeg_output_args(response_format), *_ffmpeg_streaming_args(response_format), "pipe:1",
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+        pcm_bytes = 0
+        encoded_bytes = 0
+        first_input: Optional[float] = None
+        first_page_seconds: Optional[float] = None
+
+        async def feed():
+            nonlocal pcm_bytes, first_input
+            try:
+                async for pcm in pcm_chunks:
+                    if not pcm:
+                        continue
+                    if first_input is None:
+                        first_input = time.perf_counter()
+                    pcm_bytes += len(pcm)
+                    process.stdin.write(pcm)
+                    await process.stdin.drain()
+            finally:
+                if not process.stdin.is_closing():
+                    process.stdin.close()
+
+        feeder = asyncio.create_task(feed())
+        try:
+            while True:
+                page = await process.stdout.read(_STREAM_READ_SIZE)
+                if not page:
+                    break
+                if first_page_seconds is None and first_input is not None:
+                    first_page_seconds = time.perf_counter() - first_input
+                encoded_bytes += len(page)
+                yield page
+
+            # Surface generation errors before encoder errors
+            await feeder
+            returncode = await process.wait()
+            if returncode != 0:
+                message = (await process.stderr.read()).decode("utf-8", "replace").strip()
+                raise AudioEncodingError(f"ffmpeg failed to encode {response_format} stream: {message or returncode}")
+            self._record_stream(response_format, pcm_bytes, encoded_bytes, first_page_seconds)
+        finally:
+            if not feeder.done():
+                feeder.cancel()
+                try:
+                    await feeder
+                except (asyncio.CancelledError, Exception):
+                    pass
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+
+    def _record_stream(self, response_format: str, pcm_bytes: int, encoded_bytes: int, first_page_seconds: Optional[float]):
+        with self._lock:
+            stats = self._stream_stats.setdefault(
+                response_format, {"streams": 0, "first_page_seconds": 0.0, "pcm_bytes": 0, "encoded_bytes": 0}
+            )
+            stats["streams"] += 1
+            stats["first_page_seconds"] += first_page_seconds or 0.0
+            stats["pcm_bytes"] += pcm_bytes
+            stats["encoded_bytes"] += encoded_bytes
+
+    def _record(self, response_format: str, seconds: float, pcm_bytes: int, encoded_bytes: int):
+        with self._lock:
+            stats = self._stats.setdefault(
+                response_format, {"encoded": 0, "encode_seconds": 0.0, "pcm_bytes": 0, "encoded_bytes": 0}
+            )
+            stats["encoded"] += 1
+            stats["encode_seconds"] += seconds
+            stats["pcm_bytes"] += pcm_bytes
+            stats["encoded_bytes"] += encoded_bytes
+        logger.debug(
+            f"Encoded {response_format}: {pcm_bytes:,} -> {encoded_bytes:,} bytes in {seconds * 1000:.1f}ms"
+        )
+
+    def shutdown(self):
+        """Stop the encoder pool (called during app shutdown)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get encoder statistics: per format count, average time and compression ratio vs 16-bit PCM"""
+        with self._lock:
+            formats = {
+                response_format: {
+                    "encoded": stats["encoded"],
+                    "total_encode_seconds": stats["encode_seconds"],
+                    "avg_encode_ms": stats["encode_seconds"] * 1000 / max(1, stats["encoded"]),
+                    "pcm_bytes": stats["pcm_bytes"],
+                    "encoded_bytes": stats["encoded_bytes"],
+                    "compression_ratio": stats["pcm_bytes"] / max(1, stats["encoded_bytes"])
+                }
+                for response_format, stats in self._stats.items()
+            }
+            streaming = {
+                response_format: {
+                    "streams": stats["streams"],
+                    "avg_first_page_ms": stats["first_page_seconds"] * 1000 / max(1, stats["streams"]),
+                    "pcm_bytes": stats["pcm_bytes"],
+                    "encoded_bytes": stats["encoded_bytes"],
+                    "compression_ratio": stats["pcm_bytes"] / max(1, stats["encoded_bytes"])
+                }
+                for response_format, stats in self._stream_stats.items()
+            }
+        return {
+            "workers": self.max_workers,
+            "ffmpeg_available": self._ffmpeg_path is not None,
+            "available_formats": [fmt for fmt in RESPONSE_FORMATS if self.is_available(fmt)],
+            "formats": formats,
+            "streaming": streaming
+        }
+
+
+# Global encoder instance
+_audio_encoder: Optional[AudioEncoder] = None
+
+
+def get_audio_encoder() -> AudioEncoder:
+    """Get the global audio encoder instance"""
+    global _audio_encoder
+    if _audio_encoder is None:
+        _audio_encoder = AudioEncoder()
+    return _audio_encoder
+
+
+def shutdown_audio_encoder():
+    """Stop the global encoder pool if it was started"""
+    if _audio_encoder is not None:
+        _audio_encoder.shutdown()
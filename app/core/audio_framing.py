@@ -0,0 +1,307 @@
+"""
+Fixed-size audio framing, G.711 encoding and real-time pacing for streams
+
+Telephony bridges (SIP trunks, Twilio-style media streams) expect 8 kHz μ-law or
+A-law in frames of exactly 20 ms delivered at a steady cadence. Generated audio
+arrives in irregular pieces at the model's sample rate, so a stream is passed
+through one stateful resampler (a polyphase filter designed once per rate pair),
+encoded through a G.711 lookup table, cut into exact frames and, optionally,
+released on a fixed real-time schedule.
+
+Browser clients of the raw PCM and SSE streams use the same framing and pacing
+with 16-bit frames at the model's sample rate, so they can run small playback
+buffers instead of absorbing several seconds of audio per text chunk.
+"""
+
+import asyncio
+import math
+from functools import lru_cache
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import torch
+
+# Telephony response formats and their G.711 sample rate
+TELEPHONY_FORMATS = ("mulaw", "alaw")
+TELEPHONY_SAMPLE_RATE = 8000
+
+# Resampling filter: zero crossings per side of the sinc, passband edge as a
+# fraction of the output Nyquist frequency, and Kaiser window shape
+_FILTER_ZERO_CROSSINGS = 16
+_FILTER_ROLLOFF = 0.94
+_FILTER_KAISER_BETA = 8.6
+
+
+@lru_cache(maxsize=8)
+def _polyphase_filter(orig_sr: int, new_sr: int) -> Tuple["torch.Tensor", int, int, int]:
+    """
+    Design the anti-aliasing filter for ``orig_sr`` -> ``new_sr``.
+
+    Returns the kernel at the upsampled rate together with the up and down
+    factors and the kernel's half-length. Designed once per rate pair; every
+    stream resampling between the same rates shares it.
+    """
+    import torch
+
+    divisor = math.gcd(orig_sr, new_sr)
+    up, down = new_sr // divisor, orig_sr // divisor
+    factor = max(up, down)
+    half = _FILTER_ZERO_CROSSINGS * factor
+    cutoff = _FILTER_ROLLOFF / factor
+
+    taps = torch.arange(-half, half + 1, dtype=torch.float64)
+    window = torch.kaiser_window(2 * half + 1, periodic=False, beta=_FILTER_KAISER_BETA, dtype=torch.float64)
+    # Windowed-sinc lowpass; the gain of ``up`` makes up for the zeros stuffed between input samples
+    kernel = cutoff * torch.special.sinc(cutoff * taps) * window * up
+    return kernel.to(torch.float32), up, down, half
+
+
+class StreamingResampler:
+    """
+    Resamples a stream piece by piece as if it were one continuous signal.
+
+    The tail of each piece is kept as filter history for the next one, so there
+    are no edge effects at piece boundaries. Each call is one strided
+    convolution over the new samples. Output is aligned with the input: the
+    filter's delay is dropped from the start, and ``flush()`` returns the end of
+    the stream that the delay was holding back.
+    """
+
+    def __init__(self, orig_sr: int, new_sr: int):
+        import torch
+
+        self.orig_sr = orig_sr
+        self.new_sr = new_sr
+        self._kernel, self._up, self._down, half = _polyphase_filter(orig_sr, new_sr)
+        # Upsampled input preceding the next piece, and where the next output's window starts in it
+        self._history = torch.zeros(self._kernel.numel() - 1)
+        self._offset = 0
+        self._skip = round(half / self._down)
+        self._drain = -(-half // self._up)
+
+    def process(self, audio: "torch.Tensor") -> "torch.Tensor":
+        """Resample the next piece of the stream (any shape, flattened to mono)"""
+        import torch
+        import torch.nn.functional as F
+
+        samples = audio.detach().reshape(-1).to("cpu", torch.float32)
+        if self.orig_sr == self.new_sr:
+            return samples
+
+        if self._up > 1:
+            stuffed = samples.new_zeros(samples.numel() * self._up)
+            stuffed[::self._up] = samples
+            samples = stuffed
+
+        buffer = torch.cat((self._history, samples))
+        taps = self._kernel.numel()
+        if buffer.numel() - self._offset >= taps:
+            output = F.conv1d(
+                buffer[self._offset:].view(1, 1, -1), self._kernel.view(1, 1, -1), stride=self._down
+            ).view(-1)
+        else:
+            output = buffer.new_zeros(0)
+
+        # The next piece's buffer starts where this buffer's last ``taps - 1`` samples begin
+        self._offset += output.numel() * self._down - (buffer.numel() - (taps - 1))
+        self._history = buffer[buffer.numel() - (taps - 1):].clone()
+
+        if self._skip:
+            dropped = min(self._skip, output.numel())
+            output = output[dropped:]
+            self._skip -= dropped
+        return output
+
+    def flush(self) -> "torch.Tensor":
+        """Return the output still held in the filter's delay line"""
+        import torch
+
+        if self.orig_sr == self.new_sr:
+            return torch.zeros(0)
+        return self.process(torch.zeros(self._drain))
+
+
+@lru_cache(maxsize=2)
+def _g711_table(law: str) -> "torch.Tensor":
+    """
+    Code for every 16-bit sample value (index ``sample + 32768``).
+
+    Computed once, vectorized over all 65536 inputs, with the segment/mantissa
+    rules of the ITU-T G.711 reference encoder.
+    """
+    import torch
+
+    pcm = torch.arange(-32768, 32768, dtype=torch.int32)
+    if law == "mulaw":
+        value = pcm >> 2
+        mask = torch.where(value < 0, 0x7F, 0xFF)
+        value = value.abs().clamp(max=8159) + 33
+        ends = torch.tensor([0x3F, 0x7F, 0xFF, 0x1FF, 0x3FF, 0x7FF, 0xFFF, 0x1FFF], dtype=torch.int32)
+        segment = torch.bucketize(value, ends)
+        code = (segment << 4) | ((value >> (segment + 1)) & 0xF)
+    elif law == "alaw":
+        value = pcm >> 3
+        negative = value < 0
+        mask = torch.where(negative, 0x55, 0xD5)
+        value = torch.where(negative, -value - 1, value)
+        ends = torch.tensor([0x1F, 0x3F, 0x7F, 0xFF, 0x1FF, 0x3FF, 0x7FF, 0xFFF], dtype=torch.int32)
+        segment = torch.bucketize(value, ends)
+        shift = torch.where(segment < 2, 1, segment)
+        code = (segment << 4) | ((value >> shift) & 0xF)
+    else:
+        raise ValueError(f"Unsupported G.711 law '{law}'")
+
+    code = torch.where(segment >= 8, 0x7F, code) ^ mask
+    return code.to(torch.uint8)
+
+
+def g711_encode(samples: "torch.Tensor", law: str) -> bytes:
+    """Encode a float waveform in [-1, 1] to μ-law or A-law bytes with one table lookup"""
+    import torch
+
+    pcm = (samples.reshape(-1).clamp(-1.0, 1.0) * 32767).to(torch.int64)
+    return _g711_table(law)[pcm + 32768].numpy().tobytes()
+
+
+def g711_silence(law: str) -> int:
+    """Code of a zero sample (0xFF for μ-law, 0xD5 for A-law)"""
+    return int(_g711_table(law)[32768])
+
+
+class FrameAssembler:
+    """
+    Cuts a byte stream into frames of exactly ``frame_bytes``.
+
+    Frames are memoryviews into the pushed data, so whole frames are never
+    copied; only a frame straddling two pushes is put together in a small
+    buffer. The remainder carries over to the next push, and ``flush()`` pads
+    the last partial frame with silence.
+    """
+
+    def __init__(self, frame_bytes: int, silence: int = 0):
+        if frame_bytes <= 0:
+            raise ValueError(f"frame_bytes must be positive, got {frame_bytes}")
+        self.frame_bytes = frame_bytes
+        self.silence = silence
+        self._partial = bytearray()
+
+    def push(self, data) -> List[memoryview]:
+        """Add data (any bytes-like object or contiguous array) and return every frame it completes"""
+        view = memoryview(data).cast("B")
+        frames: List[memoryview] = []
+
+        if self._partial:
+            needed = self.frame_bytes - len(self._partial)
+            self._partial += view[:needed]
+            view = view[needed:]
+            if len(self._partial) < self.frame_bytes:
+                return frames
+            frames.append(memoryview(bytes(self._partial)))
+            self._partial.clear()
+
+        whole = len(view) - len(view) % self.frame_bytes
+        frames.extend(view[start:start + self.frame_bytes] for start in range(0, whole, self.frame_bytes))
+        self._partial += view[whole:]
+        return frames
+
+    def flush(self) -> Optional[memoryview]:
+        """Return the final partial frame padded with silence, if there is one"""
+        if not self._partial:
+            return None
+        frame = bytes(self._partial) + bytes([self.silence]) * (self.frame_bytes - len(self._partial))
+        self._partial.clear()
+        return memoryview(frame)
+
+
+class FramePacer:
+    """
+    Releases frames on a fixed real-time schedule.
+
+    Frame ``n`` is due at ``start + max(0, n - lead_frames) * frame_seconds``. Deadlines
+    are absolute, so sleep overshoot doesn't accumulate into drift. The first
+    ``lead_frames`` frames go out immediately to fill the receiver's jitter
+    buffer. If generation falls behind, the schedule restarts from the late frame
+    instead of bursting out the backlog afterwards.
+    """
+
+    def __init__(self, frame_seconds: float, lead_frames: int = 0):
+        self.frame_seconds = frame_seconds
+        self.lead_frames = lead_frames
+        self._start: Optional[float] = None
+        self._sent = 0
+        self.underruns = 0
+
+    async def wait(self):
+        """Sleep until the next frame is due"""
+        now = asyncio.get_running_loop().time()
+        if self._start is None:
+            self._start = now
+        due = self._start + max(0, self._sent - self.lead_frames) * self.frame_seconds
+        if due > now:
+            await asyncio.sleep(due - now)
+        elif now - due > self.frame_seconds:
+            # The receiver has already played out its buffer; resume real time from here
+            self.underruns += 1
+            self._start = now - max(0, self._sent - self.lead_frames) * self.frame_seconds
+        self._sent += 1
+
+
+class TelephonyEncoder:
+    """
+    Turns a generated audio stream into G.711 frames of exactly ``frame_ms``.
+
+    Audio is resampled to 8 kHz once as a continuous stream, encoded through the
+    lookup table and framed, so every frame is ``8 * frame_ms`` bytes.
+    """
+
+    def __init__(self, sample_rate: int, law: str = "mulaw", frame_ms: int = 20):
+        if law not in TELEPHONY_FORMATS:
+            raise ValueError(f"Unsupported telephony format '{law}'")
+        self.law = law
+        self.encoding = law
+        self.bits_per_sample = 8
+        self.frame_ms = frame_ms
+        self.sample_rate = TELEPHONY_SAMPLE_RATE
+        self._resampler = StreamingResampler(sample_rate, TELEPHONY_SAMPLE_RATE)
+        self._assembler = FrameAssembler(TELEPHONY_SAMPLE_RATE * frame_ms // 1000, silence=g711_silence(law))
+
+    def push(self, audio: "torch.Tensor") -> List[memoryview]:
+        """Encode the next piece of audio and return the frames it completes"""
+        return self._assembler.push(g711_encode(self._resampler.process(audio), self.law))
+
+    def flush(self) -> List[memoryview]:
+        """Return the remaining frames at the end of the stream, the last one padded with silence"""
+        frames = self._assembler.push(g711_encode(self._resampler.flush(), self.law))
+        last = self._assembler.flush()
+        if last is not None:
+            frames.append(last)
+        return frames
+
+
+class PcmFramer:
+    """
+    Cuts a generated audio stream into 16-bit PCM frames of exactly ``frame_ms``.
+
+    Each piece is converted to int16 once and the frames are memoryviews over
+    that buffer, so slicing a chunk into frames copies no audio.
+    """
+
+    encoding = "pcm_s16le"
+    bits_per_sample = 16
+
+    def __init__(self, sample_rate: int, frame_ms: int):
+        self.sample_rate = sample_rate
+        self.frame_ms = frame_ms
+        self._assembler = FrameAssembler(sample_rate * frame_ms // 1000 * 2)
+
+    def push(self, audio: "torch.Tensor") -> List[memoryview]:
+        """Convert the next piece of audio to 16-bit PCM and return the frames it completes"""
+        import torch
+
+        pcm = (audio.detach().reshape(-1).to("cpu").clamp(-1.0, 1.0) * 32767).to(torch.int16)
+        return self._assembler.push(pcm.numpy())
+
+    def flush(self) -> List[memoryview]:
+        """Return the last partial frame padded with silence, if there is one"""
+        last = self._assembler.flush()
+        return [last] if last is not None else []
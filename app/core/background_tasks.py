@@ -5,6 +5,7 @@ Background task processing for long text TTS jobs
 import asyncio
 import logging
 import os
+import shutil
 import traceback
 from datetime import datetime
 from pathlib import Path
@@ -15,6 +16,9 @@ from app.core.long_text_jobs import get_job_manager
 from app.core.text_processing import split_text_for_long_generation, estimate_processing_time, split_text_for_streaming, get_streaming_settings
 from app.core.audio_processing import concatenate_audio_files, AudioConcatenationError
 from app.api.endpoints.speech import generate_speech_internal, resolve_voice_path_and_language
+from app.core.inference_scheduler import Priority
+from app.core.tts_model import is_initializing
+from app.core.fragment_cache import normalize_fragment_text
 from app.models.long_text import (
     LongTextJobStatus,
     LongTextJobMetadata,
@@ -83,6 +87,12 @@ class LongTextProcessor:
 
         while self.is_running:
             try:
+                # Leave queued jobs alone until the model has loaded, so jobs restored
+                # or submitted during startup don't fail with "Model not loaded"
+                if is_initializing():
+                    await asyncio.sleep(1)
+                    continue
+
                 # Wait for a job (with timeout to allow graceful shutdown)
                 try:
                     job_id = await asyncio.wait_for(
@@ -200,7 +210,29 @@ class LongTextProcessor:
             voice_path, language_id = resolve_voice_path_and_language(metadata.voice)
 
             chunk_audio_files = []
+            chunks_dir = self.job_manager._get_job_file_paths(job_id)['chunks_dir']
+
+            # Identical chunks (repeated headings, disclaimers, boilerplate) are generated
+            # once; later copies reuse the first occurrence's audio file
+            first_occurrence: Dict[str, int] = {}
+            duplicate_of: Dict[int, int] = {}
             for i, chunk in enumerate(chunks):
+                text_key = normalize_fragment_text(chunk.text)
+                if text_key in first_occurrence:
+                    duplicate_of[i] = first_occurrence[text_key]
+                else:
+                    first_occurrence[text_key] = i
+
+            if duplicate_of:
+                logger.info(f"Job {job_id}: {len(duplicate_of)} duplicate chunk(s) will reuse earlier audio")
+
+            # Chunks are generated in windows so the scheduler can batch them into
+            # a single multi-prompt generate call
+            window_size = Config.VLLM_MAX_BATCH_SIZE if Config.BATCH_REQUEST_CHUNKS else 1
+
+            for window_start in range(0, len(chunks), window_size):
+                window_indices = list(range(window_start, min(window_start + window_size, len(chunks))))
+
                 # Check if job was paused or cancelled
                 current_metadata = self.job_manager._load_job_metadata(job_id)
                 if current_metadata and current_metadata.status in [LongTextJobStatus.PAUSED, LongTextJobStatus.CANCELLED]:
@@ -208,60 +240,86 @@ class LongTextProcessor:
                     return
 
                 # Update current chunk
-                current_metadata.current_chunk = i
+                current_metadata.current_chunk = window_indices[0]
                 self.job_manager._save_job_metadata(current_metadata)
 
                 # Update chunk status
-                chunk.processing_started_at = datetime.utcnow()
-                chunks[i] = chunk  # Update in list
-
-                logger.info(f"Job {job_id}: Processing chunk {i+1}/{len(chunks)} ({len(chunk.text)} chars)")
-
-                try:
-                    # Generate audio for this chunk
-                    audio_buffer = await generate_speech_internal(
-                        text=chunk.text,
-                        voice_sample_path=voice_path,
-                        language_id=language_id,
-                        exaggeration=metadata.parameters.get('exaggeration'),
-                        cfg_weight=metadata.parameters.get('cfg_weight'),
-                        temperature=metadata.parameters.get('temperature')
-                    )
-
-                    # Save chunk audio file
-                    chunk_filename = f"chunk_{i+1:03d}.wav"
-                    chunk_audio_path = self.job_manager._get_job_file_paths(job_id)['chunks_dir'] / chunk_filename
-
-                    with open(chunk_audio_path, 'wb') as f:
-                        f.write(audio_buffer.getvalue())
-
-                    # Update chunk metadata
-                    chunk.audio_file = chunk_filename
-                    chunk.processing_completed_at = datetime.utcnow()
-                    chunk.duration_ms = int((chunk.processing_completed_at - chunk.processing_started_at).total_seconds() * 1000)
-
-                    chunk_audio_files.append(chunk_audio_path)
-                    chunks[i] = chunk
-
-                    # Update job progress
-                    current_metadata.completed_chunks = i + 1
-                    self.job_manager._save_job_metadata(current_metadata)
-                    self.job_manager._save_chunks_data(job_id, chunks)
-
-                    logger.info(f"Job {job_id}: Completed chunk {i+1}/{len(chunks)}")
-
-                except Exception as e:
-                    logger.error(f"Job {job_id}: Failed to process chunk {i+1}: {e}")
-                    chunk.error = str(e)
-                    chunks[i] = chunk
-
-                    # Mark chunk as failed
-                    if i not in current_metadata.failed_chunks:
-                        current_metadata.failed_chunks.append(i)
-                        self.job_manager._save_job_metadata(current_metadata)
-
-                    # For now, continue with other chunks (could be made configurable)
-                    continue
+                for i in window_indices:
+                    chunks[i].processing_started_at = datetime.utcnow()
+
+                logger.info(f"Job {job_id}: Processing chunks {window_indices[0]+1}-{window_indices[-1]+1}/{len(chunks)}")
+
+                # Generate audio for every unique chunk in this window concurrently
+                generate_indices = [i for i in window_indices if i not in duplicate_of]
+                results = await asyncio.gather(
+                    *[
+                        generate_speech_internal(
+                            text=chunks[i].text,
+                            voice_sample_path=voice_path,
+                            language_id=language_id,
+                            exaggeration=metadata.parameters.get('exaggeration'),
+                            cfg_weight=metadata.parameters.get('cfg_weight'),
+                            temperature=metadata.parameters.get('temperature'),
+                            seed=metadata.parameters.get('seed'),
+                            # Only backfill capacity left over by interactive requests
+                            priority=Priority.BACKGROUND
+                        )
+                        for i in generate_indices
+                    ],
+                    return_exceptions=True
+                )
+                results_by_index = dict(zip(generate_indices, results))
+
+                for i in window_indices:
+                    chunk = chunks[i]
+
+                    try:
+                        chunk_filename = f"chunk_{i+1:03d}.wav"
+                        chunk_audio_path = chunks_dir / chunk_filename
+
+                        if i in duplicate_of:
+                            # Reuse the audio of the first identical chunk (earlier in this or a previous window)
+                            source = chunks[duplicate_of[i]]
+                            if not source.audio_file:
+                                raise RuntimeError(f"Identical chunk {duplicate_of[i]+1} failed to generate")
+                            shutil.copyfile(chunks_dir / source.audio_file, chunk_audio_path)
+                        else:
+                            result = results_by_index[i]
+                            if isinstance(result, BaseException):
+                                raise result
+
+                            # Save chunk audio file
+                            with open(chunk_audio_path, 'wb') as f:
+                                f.write(result.getvalue())
+
+                        # Update chunk metadata
+                        chunk.audio_file = chunk_filename
+                        chunk.processing_completed_at = datetime.utcnow()
+                        chunk.duration_ms = int((chunk.processing_completed_at - chunk.processing_started_at).total_seconds() * 1000)
+
+                        chunk_audio_files.append(chunk_audio_path)
+                        chunks[i] = chunk
+                        current_metadata.completed_chunks = i + 1
+
+                        logger.info(f"Job {job_id}: Completed chunk {i+1}/{len(chunks)}")
+
+                    except asyncio.CancelledError:
+                        raise
+                    except Exception as e:
+                        logger.error(f"Job {job_id}: Failed to process chunk {i+1}: {e}")
+                        chunk.error = str(e)
+                        chunks[i] = chunk
+
+                        # Mark chunk as failed
+                        if i not in current_metadata.failed_chunks:
+                            current_metadata.failed_chunks.append(i)
+
+                        # For now, continue with other chunks (could be made configurable)
+                        continue
+
+                # Update job progress
+                self.job_manager._save_job_metadata(current_metadata)
+                self.job_manager._save_chunks_data(job_id, chunks)
 
             # Check if we have enough successful chunks to continue
             successful_chunks = [f for f in chunk_audio_files if f.exists()]
@@ -0,0 +1,112 @@
+"""
+Chunk-level cache of generated audio fragments
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, Hashable, Optional, Tuple
+
+from app.config import Config
+
+if TYPE_CHECKING:
+    import torch
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_fragment_text(text: str) -> str:
+    """Collapse whitespace so chunks that only differ in spacing share a fragment"""
+    return " ".join(text.split())
+
+
+class FragmentCache:
+    """
+    Byte-bounded LRU cache of generated audio for single text chunks.
+
+    Keys identify everything that determines a chunk's audio (normalized text,
+    voice content hash, language, sampling parameters and seed), so a sentence
+    repeated across requests or long text jobs is generated once and the
+    cached waveform is spliced into later outputs.
+    """
+
+    def __init__(self, budget_mb: Optional[int] = None):
+        budget_mb = budget_mb if budget_mb is not None else Config.FRAGMENT_CACHE_MB
+        self.budget_bytes = budget_mb * 1024 * 1024
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Tuple[torch.Tensor, int]]" = OrderedDict()
+        self._bytes = 0
+
+        # Statistics
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._deduplicated = 0
+
+    def get(self, key: Hashable) -> Optional["torch.Tensor"]:
+        """Return the cached audio for ``key``, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, audio: "torch.Tensor"):
+        """Store a chunk's audio, evicting least recently used fragments"""
+        audio = audio.detach().cpu()
+        nbytes = audio.element_size() * audio.nelement()
+        if nbytes > self.budget_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (audio, nbytes)
+            self._bytes += nbytes
+
+            while self._bytes > self.budget_bytes and self._entries:
+                _, (_, old_bytes) = self._entries.popitem(last=False)
+                self._bytes -= old_bytes
+                self._evictions += 1
+
+    def record_deduplicated(self, count: int):
+        """Count chunks that were skipped because an identical chunk was in the same batch"""
+        with self._lock:
+            self._deduplicated += count
+
+    def clear(self):
+        """Drop every cached fragment"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            return {
+                "enabled": Config.ENABLE_FRAGMENT_CACHE,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": (self._hits / max(1, self._hits + self._misses)) * 100,
+                "deduplicated_chunks": self._deduplicated,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "budget_bytes": self.budget_bytes,
+                "evictions": self._evictions
+            }
+
+
+# Global cache instance
+_fragment_cache: Optional[FragmentCache] = None
+
+
+def get_fragment_cache() -> FragmentCache:
+    """Get the global fragment cache instance"""
+    global _fragment_cache
+    if _fragment_cache is None:
+        _fragment_cache = FragmentCache()
+    return _fragment_cache
@@ -0,0 +1,817 @@
+"""
+Cross-request dynamic batching scheduler for TTS generation
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from enum import IntEnum
+from typing import TYPE_CHECKING, Any, Dict, Hashable, List, Optional, Set, Tuple
+
+from app.config import Config
+from app.core.tts_model import (
+    get_model, get_device, supports_staged_generation, generate_speech_tokens, vocode_speech_tokens,
+    model_variant, model_lease,
+    run_in_t3_stage, run_in_s3gen_stage, shutdown_stage_executors
+)
+from app.core.voice_conditioning import get_conditioning_cache
+from app.core.fragment_cache import get_fragment_cache, normalize_fragment_text
+
+if TYPE_CHECKING:
+    import torch
+
+logger = logging.getLogger(__name__)
+
+# Weight of the newest batch in the exponentially weighted throughput estimate
+_THROUGHPUT_EWMA_ALPHA = 0.2
+
+# Number of recent per-chunk queue waits kept for percentile statistics
+_QUEUE_WAIT_SAMPLES = 512
+
+# Batches whose speech tokens may wait for the vocoder before T3 stops taking new batches
+_MAX_VOCODE_BACKLOG_BATCHES = 2
+
+
+class AdmissionRejectedError(Exception):
+    """Raised when the inference queue cannot take more work within the wait SLO"""
+
+    def __init__(self, message: str, retry_after: int, estimated_wait: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.estimated_wait = estimated_wait
+
+
+@dataclass(frozen=True)
+class GenerationParams:
+    """Parameters that must match for chunks to share one batched generate call"""
+    voice_sample_path: str
+    language_id: str
+    exaggeration: float
+    temperature: float
+    diffusion_steps: int
+    seed: Optional[int] = None
+
+
+class Priority(IntEnum):
+    """Scheduling priority of a chunk (lower value is served first)"""
+    INTERACTIVE_STREAMING = 0
+    INTERACTIVE = 1
+    BACKGROUND = 2
+
+
+@dataclass
+class _PendingChunk:
+    """A single text chunk waiting to be generated"""
+    text: str
+    params: GenerationParams
+    future: asyncio.Future
+    priority: Priority = Priority.INTERACTIVE
+    request_id: Optional[str] = None
+    tokens_only: bool = False
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+def _dispatch_order(pending: _PendingChunk) -> Tuple[int, float]:
+    """Sort key: higher priority first, then oldest first"""
+    return (pending.priority, pending.enqueued_at)
+
+
+class InferenceScheduler:
+    """
+    Gathers pending chunks from all in-flight requests and issues batched
+    ``model.generate`` calls.
+
+    Chunks are grouped by their ``GenerationParams`` so that every prompt in a
+    batch shares the same voice, language and sampling settings. Each result is
+    routed back to the future of the request that submitted it.
+
+    Model calls run on a dedicated single-thread executor, and the number of
+    queued plus running chunks is bounded. Throughput is measured per batch so
+    new requests can be turned away early when their expected queue wait would
+    exceed ``QUEUE_WAIT_SLO_SECONDS``.
+
+    Each chunk carries a ``Priority``. The highest-priority chunk picks the
+    next batch; lower-priority chunks with the same parameters fill any spare
+    slots. Background chunks therefore only run when no interactive work is
+    waiting, so an interactive chunk waits for at most the one generate call
+    already in flight.
+
+    With ``ENABLE_STAGED_PIPELINE`` the T3 token generation and S3Gen vocoding
+    stages run on separate workers: once a batch's tokens are ready they are
+    handed to the vocoder and the next batch's tokens are generated meanwhile.
+    """
+
+    def __init__(
+        self,
+        max_batch_size: Optional[int] = None,
+        collection_window_ms: Optional[int] = None,
+        max_queue_chunks: Optional[int] = None,
+        queue_wait_slo: Optional[float] = None
+    ):
+        self.max_batch_size = max_batch_size or Config.VLLM_MAX_BATCH_SIZE
+        self.collection_window = (
+            collection_window_ms if collection_window_ms is not None else Config.BATCH_COLLECTION_WINDOW_MS
+        ) / 1000.0
+        self.max_queue_chunks = max_queue_chunks or Config.INFERENCE_MAX_QUEUE_CHUNKS
+        self.queue_wait_slo = queue_wait_slo or Config.QUEUE_WAIT_SLO_SECONDS
+        self.is_running = False
+        self._pending: List[_PendingChunk] = []
+        self._running_chunks = 0
+        self._wakeup: Optional[asyncio.Event] = None
+        self._worker_task: Optional[asyncio.Task] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        # Throughput estimate (chunks per second of model time)
+        self._chunks_per_second: Optional[float] = None
+
+        # Queue wait tracking
+        self._request_queue_waits: Dict[str, float] = {}
+        self._recent_queue_waits: Dict[Priority, deque] = {
+            priority: deque(maxlen=_QUEUE_WAIT_SAMPLES) for priority in Priority
+        }
+        self._max_queue_waits: Dict[Priority, float] = {priority: 0.0 for priority in Priority}
+
+        # Statistics
+        self._batches_dispatched = 0
+        self._chunks_generated = 0
+        self._largest_batch = 0
+        self._failed_batches = 0
+        self._rejected_requests = 0
+        self._cancelled_chunks = 0
+
+        # Staged pipeline: vocoding tasks running behind the T3 stage
+        self._vocode_slots = asyncio.Semaphore(_MAX_VOCODE_BACKLOG_BATCHES)
+        self._vocode_tasks: Set[asyncio.Task] = set()
+
+    async def start(self):
+        """Start the scheduler worker"""
+        if self.is_running:
+            return
+
+        self.is_running = True
+        self._get_executor()
+        self._wakeup = asyncio.Event()
+        self._worker_task = asyncio.create_task(self._worker_loop())
+        logger.info(
+            f"Inference scheduler started (max batch {self.max_batch_size}, "
+            f"window {self.collection_window * 1000:.0f}ms)"
+        )
+
+    async def stop(self):
+        """Stop the scheduler worker and fail any chunks still waiting"""
+        if not self.is_running:
+            return
+
+        self.is_running = False
+
+        if self._worker_task:
+            self._worker_task.cancel()
+            try:
+                await self._worker_task
+            except asyncio.CancelledError:
+                pass
+
+        for task in list(self._vocode_tasks):
+            task.cancel()
+
+        for pending in self._pending:
+            if not pending.future.done():
+                pending.future.set_exception(RuntimeError("Inference scheduler stopped"))
+        self._pending.clear()
+
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        shutdown_stage_executors()
+        logger.info("Inference scheduler stopped")
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get the dedicated inference executor, creating it if needed"""
+        if self._executor is None:
+            # One worker: the GPU runs one batch at a time, everything else waits in our queue
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tts-inference")
+        return self._executor
+
+    @property
+    def queued_chunks(self) -> int:
+        """
+        Number of chunks an interactive request would queue behind: waiting
+        interactive chunks plus everything running on the inference executor.
+
+        Waiting background chunks are not counted since they yield to interactive work.
+        """
+        waiting = sum(1 for p in self._pending if p.priority < Priority.BACKGROUND)
+        return waiting + self._running_chunks
+
+    def estimate_wait(self) -> Optional[float]:
+        """
+        Estimate how long a newly queued chunk would wait before it is generated.
+
+        Returns None until at least one batch has completed and throughput is known.
+        """
+        if not self._chunks_per_second:
+            return None
+        return self.queued_chunks / self._chunks_per_second
+
+    def check_admission(self, chunk_count: int = 1):
+        """
+        Reject new work that the queue cannot absorb within the wait SLO.
+
+        Called by the endpoints before any response is started, so the client
+        gets a clean 503 with ``Retry-After`` instead of a stalled stream.
+
+        Raises:
+            AdmissionRejectedError: If the queue is full or the estimated wait exceeds the SLO
+        """
+        queued = self.queued_chunks
+        estimated_wait = self.estimate_wait()
+
+        if queued + chunk_count > self.max_queue_chunks:
+            self._reject()
+            raise AdmissionRejectedError(
+                f"Inference queue is full ({queued} chunks queued, limit {self.max_queue_chunks})",
+                retry_after=self._retry_after(queued + chunk_count - self.max_queue_chunks),
+                estimated_wait=estimated_wait
+            )
+
+        if estimated_wait is not None and estimated_wait > self.queue_wait_slo:
+            self._reject()
+            raise AdmissionRejectedError(
+                f"Estimated queue wait {estimated_wait:.1f}s exceeds {self.queue_wait_slo:.1f}s",
+                retry_after=max(1, math.ceil(estimated_wait - self.queue_wait_slo)),
+                estimated_wait=estimated_wait
+            )
+
+    def _reject(self):
+        self._rejected_requests += 1
+
+    def _retry_after(self, overflow: int) -> int:
+        """Whole seconds until ``overflow`` chunks have drained at the measured throughput"""
+        retry_after = overflow / self._chunks_per_second if self._chunks_per_second else 1
+        return max(1, math.ceil(retry_after))
+
+    def cancel_request(self, request_id: str) -> int:
+        """
+        Cancel every chunk of a request that has not been dispatched yet.
+
+        Chunks already running on the executor cannot be interrupted and finish
+        normally; their results are discarded. Returns the number of chunks cancelled.
+        """
+        cancelled = [p for p in self._pending if p.request_id == request_id]
+        for pending in cancelled:
+            pending.future.cancel()
+        self._pending = [p for p in self._pending if p.request_id != request_id]
+        self._cancelled_chunks += len(cancelled)
+        if cancelled:
+            logger.info(f"Cancelled {len(cancelled)} queued chunk(s) for request {request_id}")
+        return len(cancelled)
+
+    def pop_request_queue_wait(self, request_id: str) -> float:
+        """Return and forget the longest time any chunk of a request spent queued"""
+        return self._request_queue_waits.pop(request_id, 0.0)
+
+    def _record_queue_wait(self, request_id: Optional[str], wait: float, priority: Priority):
+        self._recent_queue_waits[priority].append(wait)
+        self._max_queue_waits[priority] = max(self._max_queue_waits[priority], wait)
+        if request_id:
+            self._request_queue_waits[request_id] = max(self._request_queue_waits.get(request_id, 0.0), wait)
+
+    def _record_throughput(self, chunk_count: int, elapsed: float):
+        if elapsed <= 0:
+            return
+        rate = chunk_count / elapsed
+        if self._chunks_per_second is None:
+            self._chunks_per_second = rate
+        else:
+            self._chunks_per_second = (
+                _THROUGHPUT_EWMA_ALPHA * rate + (1 - _THROUGHPUT_EWMA_ALPHA) * self._chunks_per_second
+            )
+
+    async def generate(
+        self,
+        text: str,
+        params: GenerationParams,
+        request_id: Optional[str] = None,
+        priority: Priority = Priority.INTERACTIVE
+    ) -> torch.Tensor:
+        """Generate audio for a single chunk, batched with any compatible pending chunks"""
+        audio_list = await self.generate_many([text], params, request_id=request_id, priority=priority)
+        return audio_list[0]
+
+    async def generate_tokens(
+        self,
+        text: str,
+        params: GenerationParams,
+        request_id: Optional[str] = None,
+        priority: Priority = Priority.INTERACTIVE_STREAMING
+    ) -> Tuple[torch.Tensor, Dict[str, Any], Any]:
+        """
+        Run only the T3 stage for a chunk and return ``(speech_tokens, s3gen_ref, model)``.
+
+        Used for incremental vocoding, where the caller vocodes the tokens itself in
+        windows, with ``model`` (the one that produced them, even if the language has
+        since been routed to another variant). Requires a model that supports staged
+        generation.
+        """
+        results = await self.generate_many([text], params, request_id=request_id, priority=priority, tokens_only=True)
+        return results[0]
+
+    async def generate_many(
+        self,
+        texts: List[str],
+        params: GenerationParams,
+        request_id: Optional[str] = None,
+        priority: Priority = Priority.INTERACTIVE,
+        tokens_only: bool = False
+    ) -> List[Any]:
+        """
+        Generate audio for several chunks of one request.
+
+        All chunks are queued at once so they are dispatched together, sliced to
+        the maximum batch size. Results are returned in the same order as ``texts``.
+        Only interactive (non-streaming) chunks are held to the queue bound.
+        Streaming chunks belong to requests that passed ``check_admission`` before
+        their response started, so rejecting them would break a stream mid-body;
+        their volume is limited by the lookahead window. Background chunks are
+        limited by the long text job concurrency. With ``tokens_only`` each result
+        is a ``(speech_tokens, s3gen_ref, model)`` triple instead of audio.
+        
+        Identical chunks are only generated once. With the fragment cache enabled,
+        chunks generated earlier (by any request) are reused and only misses are
+        sent to the model.
+        """
+        if tokens_only:
+            return await self._generate_uncached(texts, params, request_id, priority, tokens_only=True)
+
+        fragment_cache = get_fragment_cache()
+        fragment_keys = [self._fragment_key(text, params) for text in texts]
+
+        results: Dict[Hashable, torch.Tensor] = {}
+        missing: Dict[Hashable, str] = {}
+        for key, text in zip(fragment_keys, texts):
+            if key in results or key in missing:
+                continue
+            cached = fragment_cache.get(key) if Config.ENABLE_FRAGMENT_CACHE else None
+            if cached is not None:
+                results[key] = cached
+            else:
+                missing[key] = text
+
+        duplicates = len(fragment_keys) - len(results) - len(missing)
+        if duplicates:
+            fragment_cache.record_deduplicated(duplicates)
+
+        if missing:
+            audio_list = await self._generate_uncached(list(missing.values()), params, request_id, priority)
+            for key, audio in zip(missing, audio_list):
+                results[key] = audio
+                if Config.ENABLE_FRAGMENT_CACHE:
+                    fragment_cache.put(key, audio)
+
+        return [results[key] for key in fragment_keys]
+
+    @staticmethod
+    def _fragment_key(text: str, params: GenerationParams) -> Hashable:
+        """
+        Identity of a chunk's audio, including the model variant serving it.
+
+        Falls back to the voice path if the file can't be hashed.
+        """
+        if not Config.ENABLE_FRAGMENT_CACHE:
+            # Only used to find duplicates within one call, where the parameters are shared
+            return normalize_fragment_text(text)
+        try:
+            voice = get_conditioning_cache().get_content_hash(params.voice_sample_path)
+        except OSError:
+            voice = params.voice_sample_path
+        return (
+            normalize_fragment_text(text),
+            voice,
+            model_variant(get_model(params.language_id)),
+            replace(params, voice_sample_path="")
+        )
+
+    async def _generate_uncached(
+        self,
+        texts: List[str],
+        params: GenerationParams,
+        request_id: Optional[str] = None,
+        priority: Priority = Priority.INTERACTIVE,
+        tokens_only: bool = False
+    ) -> List[Any]:
+        """Queue chunks for generation (or run them directly when the scheduler is disabled)"""
+        loop = asyncio.get_running_loop()
+
+        queued = self.queued_chunks
+        if priority == Priority.INTERACTIVE and queued + len(texts) > self.max_queue_chunks:
+            self._reject()
+            raise AdmissionRejectedError(
+                f"Inference queue is full ({queued} chunks queued, limit {self.max_queue_chunks})",
+                retry_after=self._retry_after(queued + len(texts) - self.max_queue_chunks),
+                estimated_wait=self.estimate_wait()
+            )
+
+        if not Config.ENABLE_BATCH_SCHEDULER and tokens_only:
+            speech_tokens, s3gen_ref, model = await run_in_t3_stage(_generate_tokens_sync, len(texts), texts, params)
+            return [(tokens, s3gen_ref, model) for tokens in speech_tokens]
+
+        if not Config.ENABLE_BATCH_SCHEDULER:
+            audio_list = []
+            for start in range(0, len(texts), self.max_batch_size):
+                batch_texts = texts[start:start + self.max_batch_size]
+                audio_list.extend(await self._execute(batch_texts, params, request_id=request_id, priority=priority))
+            return audio_list
+
+        if not self.is_running:
+            await self.start()
+
+        futures = []
+        for text in texts:
+            pending = _PendingChunk(
+                text=text,
+                params=params,
+                future=loop.create_future(),
+                priority=priority,
+                request_id=request_id,
+                tokens_only=tokens_only
+            )
+            self._pending.append(pending)
+            futures.append(pending.future)
+        self._wakeup.set()
+
+        try:
+            return list(await asyncio.gather(*futures))
+        except BaseException:
+            # Don't spend GPU time on siblings of a failed or cancelled chunk
+            for future in futures:
+                future.cancel()
+            raise
+
+    async def _worker_loop(self):
+        """Collect pending chunks for a short window and dispatch them in batches"""
+        while self.is_running:
+            try:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+
+                while self._pending:
+                    # Give concurrent requests a short window to contribute chunks
+                    oldest = min(p.enqueued_at for p in self._pending)
+                    delay = self.collection_window - (time.monotonic() - oldest)
+                    if delay > 0 and len(self._pending) < self.max_batch_size:
+                        await asyncio.sleep(delay)
+
+                    batch = self._take_batch()
+                    if batch:
+                        await self._run_batch(batch)
+
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error in inference scheduler loop: {e}")
+                await asyncio.sleep(0.1)
+
+    def _take_batch(self) -> List[_PendingChunk]:
+        """
+        Remove and return the next batch of compatible chunks.
+
+        The oldest chunk of the highest waiting priority decides the batch
+        parameters; the batch is then filled in (priority, age) order, so
+        lower-priority chunks only take slots that would otherwise be empty.
+        """
+        # Drop chunks whose requester has already given up
+        remaining = [p for p in self._pending if not p.future.done()]
+        self._cancelled_chunks += len(self._pending) - len(remaining)
+        self._pending = remaining
+        if not self._pending:
+            return []
+
+        params = min(self._pending, key=_dispatch_order).params
+        batch = sorted((p for p in self._pending if p.params == params), key=_dispatch_order)[:self.max_batch_size]
+        batch_ids = {id(p) for p in batch}
+        self._pending = [p for p in self._pending if id(p) not in batch_ids]
+        return batch
+
+    async def _run_batch(self, batch: List[_PendingChunk]):
+        """Run one batched generate call and route results back to their futures"""
+        prompts = [p.text for p in batch]
+        request_ids = {p.request_id for p in batch if p.request_id}
+        logger.debug(f"Dispatching batch of {len(batch)} chunk(s) from {len(request_ids)} request(s)")
+
+        dispatched_at = time.monotonic()
+        for pending in batch:
+            self._record_queue_wait(pending.request_id, dispatched_at - pending.enqueued_at, pending.priority)
+
+        staged = Config.ENABLE_STAGED_PIPELINE or any(p.tokens_only for p in batch)
+        if staged and supports_staged_generation(get_model(batch[0].params.language_id)):
+            await self._run_batch_staged(batch)
+            return
+
+        try:
+            audio_list = await self._execute(prompts, batch[0].params)
+        except Exception as e:
+            self._failed_batches += 1
+            for pending in batch:
+                if not pending.future.done():
+                    pending.future.set_exception(e)
+            return
+
+        self._batches_dispatched += 1
+        self._chunks_generated += len(batch)
+        self._largest_batch = max(self._largest_batch, len(batch))
+
+        for pending, audio in zip(batch, audio_list):
+            if not pending.future.done():
+                pending.future.set_result(audio)
+
+    async def _run_batch_staged(self, batch: List[_PendingChunk]):
+        """
+        Generate a batch's speech tokens, then hand vocoding off to the S3Gen stage.
+
+        Returns as soon as the T3 stage is done so the worker can start the next
+        batch's tokens while this one is being vocoded.
+        """
+        # Bound how far token generation can run ahead of the vocoder
+        await self._vocode_slots.acquire()
+
+        prompts = [p.text for p in batch]
+        params = batch[0].params
+        self._running_chunks += len(batch)
+        t3_started = time.monotonic()
+        try:
+            speech_tokens, s3gen_ref, model = await run_in_t3_stage(
+                _generate_tokens_sync, len(prompts), prompts, params
+            )
+        except Exception as e:
+            self._running_chunks -= len(batch)
+            self._vocode_slots.release()
+            self._failed_batches += 1
+            for pending in batch:
+                if not pending.future.done():
+                    pending.future.set_exception(e)
+            return
+
+        t3_elapsed = time.monotonic() - t3_started
+
+        # Token-only chunks are vocoded by their requester
+        to_vocode = []
+        for pending, tokens in zip(batch, speech_tokens):
+            if pending.tokens_only:
+                self._running_chunks -= 1
+                if not pending.future.done():
+                    pending.future.set_result((tokens, s3gen_ref, model))
+            else:
+                to_vocode.append((pending, tokens))
+
+        if not to_vocode:
+            self._vocode_slots.release()
+            self._batches_dispatched += 1
+            self._chunks_generated += len(batch)
+            self._largest_batch = max(self._largest_batch, len(batch))
+            self._record_throughput(len(batch), t3_elapsed)
+            return
+
+        task = asyncio.create_task(self._vocode_batch(to_vocode, s3gen_ref, model, len(batch), t3_elapsed))
+        self._vocode_tasks.add(task)
+        task.add_done_callback(self._vocode_tasks.discard)
+
+    async def _vocode_batch(
+        self,
+        to_vocode: List[Tuple[_PendingChunk, torch.Tensor]],
+        s3gen_ref: Dict[str, Any],
+        model,
+        batch_size: int,
+        t3_elapsed: float
+    ):
+        """
+        Vocode each chunk of a batch and resolve its future as soon as its audio is ready.
+
+        ``model`` is the model that generated the tokens and prepared ``s3gen_ref``.
+        """
+        started = time.monotonic()
+        failed = False
+        try:
+            for pending, tokens in to_vocode:
+                try:
+                    if pending.future.done():
+                        # Requester gave up while the tokens were generated; skip the vocoder work
+                        continue
+                    audio = await run_in_s3gen_stage(
+                        vocode_speech_tokens, 1, tokens, s3gen_ref, pending.params.diffusion_steps,
+                        False, model, pending.params.seed
+                    )
+                    if not pending.future.done():
+                        pending.future.set_result(audio)
+                except Exception as e:
+                    failed = True
+                    if not pending.future.done():
+                        pending.future.set_exception(e)
+                finally:
+                    self._running_chunks -= 1
+        finally:
+            self._vocode_slots.release()
+
+        if failed:
+            self._failed_batches += 1
+        else:
+            self._batches_dispatched += 1
+            self._chunks_generated += batch_size
+            self._largest_batch = max(self._largest_batch, batch_size)
+
+        # The stages overlap, so the slower one bounds throughput
+        self._record_throughput(batch_size, max(t3_elapsed, time.monotonic() - started))
+
+    async def _execute(
+        self,
+        prompts: List[str],
+        params: GenerationParams,
+        request_id: Optional[str] = None,
+        priority: Priority = Priority.INTERACTIVE
+    ) -> List[torch.Tensor]:
+        """Run one generate call on the inference executor, tracking running chunks and throughput"""
+        loop = asyncio.get_running_loop()
+        submitted_at = time.monotonic()
+        self._running_chunks += len(prompts)
+        try:
+            audio_list, started_at, elapsed = await loop.run_in_executor(
+                self._get_executor(), _timed_generate_batch, prompts, params
+            )
+        finally:
+            self._running_chunks -= len(prompts)
+
+        if not Config.ENABLE_BATCH_SCHEDULER:
+            # Without the scheduler queue, requests wait inside the executor instead
+            for _ in prompts:
+                self._record_queue_wait(request_id, started_at - submitted_at, priority)
+        self._record_throughput(len(prompts), elapsed)
+        return audio_list
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get scheduler statistics"""
+        estimated_wait = self.estimate_wait()
+        queue_waits = {}
+        for priority in Priority:
+            waits = sorted(self._recent_queue_waits[priority])
+            queue_waits[priority.name.lower()] = {
+                "queue_depth": sum(1 for p in self._pending if p.priority == priority),
+                "average_queue_wait_seconds": sum(waits) / len(waits) if waits else 0.0,
+                "p95_queue_wait_seconds": waits[int(len(waits) * 0.95)] if waits else 0.0,
+                "max_queue_wait_seconds": self._max_queue_waits[priority]
+            }
+        return {
+            "enabled": Config.ENABLE_BATCH_SCHEDULER,
+            "is_running": self.is_running,
+            "max_batch_size": self.max_batch_size,
+            "collection_window_ms": self.collection_window * 1000,
+            "queue_depth": len(self._pending),
+            "batches_dispatched": self._batches_dispatched,
+            "chunks_generated": self._chunks_generated,
+            "average_batch_size": self._chunks_generated / max(1, self._batches_dispatched),
+            "largest_batch": self._largest_batch,
+            "failed_batches": self._failed_batches,
+            "running_chunks": self._running_chunks,
+            "max_queue_chunks": self.max_queue_chunks,
+            "queue_wait_slo_seconds": self.queue_wait_slo,
+            "throughput_chunks_per_second": self._chunks_per_second,
+            "estimated_wait_seconds": estimated_wait,
+            "rejected_requests": self._rejected_requests,
+            "cancelled_chunks": self._cancelled_chunks,
+            "priorities": queue_waits
+        }
+
+
+def _generate_batch_sync(prompts: List[str], params: GenerationParams) -> List[torch.Tensor]:
+    """Run a (possibly multi-prompt) generate call on the model serving the batch's language"""
+    import torch
+    
+    model = get_model(params.language_id)
+    if model is None:
+        raise RuntimeError("Model not loaded")
+
+    if supports_staged_generation(model):
+        # Run both stages here rather than through generate(): generate() has no seed
+        # argument, and only the vocoder's draw from torch's global RNG (not token
+        # generation) has to be serialized with seeded vocoding on other threads
+        speech_tokens, s3gen_ref, model = _generate_tokens_sync(prompts, params)
+        return [
+            vocode_speech_tokens(tokens, s3gen_ref, params.diffusion_steps, model=model, seed=params.seed)
+            for tokens in speech_tokens
+        ]
+    if params.seed is not None:
+        logger.warning("Model doesn't expose the T3 stage; ignoring request seed")
+
+    # Grad mode is thread-local, so it has to be disabled in the executor thread
+    with torch.no_grad(), model_lease(model):
+        if Config.ENABLE_VOICE_CONDITIONING_CACHE and _supports_cached_conditioning(model):
+            s3gen_ref, cond_emb = _prepare_conditionals(model, params)
+            audio_list = model.generate_with_conds(
+                prompts=prompts,
+                s3gen_ref=s3gen_ref,
+                cond_emb=cond_emb,
+                exaggeration=params.exaggeration,
+                temperature=params.temperature,
+                language_id=params.language_id,
+                diffusion_steps=params.diffusion_steps
+            )
+        else:
+            audio_list = model.generate(
+                prompts=prompts,
+                audio_prompt_path=params.voice_sample_path,
+                exaggeration=params.exaggeration,
+                temperature=params.temperature,
+                language_id=params.language_id,
+                diffusion_steps=params.diffusion_steps
+            )
+
+    if not audio_list or len(audio_list) != len(prompts):
+        raise RuntimeError(
+            f"Model returned {len(audio_list) if audio_list else 0} audio tensors for {len(prompts)} prompts"
+        )
+
+    return [audio.detach() if hasattr(audio, 'detach') else audio for audio in audio_list]
+
+
+def _prepare_conditionals(model, params: GenerationParams) -> Tuple[Dict[str, Any], torch.Tensor]:
+    """Get the (s3gen_ref, cond_emb) voice conditionals for a batch"""
+    if Config.ENABLE_VOICE_CONDITIONING_CACHE:
+        # Reuse the prepared speaker embedding and prompt features instead of
+        # decoding and embedding the reference clip again for every call
+        return get_conditioning_cache().get_or_prepare(
+            params.voice_sample_path,
+            model.get_audio_conditionals,
+            device=get_device(),
+            variant=model_variant(model)
+        )
+    return model.get_audio_conditionals(params.voice_sample_path)
+
+
+def _generate_tokens_sync(
+    prompts: List[str],
+    params: GenerationParams
+) -> Tuple[List[torch.Tensor], Dict[str, Any], Any]:
+    """
+    T3 stage of a staged batch: prepare conditionals and generate speech tokens.
+
+    Also returns the model used, so the tokens are vocoded by the same one.
+    """
+    import torch
+    
+    model = get_model(params.language_id)
+    if model is None:
+        raise RuntimeError("Model not loaded")
+
+    with torch.no_grad():
+        s3gen_ref, cond_emb = _prepare_conditionals(model, params)
+        speech_tokens = generate_speech_tokens(
+            prompts,
+            cond_emb,
+            language_id=params.language_id,
+            exaggeration=params.exaggeration,
+            temperature=params.temperature,
+            seed=params.seed,
+            model=model
+        )
+
+    if len(speech_tokens) != len(prompts):
+        raise RuntimeError(f"Model returned {len(speech_tokens)} token sequences for {len(prompts)} prompts")
+    return speech_tokens, s3gen_ref, model
+
+
+def _timed_generate_batch(prompts: List[str], params: GenerationParams) -> Tuple[List[torch.Tensor], float, float]:
+    """Run a generate call and report when it started and how long the model took"""
+    started_at = time.monotonic()
+    audio_list = _generate_batch_sync(prompts, params)
+    return audio_list, started_at, time.monotonic() - started_at
+
+
+def _supports_cached_conditioning(model) -> bool:
+    """Check whether the model can generate from pre-computed voice conditionals"""
+    return hasattr(model, 'get_audio_conditionals') and hasattr(model, 'generate_with_conds')
+
+
+# Global scheduler instance
+_scheduler: Optional[InferenceScheduler] = None
+
+
+def get_inference_scheduler() -> InferenceScheduler:
+    """Get the global inference scheduler instance"""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = InferenceScheduler()
+    return _scheduler
+
+
+async def start_inference_scheduler():
+    """Start the inference scheduler (called during app startup)"""
+    await get_inference_scheduler().start()
+
+
+async def stop_inference_scheduler():
+    """Stop the inference scheduler (called during app shutdown)"""
+    await get_inference_scheduler().stop()
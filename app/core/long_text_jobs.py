@@ -35,6 +35,8 @@ class LongTextJobManager:
     def __init__(self):
         self.data_dir = Path(Config.LONG_TEXT_DATA_DIR)
         self.active_jobs: Dict[str, asyncio.Task] = {}
+        # reuse key -> completed job id, built lazily from job metadata
+        self._reuse_index: Optional[Dict[str, str]] = None
         self.job_queue: asyncio.Queue = asyncio.Queue()
         self.processing_semaphore = asyncio.Semaphore(Config.LONG_TEXT_MAX_CONCURRENT_JOBS)
         self._ensure_data_directory()
@@ -64,6 +66,118 @@ class LongTextJobManager:
         """Generate SHA256 hash of input text"""
         return hashlib.sha256(text.encode('utf-8')).hexdigest()
 
+    def _generate_reuse_key(self, text_hash: str, voice: Optional[str],
+                            parameters: Dict[str, Any], output_format: str) -> Optional[str]:
+        """
+        Identity of a job's output: text, voice content, model variant, generation parameters and format.
+
+        Unset parameters are resolved to their configured defaults, so a submission
+        that spells out the defaults matches one that omits them, and before a model
+        is loaded the variant is the one configuration routes to. Returns None if
+        the voice file can't be hashed.
+        """
+        from app.api.endpoints.speech import resolve_voice_path_and_language
+        from app.core.voice_conditioning import get_conditioning_cache
+        from app.core.tts_model import configured_variant, get_model, model_variant
+
+        voice_path, language_id = resolve_voice_path_and_language(voice)
+        try:
+            voice_hash = get_conditioning_cache().get_content_hash(voice_path)
+        except OSError:
+            return None
+
+        def resolved(name: str, default: Any) -> Any:
+            value = parameters.get(name)
+            return default if value is None else value
+
+        # Jobs can be submitted while the model is still initializing
+        model = get_model(language_id)
+        variant = model_variant(model) if model is not None else configured_variant(language_id)
+
+        identity = json.dumps({
+            'text_hash': text_hash,
+            'voice_hash': voice_hash,
+            'language_id': language_id,
+            'model_variant': variant,
+            'exaggeration': resolved('exaggeration', Config.EXAGGERATION),
+            'cfg_weight': resolved('cfg_weight', Config.CFG_WEIGHT),
+            'temperature': resolved('temperature', Config.TEMPERATURE),
+            'seed': parameters.get('seed'),
+            'streaming_chunk_size': parameters.get('streaming_chunk_size'),
+            'streaming_strategy': parameters.get('streaming_strategy'),
+            'streaming_quality': parameters.get('streaming_quality'),
+            'long_text_chunk_size': Config.LONG_TEXT_CHUNK_SIZE,
+            'silence_padding_ms': Config.LONG_TEXT_SILENCE_PADDING_MS,
+            'diffusion_steps': Config.VLLM_DIFFUSION_STEPS,
+            'output_format': output_format
+        }, sort_keys=True)
+        return hashlib.sha256(identity.encode('utf-8')).hexdigest()
+
+    def _get_reuse_index(self) -> Dict[str, str]:
+        """Map of reuse key -> completed job id, scanned from disk on first use"""
+        if self._reuse_index is None:
+            self._reuse_index = {}
+            if self.data_dir.exists():
+                for job_dir in self.data_dir.iterdir():
+                    if not job_dir.is_dir() or not self._get_job_file_paths(job_dir.name)['metadata'].exists():
+                        continue
+                    metadata = self._load_job_metadata(job_dir.name)
+                    if metadata and metadata.reuse_key and metadata.status == LongTextJobStatus.COMPLETED:
+                        self._reuse_index[metadata.reuse_key] = metadata.job_id
+        return self._reuse_index
+
+    def _find_reusable_job(self, reuse_key: str) -> Optional[LongTextJobMetadata]:
+        """Find a completed job whose output matches ``reuse_key`` and still exists"""
+        index = self._get_reuse_index()
+        job_id = index.get(reuse_key)
+        if not job_id:
+            return None
+
+        metadata = self._load_job_metadata(job_id)
+        output_file = self.get_job_file_path(job_id, 'output')
+        if (not metadata or metadata.status != LongTextJobStatus.COMPLETED
+                or metadata.reuse_key != reuse_key or not output_file or not output_file.exists()):
+            # Deleted or cleaned up since it was indexed
+            index.pop(reuse_key, None)
+            return None
+        return metadata
+
+    def _link_or_copy(self, source: Path, destination: Path):
+        """Hard-link a finished artifact, copying when linking isn't possible (e.g. across filesystems)"""
+        try:
+            if destination.exists():
+                destination.unlink()
+            os.link(source, destination)
+        except OSError:
+            shutil.copy2(source, destination)
+
+    def _reuse_job_output(self, metadata: LongTextJobMetadata, source: LongTextJobMetadata) -> bool:
+        """Complete a new job instantly by linking the output of an identical completed job"""
+        try:
+            source_paths = self._get_job_file_paths(source.job_id)
+            paths = self._get_job_file_paths(metadata.job_id)
+
+            output_file = self.get_job_file_path(source.job_id, 'output')
+            self._link_or_copy(output_file, paths['output_dir'] / output_file.name)
+            if source_paths['chunks'].exists():
+                shutil.copy2(source_paths['chunks'], paths['chunks'])
+
+            metadata.total_chunks = source.total_chunks
+            metadata.completed_chunks = source.total_chunks
+            metadata.reused_from_job_id = source.job_id
+            metadata.processing_started_at = datetime.utcnow()
+            self._save_job_metadata(metadata)
+
+            return self.complete_job(
+                job_id=metadata.job_id,
+                output_path=f"output/{output_file.name}",
+                output_size_bytes=source.output_size_bytes or output_file.stat().st_size,
+                output_duration_seconds=source.output_duration_seconds or 0.0
+            )
+        except Exception as e:
+            logger.warning(f"Failed to reuse output of job {source.job_id} for job {metadata.job_id}: {e}")
+            return False
+
     def _create_job_directories(self, job_id: str):
         """Create directory structure for a new job"""
         paths = self._get_job_file_paths(job_id)
@@ -168,10 +282,16 @@ class LongTextJobManager:
                    session_id: Optional[str] = None,
                    streaming_chunk_size: Optional[int] = None,
                    streaming_strategy: Optional[str] = None,
-                   streaming_quality: Optional[str] = None) -> Tuple[str, int]:
+                   streaming_quality: Optional[str] = None,
+                   seed: Optional[int] = None,
+                   reuse_existing: bool = False) -> Tuple[str, int]:
         """
         Create a new long text job
 
+        With ``reuse_existing``, a submission identical to an already completed job
+        (same text, voice content, parameters and format) is completed immediately
+        by linking that job's output instead of being queued.
+
         Returns:
             Tuple of (job_id, estimated_chunks)
         """
@@ -209,16 +329,24 @@ class LongTextJobManager:
                 'output_format': output_format,
                 'streaming_chunk_size': streaming_chunk_size,
                 'streaming_strategy': streaming_strategy,
-                'streaming_quality': streaming_quality
+                'streaming_quality': streaming_quality,
+                'seed': seed
             },
             output_format=output_format,
             user_session_id=session_id
         )
+        metadata.reuse_key = self._generate_reuse_key(text_hash, resolved_voice_name, metadata.parameters, output_format)
 
         # Save to filesystem
         self._save_job_metadata(metadata)
         self._save_input_text(job_id, text)
 
+        if reuse_existing and Config.LONG_TEXT_REUSE_OUTPUT and metadata.reuse_key:
+            source = self._find_reusable_job(metadata.reuse_key)
+            if source and self._reuse_job_output(metadata, source):
+                logger.info(f"Created job {job_id} from the output of identical job {source.job_id}")
+                return job_id, source.total_chunks
+
         logger.info(f"Created job {job_id} for {len(text)} characters ({estimated_chunks} chunks)")
         return job_id, estimated_chunks
 
@@ -649,6 +777,8 @@ class LongTextJobManager:
             )
 
         self._save_job_metadata(metadata)
+        if metadata.reuse_key and self._reuse_index is not None:
+            self._reuse_index[metadata.reuse_key] = job_id
         logger.info(f"Completed job {job_id} - Duration: {output_duration_seconds:.1f}s, Size: {output_size_bytes:,} bytes")
         return True
 
@@ -666,9 +796,9 @@ class LongTextJobManager:
             persistent_dir = self.data_dir / "history" / job_id
             persistent_dir.mkdir(parents=True, exist_ok=True)
 
-            # Copy file to persistent location
+            # Link (or copy) file to persistent location
             persistent_file = persistent_dir / source_file.name
-            shutil.copy2(source_file, persistent_file)
+            self._link_or_copy(source_file, persistent_file)
 
             return str(persistent_file.relative_to(self.data_dir))
 
@@ -763,7 +893,8 @@ class LongTextJobManager:
             session_id=original_metadata.user_session_id,
             streaming_chunk_size=parameters.get('streaming_chunk_size'),
             streaming_strategy=parameters.get('streaming_strategy'),
-            streaming_quality=parameters.get('streaming_quality')
+            streaming_quality=parameters.get('streaming_quality'),
+            seed=parameters.get('seed')
         )
 
         # Update metadata to link to original job
@@ -3,12 +3,24 @@ Memory management utilities for TTS processing
 """
 
 import gc
-import torch
-import psutil
+import sys
+
+
+def _loaded_torch():
+    """
+    Return the torch module if something has already imported it, else None.
+
+    Memory reporting and cleanup shouldn't be what pulls torch in: before the
+    model has loaded there is no GPU state to report, and importing torch from
+    a request handler would stall the event loop for seconds.
+    """
+    return sys.modules.get("torch")
 
 
 def get_memory_info():
     """Get current memory usage information"""
+    import psutil
+    
     memory_info = {}
     
     # CPU memory
@@ -17,7 +29,8 @@ def get_memory_info():
     memory_info['cpu_memory_percent'] = process.memory_percent()
     
     # GPU memory (if available)
-    if torch.cuda.is_available():
+    torch = _loaded_torch()
+    if torch is not None and torch.cuda.is_available():
         memory_info['gpu_memory_allocated_mb'] = torch.cuda.memory_allocated() / 1024 / 1024
         memory_info['gpu_memory_reserved_mb'] = torch.cuda.memory_reserved() / 1024 / 1024
         memory_info['gpu_memory_max_allocated_mb'] = torch.cuda.max_memory_allocated() / 1024 / 1024
@@ -32,7 +45,8 @@ def cleanup_memory(force_cuda_clear=False):
         collected = gc.collect()
         
         # Clear PyTorch cache if using CUDA
-        if torch.cuda.is_available() and force_cuda_clear:
+        torch = _loaded_torch()
+        if torch is not None and torch.cuda.is_available() and force_cuda_clear:
             torch.cuda.empty_cache()
             torch.cuda.synchronize()
             print(f"🧹 CUDA cache cleared (collected {collected} objects)")
@@ -0,0 +1,151 @@
+"""
+Readiness gate that holds requests while the model is initializing
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from app.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class ModelNotReadyError(Exception):
+    """Raised when a request can't wait for the model to become ready"""
+
+    def __init__(self, message: str, retry_after: Optional[int] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class ReadinessGate:
+    """
+    Bounded FIFO of requests waiting for model initialization.
+
+    Requests that arrive before the model is ready wait here instead of failing,
+    and are released in arrival order once initialization completes. A request
+    is rejected if the queue is full, if it waits longer than the wait budget,
+    or if initialization fails.
+    """
+
+    def __init__(self, max_waiters: Optional[int] = None, timeout_seconds: Optional[float] = None):
+        self.max_waiters = max_waiters if max_waiters is not None else Config.READINESS_QUEUE_SIZE
+        self.timeout_seconds = timeout_seconds if timeout_seconds is not None else Config.READINESS_WAIT_TIMEOUT_SECONDS
+
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._ready = False
+        self._error: Optional[str] = None
+
+        # Statistics
+        self._waited = 0
+        self._released = 0
+        self._timed_out = 0
+        self._rejected_full = 0
+        self._failed = 0
+        self._total_wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+
+    @property
+    def retry_after(self) -> int:
+        """Retry-After hint for rejected requests: one more wait budget"""
+        return max(1, round(self.timeout_seconds))
+
+    def mark_ready(self):
+        """Model is ready: release waiting requests in arrival order"""
+        self._ready = True
+        self._error = None
+        released = 0
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                released += 1
+        if released:
+            logger.info(f"Model ready, releasing {released} waiting requests")
+
+    def mark_failed(self, error: str):
+        """Model initialization failed: reject waiting and future requests"""
+        self._ready = False
+        self._error = error
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_exception(ModelNotReadyError(f"Model initialization failed: {error}"))
+
+    async def wait(self) -> float:
+        """
+        Wait until the model is ready.
+
+        Returns the number of seconds spent waiting (0.0 if it was already ready).
+        Raises ModelNotReadyError if initialization failed, the queue is full or
+        the wait budget is exceeded.
+        """
+        if self._ready:
+            return 0.0
+        if self._error is not None:
+            raise ModelNotReadyError(f"Model initialization failed: {self._error}")
+        if len(self._waiters) >= self.max_waiters:
+            self._rejected_full += 1
+            raise ModelNotReadyError(
+                f"Model is initializing and {len(self._waiters)} requests are already waiting",
+                retry_after=self.retry_after
+            )
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._waited += 1
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(waiter, timeout=self.timeout_seconds)
+        except asyncio.TimeoutError:
+            self._timed_out += 1
+            raise ModelNotReadyError(
+                f"Model still initializing after waiting {self.timeout_seconds:g}s",
+                retry_after=self.retry_after
+            )
+        except ModelNotReadyError:
+            self._failed += 1
+            raise
+        finally:
+            try:
+                self._waiters.remove(waiter)
+            except ValueError:
+                pass
+
+        waited = time.monotonic() - started
+        self._released += 1
+        self._total_wait_seconds += waited
+        self._max_wait_seconds = max(self._max_wait_seconds, waited)
+        return waited
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get readiness queue statistics"""
+        return {
+            "ready": self._ready,
+            "error": self._error,
+            "waiting": len(self._waiters),
+            "max_waiters": self.max_waiters,
+            "timeout_seconds": self.timeout_seconds,
+            "waited": self._waited,
+            "released": self._released,
+            "timed_out": self._timed_out,
+            "rejected_full": self._rejected_full,
+            "failed": self._failed,
+            "avg_wait_seconds": self._total_wait_seconds / max(1, self._released),
+            "max_wait_seconds": self._max_wait_seconds
+        }
+
+
+# Global gate instance
+_readiness_gate: Optional[ReadinessGate] = None
+
+
+def get_readiness_gate() -> ReadinessGate:
+    """Get the global readiness gate instance"""
+    global _readiness_gate
+    if _readiness_gate is None:
+        _readiness_gate = ReadinessGate()
+    return _readiness_gate
@@ -0,0 +1,249 @@
+"""
+Two-tier cache of synthesized audio responses
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from app.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Suffix of finished cache files, named ``{key}.{response_format}.audio``;
+# partially written files use ``.tmp``
+_CACHE_FILE_SUFFIX = ".audio"
+
+
+class ResponseCache:
+    """
+    LRU cache of complete synthesized responses, keyed by a hash of everything
+    that determines the output (normalized text, voice content hash, language,
+    sampling parameters, output format and seed).
+
+    Entries are written through to a disk tier so they survive restarts, and
+    the most recently used ones are also kept in memory. Each tier has its own
+    byte budget and evicts least recently used entries independently. Every
+    entry records the response format it was encoded in.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        memory_budget_mb: Optional[int] = None,
+        disk_budget_mb: Optional[int] = None
+    ):
+        self.cache_dir = Path(cache_dir or Config.RESPONSE_CACHE_DIR)
+        memory_budget_mb = memory_budget_mb if memory_budget_mb is not None else Config.RESPONSE_CACHE_MEMORY_MB
+        disk_budget_mb = disk_budget_mb if disk_budget_mb is not None else Config.RESPONSE_CACHE_DISK_MB
+        self.memory_budget_bytes = memory_budget_mb * 1024 * 1024
+        self.disk_budget_bytes = disk_budget_mb * 1024 * 1024
+
+        self._lock = threading.RLock()
+        self._memory: "OrderedDict[str, Tuple[bytes, str]]" = OrderedDict()
+        self._disk: "OrderedDict[str, Tuple[int, str]]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes = 0
+
+        # Statistics
+        self._memory_hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._memory_evictions = 0
+        self._disk_evictions = 0
+
+        if self.disk_budget_bytes > 0:
+            self._load_disk_index()
+
+    @staticmethod
+    def make_key(
+        text: str,
+        voice_hash: str,
+        language_id: str,
+        exaggeration: float,
+        temperature: float,
+        diffusion_steps: int,
+        response_format: str,
+        seed: Optional[int],
+        variant: str
+    ) -> str:
+        """Build the cache key for a synthesis request; ``variant`` is the model variant serving it"""
+        identity = json.dumps([
+            " ".join(text.split()),
+            voice_hash,
+            language_id,
+            variant,
+            round(float(exaggeration), 4),
+            round(float(temperature), 4),
+            diffusion_steps,
+            response_format,
+            seed
+        ])
+        return hashlib.sha256(identity.encode("utf-8")).hexdigest()
+
+    def _path_for(self, key: str, response_format: str) -> Path:
+        return self.cache_dir / f"{key}.{response_format}{_CACHE_FILE_SUFFIX}"
+
+    def _load_disk_index(self):
+        """Rebuild the disk tier index from files left by a previous run, oldest use first"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        entries = []
+        for path in self.cache_dir.iterdir():
+            if path.suffix == ".tmp":
+                path.unlink(missing_ok=True)
+                continue
+            if path.suffix != _CACHE_FILE_SUFFIX:
+                continue
+            key, _, response_format = path.stem.partition(".")
+            if not response_format:
+                # Written before entries recorded their format
+                path.unlink(missing_ok=True)
+                continue
+            stat = path.stat()
+            entries.append((stat.st_mtime, key, response_format, stat.st_size))
+
+        for _, key, response_format, size in sorted(entries):
+            self._forget_disk(key)
+            self._disk[key] = (size, response_format)
+            self._disk_bytes += size
+        self._evict_disk()
+
+        logger.info(f"Response cache directory: {self.cache_dir} ({len(self._disk)} entries, {self._disk_bytes:,} bytes)")
+
+    def get(self, key: str) -> Optional[Tuple[bytes, str]]:
+        """Return the cached response for ``key`` and its response format, or None. May read from disk."""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self._memory_hits += 1
+                return self._memory[key]
+            disk_entry = self._disk.get(key)
+
+        if disk_entry is not None:
+            response_format = disk_entry[1]
+            path = self._path_for(key, response_format)
+            try:
+                data = path.read_bytes()
+                os.utime(path)
+            except OSError:
+                data = None
+
+            with self._lock:
+                if data is None:
+                    # Removed underneath us (eviction by another worker or manual cleanup)
+                    self._forget_disk(key)
+                elif key in self._disk:
+                    self._disk.move_to_end(key)
+                    self._disk_hits += 1
+                    self._insert_memory(key, data, response_format)
+                    return data, response_format
+
+        with self._lock:
+            self._misses += 1
+        return None
+
+    def put(self, key: str, data: bytes, response_format: str):
+        """Store a response encoded as ``response_format`` in both tiers. May write to disk."""
+        with self._lock:
+            self._insert_memory(key, data, response_format)
+
+        if len(data) > self.disk_budget_bytes:
+            return
+
+        path = self._path_for(key, response_format)
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to write response cache entry: {e}")
+            tmp_path.unlink(missing_ok=True)
+            return
+
+        with self._lock:
+            previous = self._disk.get(key)
+            self._forget_disk(key)
+            if previous is not None and previous[1] != response_format:
+                self._path_for(key, previous[1]).unlink(missing_ok=True)
+            self._disk[key] = (len(data), response_format)
+            self._disk_bytes += len(data)
+            self._evict_disk()
+
+    def _insert_memory(self, key: str, data: bytes, response_format: str):
+        """Insert into the memory tier, evicting least recently used entries"""
+        if len(data) > self.memory_budget_bytes:
+            return
+
+        if key in self._memory:
+            self._memory_bytes -= len(self._memory.pop(key)[0])
+        self._memory[key] = (data, response_format)
+        self._memory_bytes += len(data)
+
+        while self._memory_bytes > self.memory_budget_bytes and self._memory:
+            _, (old_data, _) = self._memory.popitem(last=False)
+            self._memory_bytes -= len(old_data)
+            self._memory_evictions += 1
+
+    def _evict_disk(self):
+        """Delete least recently used files until the disk tier fits its budget"""
+        while self._disk_bytes > self.disk_budget_bytes and self._disk:
+            old_key, (old_size, old_format) = self._disk.popitem(last=False)
+            self._disk_bytes -= old_size
+            self._disk_evictions += 1
+            try:
+                self._path_for(old_key, old_format).unlink(missing_ok=True)
+            except OSError as e:
+                logger.warning(f"Failed to remove response cache entry: {e}")
+
+    def _forget_disk(self, key: str):
+        if key in self._disk:
+            self._disk_bytes -= self._disk.pop(key)[0]
+
+    def clear(self):
+        """Drop every cached entry from both tiers"""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            for key, (_, response_format) in self._disk.items():
+                self._path_for(key, response_format).unlink(missing_ok=True)
+            self._disk.clear()
+            self._disk_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            hits = self._memory_hits + self._disk_hits
+            return {
+                "enabled": Config.ENABLE_RESPONSE_CACHE,
+                "hits": hits,
+                "memory_hits": self._memory_hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+                "hit_rate": (hits / max(1, hits + self._misses)) * 100,
+                "memory_entries": len(self._memory),
+                "disk_entries": len(self._disk),
+                "memory_bytes": self._memory_bytes,
+                "disk_bytes": self._disk_bytes,
+                "memory_budget_bytes": self.memory_budget_bytes,
+                "disk_budget_bytes": self.disk_budget_bytes,
+                "memory_evictions": self._memory_evictions,
+                "disk_evictions": self._disk_evictions
+            }
+
+
+# Global cache instance
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Get the global response cache instance"""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache()
+    return _response_cache
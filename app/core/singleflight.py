@@ -0,0 +1,217 @@
+"""
+Single-flight deduplication of identical in-flight synthesis requests
+"""
+
+import asyncio
+import logging
+from contextlib import aclosing
+from dataclasses import dataclass, field
+from typing import Any, AsyncGenerator, Awaitable, Callable, Dict, Hashable, List, Optional
+
+from app.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Call:
+    """A shared awaitable computation and the number of callers waiting on it"""
+    task: asyncio.Task
+    waiters: int = 0
+
+
+@dataclass
+class _Broadcast:
+    """A shared stream: the items not yet received by every subscriber plus a wakeup for new ones"""
+    items: List[Any] = field(default_factory=list)
+    start: int = 0  # Position in the stream of items[0]; earlier items were released
+    done: bool = False
+    error: Optional[BaseException] = None
+    changed: asyncio.Event = field(default_factory=asyncio.Event)
+    positions: Dict[object, int] = field(default_factory=dict)  # Next position per subscriber
+    producer: Optional[asyncio.Task] = None
+
+    @property
+    def produced(self) -> int:
+        """Number of items produced so far"""
+        return self.start + len(self.items)
+
+    def notify(self):
+        """Wake every subscriber waiting for the next item"""
+        changed, self.changed = self.changed, asyncio.Event()
+        changed.set()
+
+    def release(self, replay_items: int):
+        """Drop items every subscriber has received, once late joiners can no longer replay them"""
+        if self.produced <= replay_items or not self.positions:
+            return
+        received = min(self.positions.values()) - self.start
+        if received > 0:
+            del self.items[:received]
+            self.start += received
+
+
+class SingleFlight:
+    """
+    Collapses concurrent identical requests onto one computation.
+
+    ``do()`` shares the result of a coroutine between every caller that asks for
+    the same key while it is running. ``stream()`` does the same for async
+    generators: the first subscriber starts one producer, and every subscriber
+    receives the same sequence of items. Late joiners get a replay of what was
+    already produced while that is at most ``replay_items`` items; a request
+    arriving later than that starts a stream of its own instead.
+
+    Keys are only shared while the work is in flight; once it finishes the next
+    request for the same key starts a fresh computation. Work is cancelled when
+    its last waiter or subscriber goes away.
+    """
+
+    def __init__(self, poll_interval: float = 0.25, replay_items: Optional[int] = None):
+        self.poll_interval = poll_interval
+        self.replay_items = replay_items if replay_items is not None else Config.SINGLE_FLIGHT_REPLAY_ITEMS
+        self._calls: Dict[Hashable, _Call] = {}
+        self._broadcasts: Dict[Hashable, _Broadcast] = {}
+
+        # Statistics
+        self._leaders = 0
+        self._followers = 0
+        self._cancelled = 0
+        self._too_late = 0
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Run ``factory()`` once for all concurrent callers with the same key and share its result"""
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(task=asyncio.ensure_future(factory()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _, key=key, call=call: self._forget_call(key, call))
+            self._leaders += 1
+        else:
+            self._followers += 1
+            logger.debug(f"Joined in-flight request ({call.waiters} already waiting)")
+
+        call.waiters += 1
+        try:
+            # Shield so one caller being cancelled doesn't cancel the work for the others
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                self._cancelled += 1
+                call.task.cancel()
+
+    async def stream(
+        self,
+        key: Hashable,
+        factory: Callable[[], AsyncGenerator[Any, None]],
+        is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None
+    ) -> AsyncGenerator[Any, None]:
+        """
+        Subscribe to the stream for ``key``, starting ``factory()`` if nobody else has.
+
+        Args:
+            key: Identity of the stream
+            factory: Creates the producing async generator
+            is_disconnected: Optional check polled while waiting; the subscription
+                ends quietly once it returns True
+        """
+        broadcast = self._broadcasts.get(key)
+        if broadcast is not None and broadcast.produced > self.replay_items:
+            # Too far along to replay from the start; later requests share a new stream
+            self._too_late += 1
+            self._forget_broadcast(key, broadcast)
+            broadcast = None
+
+        if broadcast is None:
+            broadcast = _Broadcast()
+            self._broadcasts[key] = broadcast
+            broadcast.producer = asyncio.ensure_future(self._produce(key, broadcast, factory))
+            self._leaders += 1
+        else:
+            self._followers += 1
+            logger.debug(f"Joined in-flight stream ({len(broadcast.positions)} subscriber(s) already)")
+
+        subscriber = object()
+        broadcast.positions[subscriber] = 0
+        index = 0
+        try:
+            while True:
+                while index < broadcast.produced:
+                    item = broadcast.items[index - broadcast.start]
+                    index += 1
+                    broadcast.positions[subscriber] = index
+                    broadcast.release(self.replay_items)
+                    yield item
+
+                if broadcast.done:
+                    if broadcast.error is not None:
+                        raise broadcast.error
+                    return
+
+                changed = broadcast.changed
+                while not changed.is_set():
+                    if is_disconnected is not None and await is_disconnected():
+                        return
+                    try:
+                        await asyncio.wait_for(changed.wait(), timeout=self.poll_interval)
+                    except asyncio.TimeoutError:
+                        pass
+        finally:
+            del broadcast.positions[subscriber]
+            broadcast.release(self.replay_items)
+            if not broadcast.positions and broadcast.producer and not broadcast.producer.done():
+                # Nobody is listening any more; stop generating
+                self._cancelled += 1
+                broadcast.producer.cancel()
+                self._forget_broadcast(key, broadcast)
+
+    async def _produce(self, key: Hashable, broadcast: _Broadcast, factory: Callable[[], AsyncGenerator[Any, None]]):
+        """Drive the producing generator and publish each item to all subscribers"""
+        try:
+            async with aclosing(factory()) as producer:
+                async for item in producer:
+                    broadcast.items.append(item)
+                    broadcast.notify()
+        except asyncio.CancelledError:
+            broadcast.error = RuntimeError("Shared stream was cancelled")
+            raise
+        except BaseException as e:
+            broadcast.error = e
+        finally:
+            broadcast.done = True
+            broadcast.notify()
+            self._forget_broadcast(key, broadcast)
+
+    def _forget_call(self, key: Hashable, call: _Call):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    def _forget_broadcast(self, key: Hashable, broadcast: _Broadcast):
+        if self._broadcasts.get(key) is broadcast:
+            del self._broadcasts[key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get deduplication statistics"""
+        total = self._leaders + self._followers
+        return {
+            "in_flight_calls": len(self._calls),
+            "in_flight_streams": len(self._broadcasts),
+            "leaders": self._leaders,
+            "followers": self._followers,
+            "dedup_rate": (self._followers / max(1, total)) * 100,
+            "cancelled": self._cancelled,
+            "too_late_to_join": self._too_late
+        }
+
+
+# Global single-flight instance
+_single_flight: Optional[SingleFlight] = None
+
+
+def get_single_flight() -> SingleFlight:
+    """Get the global single-flight instance"""
+    global _single_flight
+    if _single_flight is None:
+        _single_flight = SingleFlight()
+    return _single_flight
@@ -0,0 +1,57 @@
+"""
+Per-phase startup timing
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+# Reference point for "time since start"; this module is imported first by app.main
+_started_at = time.perf_counter()
+
+_phases: Dict[str, float] = {}
+_server_ready_seconds: Optional[float] = None
+_model_ready_seconds: Optional[float] = None
+
+
+def record_phase(name: str, seconds: float):
+    """Record how long a startup phase took"""
+    _phases[name] = seconds
+
+
+@contextmanager
+def startup_phase(name: str):
+    """Time the enclosed block as startup phase ``name``"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_phase(name, time.perf_counter() - started)
+
+
+def mark_server_ready():
+    """Record that the HTTP server is about to accept connections and print the phases so far"""
+    global _server_ready_seconds
+    _server_ready_seconds = time.perf_counter() - _started_at
+    print(f"✓ Server ready in {_server_ready_seconds:.2f}s ({format_phases()})")
+
+
+def mark_model_ready():
+    """Record that the model finished loading and print the full startup breakdown"""
+    global _model_ready_seconds
+    _model_ready_seconds = time.perf_counter() - _started_at
+    print(f"✓ Model ready {_model_ready_seconds:.1f}s after start ({format_phases()})")
+
+
+def format_phases() -> str:
+    """One-line summary of recorded phases"""
+    return ", ".join(f"{name} {seconds:.2f}s" for name, seconds in _phases.items())
+
+
+def get_startup_timings() -> Dict[str, Any]:
+    """Get recorded startup phase durations in seconds"""
+    return {
+        "phases": dict(_phases),
+        "server_ready_seconds": _server_ready_seconds,
+        "model_ready_seconds": _model_ready_seconds
+    }
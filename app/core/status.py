@@ -23,6 +23,7 @@ class TTSStatus(Enum):
     FINALIZING = "finalizing"
     COMPLETED = "completed"
     ERROR = "error"
+    CANCELLED = "cancelled"
 
 
 @dataclass
@@ -55,6 +56,7 @@ class TTSRequestInfo:
     progress: TTSProgressInfo = None
     error_message: Optional[str] = None
     memory_usage: Dict[str, float] = None
+    queue_wait_seconds: float = 0.0
     
     def __post_init__(self):
         """Initialize default values"""
@@ -75,7 +77,7 @@ class TTSRequestInfo:
     @property
     def is_active(self) -> bool:
         """Check if request is currently active"""
-        return self.status not in [TTSStatus.COMPLETED, TTSStatus.ERROR, TTSStatus.IDLE]
+        return self.status not in [TTSStatus.COMPLETED, TTSStatus.ERROR, TTSStatus.CANCELLED, TTSStatus.IDLE]
 
 
 class TTSStatusManager:
@@ -119,7 +121,8 @@ class TTSStatusManager:
         current_chunk: int = None,
         total_chunks: int = None,
         memory_usage: Optional[Dict[str, float]] = None,
-        error_message: Optional[str] = None
+        error_message: Optional[str] = None,
+        queue_wait_seconds: Optional[float] = None
     ):
         """Update request status and progress"""
         with self._lock:
@@ -151,8 +154,11 @@ class TTSStatusManager:
             if error_message:
                 self._current_request.error_message = error_message
             
-            # If completed or error, finalize request
-            if status in [TTSStatus.COMPLETED, TTSStatus.ERROR]:
+            if queue_wait_seconds is not None:
+                self._current_request.queue_wait_seconds = queue_wait_seconds
+            
+            # If completed, failed or cancelled, finalize request
+            if status in [TTSStatus.COMPLETED, TTSStatus.ERROR, TTSStatus.CANCELLED]:
                 self._current_request.end_time = datetime.now(timezone.utc)
                 self._finalize_request()
     
@@ -223,23 +229,28 @@ class TTSStatusManager:
         with self._lock:
             completed_requests = [r for r in self._request_history if r.status == TTSStatus.COMPLETED]
             error_requests = [r for r in self._request_history if r.status == TTSStatus.ERROR]
+            cancelled_requests = [r for r in self._request_history if r.status == TTSStatus.CANCELLED]
             
             if completed_requests:
                 avg_duration = sum(r.duration_seconds for r in completed_requests) / len(completed_requests)
                 avg_text_length = sum(r.text_length for r in completed_requests) / len(completed_requests)
+                avg_queue_wait = sum(r.queue_wait_seconds for r in completed_requests) / len(completed_requests)
             else:
                 avg_duration = 0
                 avg_text_length = 0
+                avg_queue_wait = 0
             
             return {
                 "total_requests": self._total_requests,
                 "completed_requests": len(completed_requests),
                 "error_requests": len(error_requests),
+                "cancelled_requests": len(cancelled_requests),
                 "success_rate": (
                     len(completed_requests) / max(1, len(completed_requests) + len(error_requests))
                 ) * 100,
                 "average_duration_seconds": avg_duration,
                 "average_text_length": avg_text_length,
+                "average_queue_wait_seconds": avg_queue_wait,
                 "is_processing": self._current_request is not None
             }
     
@@ -270,12 +281,13 @@ def update_tts_status(
     current_chunk: int = None,
     total_chunks: int = None,
     memory_usage: Optional[Dict[str, float]] = None,
-    error_message: Optional[str] = None
+    error_message: Optional[str] = None,
+    queue_wait_seconds: Optional[float] = None
 ):
     """Update TTS request status"""
     _status_manager.update_status(
         request_id, status, current_step, current_chunk, 
-        total_chunks, memory_usage, error_message
+        total_chunks, memory_usage, error_message, queue_wait_seconds
     )
 
 
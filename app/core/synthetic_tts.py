@@ -0,0 +1,369 @@
+"""
+Deterministic CPU stand-in for the Chatterbox TTS model
+
+SyntheticTTS implements the part of the ChatterboxTTS API the serving stack uses
+(``sr``, ``variant``, ``get_supported_languages``, ``get_audio_conditionals``,
+``generate``, ``generate_with_conds``, ``shutdown``). It returns tone-based audio
+whose length follows the text, after sleeping for a configurable, realistic
+amount of time. The same text, voice and parameters always give the same samples,
+so performance runs of the API layer are reproducible without a GPU or weights.
+
+It also exposes the two stages separately like the real model, so the staged
+pipeline runs on it: ``generate_speech_tokens`` (T3) and ``s3gen.inference``
+(the vocoder). As with S3Gen, the vocoder adds a little noise drawn from torch's
+global RNG, so staged output is only sample-exact for seeded requests.
+"""
+
+import hashlib
+import logging
+import math
+import time
+import zlib
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import torch
+
+logger = logging.getLogger(__name__)
+
+# Output sample rate of the real S3Gen vocoder
+SYNTHETIC_SAMPLE_RATE = 24000
+
+# Speaking rate of the generated audio (~15 characters per second)
+_SECONDS_PER_CHARACTER = 0.065
+
+# The real model emits 25 speech tokens per second of audio
+_TOKENS_PER_SECOND = 25
+
+# Silence between words and fade length at word edges
+_WORD_GAP_SECONDS = 0.06
+_FADE_SECONDS = 0.01
+
+# Synthetic speech tokens: a pause, or a word's pitch offset in thousandths around _PITCH_TOKEN_BASE
+_SILENCE_TOKEN = 0
+_PITCH_TOKEN_BASE = 1000
+
+# Output level and noise floor of the staged vocoder
+_VOCODER_LEVEL = 0.35
+_VOCODER_NOISE_LEVEL = 0.001
+
+
+def _stable_hash(value: str) -> int:
+    """Process-independent 32-bit hash (``hash()`` is salted per process)"""
+    return zlib.crc32(value.encode("utf-8"))
+
+
+def _sleep_ms(milliseconds: float):
+    if milliseconds > 0:
+        time.sleep(milliseconds / 1000)
+
+
+def _render_tone(frequency: float, samples: int, harmonics: List[float], level: float, sample_rate: int) -> torch.Tensor:
+    """A harmonic tone of ``samples`` samples with short fades at both ends"""
+    t = torch.arange(samples, dtype=torch.float32) / sample_rate
+    tone = sum(
+        amplitude * torch.sin(2 * math.pi * frequency * (index + 1) * t)
+        for index, amplitude in enumerate(harmonics)
+    )
+    envelope = torch.ones(samples)
+    edge = min(int(_FADE_SECONDS * sample_rate), samples // 2)
+    if edge:
+        ramp = torch.linspace(0.0, 1.0, edge)
+        envelope[:edge] = ramp
+        envelope[samples - edge:] = ramp.flip(0)
+    return tone * envelope * (level / sum(harmonics))
+
+
+def _voice(s3gen_ref: Dict[str, Any]) -> Tuple[float, List[float]]:
+    """Base pitch and harmonic amplitudes of prepared conditionals"""
+    pitch_hz = float(s3gen_ref["pitch_hz"].reshape(-1)[0])
+    return pitch_hz, [float(h) for h in s3gen_ref["harmonics"].reshape(-1)]
+
+
+def _pitch_range(exaggeration: float) -> float:
+    """Relative pitch spread between words; exaggeration widens it"""
+    return 0.1 + 0.3 * max(0.0, min(exaggeration, 2.0))
+
+
+class SyntheticS3Gen:
+    """
+    Vocoder stage of SyntheticTTS, with the ``inference`` signature of S3Gen.
+
+    Each speech token becomes 1/25 s of audio; a call sleeps for
+    ``per_step * n_timesteps`` milliseconds.
+    """
+
+    def __init__(self, sample_rate: int, latency_per_step_ms: float):
+        self.sample_rate = sample_rate
+        self.latency_per_step_ms = latency_per_step_ms
+
+    def inference(
+        self,
+        speech_tokens: torch.Tensor,
+        ref_dict: Dict[str, Any],
+        n_timesteps: int = 10,
+        no_trim: bool = False,
+        **kwargs
+    ) -> Tuple[torch.Tensor, None]:
+        _sleep_ms(self.latency_per_step_ms * n_timesteps)
+
+        pitch_hz, harmonics = _voice(ref_dict)
+        samples_per_token = self.sample_rate // _TOKENS_PER_SECOND
+        tokens = speech_tokens.reshape(-1).tolist()
+        audio = torch.zeros(1, len(tokens) * samples_per_token)
+
+        # Render each run of identical tokens (one word or pause) as a single tone
+        start = 0
+        while start < len(tokens):
+            end = start
+            while end < len(tokens) and tokens[end] == tokens[start]:
+                end += 1
+            if tokens[start] != _SILENCE_TOKEN:
+                frequency = pitch_hz * (1.0 + (tokens[start] - _PITCH_TOKEN_BASE) / 1000)
+                samples = (end - start) * samples_per_token
+                audio[0, start * samples_per_token:end * samples_per_token] = _render_tone(
+                    frequency, samples, harmonics, _VOCODER_LEVEL, self.sample_rate
+                )
+            start = end
+
+        audio += torch.randn(audio.shape) * _VOCODER_NOISE_LEVEL
+        return audio, None
+
+
+class SyntheticTTS:
+    """
+    Synthetic model variant with simulated generation latency.
+
+    A generate call sleeps for
+    ``per_batch + per_char * longest_prompt_chars + per_step * diffusion_steps * prompts``
+    milliseconds: token generation decodes the whole batch in lockstep, so its cost
+    follows the longest prompt, while the vocoder runs each prompt separately. The
+    staged hooks split that cost the same way between the two stages.
+    """
+
+    def __init__(
+        self,
+        variant: str = "english",
+        latency_per_char_ms: float = 0.0,
+        latency_per_batch_ms: float = 0.0,
+        latency_per_step_ms: float = 0.0,
+        supported_languages: Optional[Dict[str, str]] = None
+    ):
+        self.variant = variant
+        self.latency_per_char_ms = latency_per_char_ms
+        self.latency_per_batch_ms = latency_per_batch_ms
+        self.latency_per_step_ms = latency_per_step_ms
+        if variant == "multilingual" and supported_languages:
+            self._supported_languages = dict(supported_languages)
+        else:
+            self._supported_languages = {"en": "English"}
+        self.s3gen = SyntheticS3Gen(SYNTHETIC_SAMPLE_RATE, latency_per_step_ms)
+        # Conditionals seen by the T3 stage, whose prefix counts as cached afterwards
+        self._prefix_cache = set()
+
+    @property
+    def sr(self) -> int:
+        """Sample rate of generated audio"""
+        return SYNTHETIC_SAMPLE_RATE
+
+    def get_supported_languages(self) -> Dict[str, str]:
+        return self._supported_languages.copy()
+
+    def _check_language(self, language_id: Optional[str]):
+        if language_id and language_id.lower() not in self._supported_languages:
+            raise ValueError(
+                f"Unsupported language_id '{language_id}'. "
+                f"Supported languages: {', '.join(self._supported_languages)}"
+            )
+
+    def get_audio_conditionals(self, wav_fpath: Optional[str] = None) -> Tuple[Dict[str, Any], torch.Tensor]:
+        """Derive a voice (base pitch and timbre) from the reference file's content"""
+        if wav_fpath is None:
+            digest = hashlib.sha256(b"default").digest()
+        else:
+            with open(wav_fpath, "rb") as f:
+                digest = hashlib.sha256(f.read()).digest()
+
+        voice_seed = int.from_bytes(digest[:4], "little")
+        # Base pitch between 90 and 250 Hz, roughly the range of adult speaking voices
+        pitch_hz = 90.0 + (voice_seed % 1600) / 10.0
+        s3gen_ref = {
+            "pitch_hz": torch.tensor([pitch_hz], dtype=torch.float32),
+            "harmonics": torch.tensor([1.0, 0.5, 0.25 + (digest[4] / 255) * 0.25], dtype=torch.float32)
+        }
+        generator = torch.Generator().manual_seed(voice_seed)
+        cond_emb = torch.randn(1, 34, 16, generator=generator)
+        return s3gen_ref, cond_emb
+
+    def generate(
+        self,
+        prompts: Union[str, List[str]],
+        audio_prompt_path: Optional[str] = None,
+        language_id: Optional[str] = "en",
+        exaggeration: float = 0.5,
+        temperature: float = 0.8,
+        max_tokens: int = 1000,
+        diffusion_steps: int = 10,
+        **kwargs
+    ) -> List[torch.Tensor]:
+        s3gen_ref, cond_emb = self.get_audio_conditionals(audio_prompt_path)
+        return self.generate_with_conds(
+            prompts=prompts,
+            s3gen_ref=s3gen_ref,
+            cond_emb=cond_emb,
+            language_id=language_id,
+            exaggeration=exaggeration,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            diffusion_steps=diffusion_steps
+        )
+
+    def generate_with_conds(
+        self,
+        prompts: Union[str, List[str]],
+        s3gen_ref: Dict[str, Any],
+        cond_emb: torch.Tensor,
+        language_id: Optional[str] = "en",
+        temperature: float = 0.8,
+        exaggeration: float = 0.5,
+        max_tokens: int = 1000,
+        diffusion_steps: int = 10,
+        **kwargs
+    ) -> List[torch.Tensor]:
+        if isinstance(prompts, str):
+            prompts = [prompts]
+        self._check_language(language_id)
+
+        self._simulate_latency(prompts, diffusion_steps)
+
+        pitch_hz, harmonics = _voice(s3gen_ref)
+        max_seconds = max_tokens / _TOKENS_PER_SECOND
+        return [
+            self._synthesize(prompt, pitch_hz, harmonics, exaggeration, max_seconds, language_id or "en")
+            for prompt in prompts
+        ]
+
+    def generate_speech_tokens(
+        self,
+        prompts: List[str],
+        cond_emb: torch.Tensor,
+        language_id: Optional[str] = "en",
+        exaggeration: float = 0.5,
+        temperature: float = 0.8,
+        max_tokens: int = 1000,
+        seed: Optional[int] = None,
+        **kwargs
+    ) -> List[Tuple[torch.Tensor, int, int]]:
+        """
+        T3 stage: one speech token per 1/25 s of audio, carrying the pitch of the word spoken.
+
+        With ``seed`` every word's pitch is jittered (more at higher ``temperature``)
+        from a generator seeded with it. Returns ``(speech_tokens, prompt_tokens,
+        cached_prompt_tokens)`` per prompt; the conditioning prefix counts as cached
+        once these conditionals have been seen.
+        """
+        self._check_language(language_id)
+        if not prompts:
+            return []
+        _sleep_ms(self.latency_per_batch_ms + self.latency_per_char_ms * max(len(prompt) for prompt in prompts))
+
+        prefix_tokens = cond_emb.shape[-2]
+        prefix_key = hashlib.sha256(cond_emb.detach().cpu().numpy().tobytes()).hexdigest()
+        cached_tokens = prefix_tokens if prefix_key in self._prefix_cache else 0
+        self._prefix_cache.add(prefix_key)
+
+        generator = torch.Generator().manual_seed(seed) if seed is not None else None
+        return [
+            (
+                self._speech_tokens(prompt, exaggeration, temperature, max_tokens, language_id or "en", generator),
+                prefix_tokens + len(prompt) + 2,
+                cached_tokens
+            )
+            for prompt in prompts
+        ]
+
+    def _speech_tokens(
+        self,
+        text: str,
+        exaggeration: float,
+        temperature: float,
+        max_tokens: int,
+        language_id: str,
+        generator: Optional[torch.Generator]
+    ) -> torch.Tensor:
+        """Lay ``text`` out like ``_synthesize`` does, as one run of pitch tokens per word"""
+        words = text.split() or [text]
+        total_seconds = min(max_tokens / _TOKENS_PER_SECOND, max(0.3, len(text) * _SECONDS_PER_CHARACTER))
+        total_tokens = max(1, round(total_seconds * _TOKENS_PER_SECOND))
+
+        weights = [len(word) + 1 for word in words]
+        tokens_per_weight = total_tokens / sum(weights)
+        gap = max(1, round(_WORD_GAP_SECONDS * _TOKENS_PER_SECOND))
+        pitch_range = _pitch_range(exaggeration)
+
+        tokens = []
+        for word, weight in zip(words, weights):
+            length = max(1, round(weight * tokens_per_weight))
+            offset = (_stable_hash(f"{language_id}:{word}") % 1000) / 1000 - 0.5
+            if generator is not None:
+                offset += 0.1 * temperature * (float(torch.rand(1, generator=generator)) - 0.5)
+            pitch_token = _PITCH_TOKEN_BASE + round(pitch_range * offset * 1000)
+            voiced = max(1, length - gap)
+            tokens.extend([pitch_token] * voiced + [_SILENCE_TOKEN] * (length - voiced))
+            if len(tokens) >= total_tokens:
+                break
+
+        return torch.tensor(tokens[:total_tokens], dtype=torch.long)
+
+    def _simulate_latency(self, prompts: List[str], diffusion_steps: int):
+        """Sleep for the time a real batch of ``prompts`` would take"""
+        if not prompts:
+            return
+        _sleep_ms(
+            self.latency_per_batch_ms
+            + self.latency_per_char_ms * max(len(prompt) for prompt in prompts)
+            + self.latency_per_step_ms * diffusion_steps * len(prompts)
+        )
+
+    def _synthesize(
+        self,
+        text: str,
+        pitch_hz: float,
+        harmonics: List[float],
+        exaggeration: float,
+        max_seconds: float,
+        language_id: str
+    ) -> torch.Tensor:
+        """
+        Render ``text`` as one harmonic tone per word separated by short silences.
+
+        Each word's pitch offset comes from a stable hash of the word, and
+        exaggeration widens the pitch range and raises the level, so the output
+        is audibly text-dependent but fully deterministic.
+        """
+        words = text.split() or [text]
+        total_seconds = min(max_seconds, max(0.3, len(text) * _SECONDS_PER_CHARACTER))
+        total_samples = int(total_seconds * self.sr)
+        audio = torch.zeros(1, total_samples)
+
+        weights = [len(word) + 1 for word in words]
+        seconds_per_weight = total_seconds / sum(weights)
+        gap = int(_WORD_GAP_SECONDS * self.sr)
+        pitch_range = _pitch_range(exaggeration)
+        level = min(0.9, 0.25 + 0.2 * exaggeration)
+
+        position = 0
+        for word, weight in zip(words, weights):
+            length = int(weight * seconds_per_weight * self.sr)
+            voiced = max(0, min(length - gap, total_samples - position))
+            if voiced > 0:
+                offset = (_stable_hash(f"{language_id}:{word}") % 1000) / 1000 - 0.5
+                frequency = pitch_hz * (1.0 + pitch_range * offset)
+                audio[0, position:position + voiced] = _render_tone(frequency, voiced, harmonics, level, self.sr)
+            position += length
+            if position >= total_samples:
+                break
+
+        return audio
+
+    def shutdown(self):
+        logger.info(f"Synthetic {self.variant} model shut down")
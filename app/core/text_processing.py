@@ -3,12 +3,14 @@ Text processing utilities for TTS
 """
 
 import gc
-import torch
 import re
-from typing import List, Optional, Tuple
+from typing import TYPE_CHECKING, List, Optional, Tuple
 from app.config import Config
 from app.models.long_text import LongTextChunk
 
+if TYPE_CHECKING:
+    import torch
+
 
 def split_text_into_chunks(text: str, max_length: int = None) -> list:
     """Split text into manageable chunks for TTS processing"""
@@ -350,8 +352,103 @@ def get_streaming_settings(
     return settings
 
 
-def concatenate_audio_chunks(audio_chunks: list, sample_rate: int) -> torch.Tensor:
+# Where a complete chunk ends, per streaming strategy (word and fixed chunks are complete by size)
+_CHUNK_BOUNDARY_PATTERNS = {
+    "sentence": re.compile(r'(?<=[.!?])\s+'),
+    "paragraph": re.compile(r'\n\s*\n'),
+}
+
+# Break points for text that outgrows the chunk size before its boundary arrives, best first
+_OVERFLOW_BREAK_PATTERNS = (
+    re.compile(r'(?<=[.!?])\s+'),
+    re.compile(r'(?:, |; |: | - | — )'),
+    re.compile(r'\s+'),
+)
+
+
+class IncrementalTextSegmenter:
+    """
+    Splits text that arrives in pieces (e.g. LLM tokens) into streaming chunks as soon as they are complete.
+
+    Chunks follow split_text_for_streaming: the same strategies, chunk sizes and
+    packing. Text becomes a chunk once the boundary after it has arrived:
+    - sentence: a sentence end followed by whitespace
+    - paragraph: a blank line
+    - word and fixed: chunk_size characters of whole words or of text
+    Text that outgrows chunk_size before its boundary arrives is broken at the
+    last sentence, clause or word break. ``flush()`` returns whatever is left.
+    """
+
+    def __init__(
+        self,
+        chunk_size: Optional[int] = None,
+        strategy: Optional[str] = None,
+        quality: Optional[str] = None
+    ):
+        settings = get_streaming_settings(chunk_size, strategy, quality)
+        self.chunk_size = settings["chunk_size"]
+        self.strategy = settings["strategy"]
+        self._buffer = ""
+
+    @property
+    def pending(self) -> str:
+        """Text received but not yet returned as a chunk"""
+        return self._buffer
+
+    def push(self, text: str) -> List[str]:
+        """Add text and return the chunks it completes"""
+        self._buffer += text
+        return self._take(final=False)
+
+    def flush(self) -> List[str]:
+        """Return the remaining text as chunks, complete or not"""
+        return self._take(final=True)
+
+    def clear(self):
+        """Discard pending text"""
+        self._buffer = ""
+
+    def _take(self, final: bool) -> List[str]:
+        end = len(self._buffer) if final else self._complete_length()
+        complete, self._buffer = self._buffer[:end], self._buffer[end:]
+        chunks = split_text_for_streaming(complete, self.chunk_size, self.strategy) if complete.strip() else []
+
+        while len(self._buffer) > self.chunk_size:
+            end = self._overflow_break()
+            overflow, self._buffer = self._buffer[:end].strip(), self._buffer[end:]
+            if overflow:
+                chunks.append(overflow)
+        return chunks
+
+    def _complete_length(self) -> int:
+        """Length of the buffer prefix that consists of complete chunks"""
+        pattern = _CHUNK_BOUNDARY_PATTERNS.get(self.strategy)
+        if pattern is not None:
+            boundaries = list(pattern.finditer(self._buffer))
+            return boundaries[-1].end() if boundaries else 0
+
+        if len(self._buffer) < self.chunk_size:
+            return 0
+        if self.strategy == "fixed":
+            return len(self._buffer) - len(self._buffer) % self.chunk_size
+        # word: everything up to the last whitespace (the word after it may still be growing)
+        breaks = list(re.finditer(r'\s+', self._buffer))
+        return breaks[-1].end() if breaks else 0
+
+    def _overflow_break(self) -> int:
+        """Position to break an over-long buffer at, within chunk_size"""
+        window = self._buffer[:self.chunk_size + 1]
+        for pattern in _OVERFLOW_BREAK_PATTERNS:
+            breaks = [match.end() for match in pattern.finditer(window) if match.start() > 0]
+            if breaks:
+                return breaks[-1]
+        return self.chunk_size
+
+
+def concatenate_audio_chunks(audio_chunks: list, sample_rate: int) -> "torch.Tensor":
     """Concatenate multiple audio tensors with proper memory management"""
+    import torch
+    
     if len(audio_chunks) == 1:
         return audio_chunks[0]
     
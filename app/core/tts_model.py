@@ -1,14 +1,36 @@
 """
 TTS model initialization and management using chatterbox-vllm backend
+
+The synthesis engine is pluggable (TTS_BACKEND): the default vLLM backend loads
+Chatterbox, the synthetic backend loads a deterministic CPU stand-in
+(app.core.synthetic_tts) for performance testing without a GPU or weights.
+
+torch and chatterbox-vllm (which pulls in vLLM and transformers) take several
+seconds to import, so they are imported where they're used rather than at
+module level. The server can then bind before the model starts loading.
 """
 
+from __future__ import annotations
+
 import os
 import asyncio
-import torch
+import importlib
+import importlib.metadata
+import inspect
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
 from enum import Enum
-from typing import Optional, Dict, Any
-from chatterbox_vllm.tts import ChatterboxTTS
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional, Dict, Any, List, Set, Tuple, Callable, AsyncGenerator
 from app.config import Config, detect_device
+from app.core.startup_timing import startup_phase, mark_model_ready
+from app.core.readiness import get_readiness_gate
+
+if TYPE_CHECKING:
+    import torch
 
 # Supported languages for multilingual model
 # From chatterbox_vllm.text_utils
@@ -46,6 +68,60 @@ _initialization_error = None
 _initialization_progress = ""
 _is_multilingual = None
 _supported_languages = {}
+_warmup_seconds: Optional[float] = None
+
+# Seeded vocoding: a lock around the vocoder's use of torch's global RNG, and the
+# seed for noise the model draws once while loading
+_vocoder_rng_lock = threading.Lock()
+_MODEL_LOAD_SEED = 0
+
+# Registry of resident models by variant; _model is the active (primary) one
+MODEL_VARIANTS = ("standard", "multilingual")
+_models: Dict[str, Any] = {}
+_model_footprints: Dict[str, int] = {}
+_loading_variants: Set[str] = set()
+_primary_variant: Optional[str] = None
+_registry_lock = asyncio.Lock()
+_secondary_load_task: Optional[asyncio.Task] = None
+
+# In-flight generation calls per model instance (id -> count); unloading waits for zero
+_model_leases: Dict[int, int] = {}
+_lease_lock = threading.Lock()
+
+# Size of the S3 speech token vocabulary; higher ids are not speech tokens
+S3_SPEECH_VOCAB_SIZE = 6561
+
+# chatterbox-vllm releases whose internals (punc_norm, SPEECH_TOKEN_OFFSET and the
+# T3 SamplingParams layout) VLLMBackend.generate_speech_tokens mirrors; other
+# versions fall back to unstaged generation through generate()
+STAGED_CHATTERBOX_VLLM_VERSIONS = ("0.2.1",)
+
+# S3 speech tokens are produced at 25 Hz (40 ms of audio per token)
+S3_TOKENS_PER_SECOND = 25
+
+# Length of the voice conditioning prefix T3 prefills before every prompt
+# (speaker embedding, 32 prompt speech tokens, emotion)
+T3_CONDITIONING_TOKENS = 34
+
+# Dedicated single-worker executors for the two generation stages
+_t3_executor: Optional[ThreadPoolExecutor] = None
+_s3gen_executor: Optional[ThreadPoolExecutor] = None
+_s3gen_cuda_stream = None
+_stage_stats = {
+    "t3": {"calls": 0, "items": 0, "busy_seconds": 0.0, "queued": 0},
+    "s3gen": {"calls": 0, "items": 0, "busy_seconds": 0.0, "queued": 0}
+}
+_prefill_stats = {"prompts": 0, "prompt_tokens": 0, "cached_prompt_tokens": 0}
+
+# Speech tokens generated per warmup prompt; enough to exercise decode and vocoder kernels
+_WARMUP_MAX_TOKENS = 100
+
+_WARMUP_SENTENCE = "The quick brown fox jumps over the lazy dog while the band plays on. "
+
+
+class ModelRegistryError(Exception):
+    """Raised when a model registry operation (load, activate, unload) can't be performed"""
+    pass
 
 
 class InitializationState(Enum):
@@ -59,18 +135,271 @@ class InitializationState(Enum):
 # vLLM handles memory optimization internally through its own mechanisms
 
 
+class TTSBackend(ABC):
+    """
+    A synthesis engine the serving stack can run on.
+
+    Backends load model variants that expose the ChatterboxTTS generation API
+    (``sr``, ``variant``, ``get_supported_languages``, ``get_audio_conditionals``,
+    ``generate``, ``generate_with_conds``); the scheduler, streaming and job
+    processing only use that API, so they run unchanged on any backend.
+    """
+    
+    name = ""
+    label = ""
+    
+    def detect_device(self) -> str:
+        """Device the backend's models run on"""
+        return detect_device()
+    
+    def import_modules(self):
+        """Import the backend's (slow) dependencies ahead of the first load"""
+        pass
+    
+    @abstractmethod
+    def load_variant(self, variant: str, device: str):
+        """Load one model variant ("standard" or "multilingual") synchronously"""
+    
+    def supports_staged_generation(self, model) -> bool:
+        """Check whether ``model`` exposes the T3 (tokens) and S3Gen (vocoder) stages separately"""
+        return False
+    
+    @abstractmethod
+    def generate_speech_tokens(
+        self,
+        model,
+        prompts: List[str],
+        cond_emb: torch.Tensor,
+        language_id: str,
+        exaggeration: float,
+        temperature: float,
+        max_tokens: int,
+        top_p: float,
+        repetition_penalty: float,
+        **sampling_kwargs
+    ) -> List[Tuple[torch.Tensor, int, int]]:
+        """
+        T3 stage of a staged model for a batch of prompts.
+
+        Returns ``(speech_tokens, prompt_tokens, cached_prompt_tokens)`` per prompt,
+        with the tokens on the CPU.
+        """
+    
+    @abstractmethod
+    def clean_speech_tokens(self, speech_tokens: torch.Tensor) -> torch.Tensor:
+        """Strip start/stop markers and out-of-vocabulary ids from a T3 token sequence"""
+
+
+class VLLMBackend(TTSBackend):
+    """Chatterbox TTS served by chatterbox-vllm"""
+    
+    name = "vllm"
+    label = "vLLM"
+    
+    def import_modules(self):
+        configure_compile_caches()
+        importlib.import_module("chatterbox_vllm.tts")
+    
+    def load_variant(self, variant: str, device: str):
+        from chatterbox_vllm.tts import ChatterboxTTS
+        
+        if variant == "multilingual":
+            print(f"Loading Chatterbox vLLM Multilingual TTS model...")
+            loader = ChatterboxTTS.from_pretrained_multilingual
+        else:
+            print(f"Loading standard Chatterbox vLLM TTS model...")
+            loader = ChatterboxTTS.from_pretrained
+        options = {}
+        if Config.VLLM_ENABLE_PREFIX_CACHING:
+            if _accepts_keyword(loader, "enable_prefix_caching"):
+                options["enable_prefix_caching"] = True
+            else:
+                print("⚠️ This chatterbox-vllm version doesn't take enable_prefix_caching; loading without it")
+        model = loader(
+            max_batch_size=Config.VLLM_MAX_BATCH_SIZE,
+            max_model_len=Config.VLLM_MAX_MODEL_LEN,
+            compile=Config.VLLM_COMPILE,
+            s3gen_use_fp16=Config.VLLM_S3GEN_FP16,
+            target_device=device,
+            **options
+        )
+        _reseed_load_time_noise(model)
+        return model
+    
+    def supports_staged_generation(self, model) -> bool:
+        import chatterbox_vllm.tts as chatterbox_tts
+        
+        if not _staged_generation_tested():
+            return False
+        model_hooks = ("t3", "s3gen", "t3_config", "update_exaggeration", "get_supported_languages")
+        library_hooks = ("punc_norm", "SPEECH_TOKEN_OFFSET", "drop_invalid_tokens")
+        return all(hasattr(model, name) for name in model_hooks) and all(
+            hasattr(chatterbox_tts, name) for name in library_hooks
+        )
+    
+    def generate_speech_tokens(
+        self,
+        model,
+        prompts: List[str],
+        cond_emb: torch.Tensor,
+        language_id: str,
+        exaggeration: float,
+        temperature: float,
+        max_tokens: int,
+        top_p: float,
+        repetition_penalty: float,
+        **sampling_kwargs
+    ) -> List[Tuple[torch.Tensor, int, int]]:
+        # Mirrors the first half of ChatterboxTTS.generate_with_conds
+        import torch
+        import chatterbox_vllm.tts as chatterbox_tts
+        from vllm import SamplingParams
+        
+        cond_emb = model.update_exaggeration(cond_emb, exaggeration)
+        texts = ["[START]" + chatterbox_tts.punc_norm(p) + "[STOP]" for p in prompts]
+        if getattr(model, "variant", None) == "multilingual":
+            texts = [f"<{language_id.lower()}>{t}" for t in texts]
+        
+        offset = chatterbox_tts.SPEECH_TOKEN_OFFSET
+        batch_results = model.t3.generate(
+            [{"prompt": text, "multi_modal_data": {"conditionals": [cond_emb]}} for text in texts],
+            sampling_params=SamplingParams(
+                temperature=temperature,
+                stop_token_ids=[model.t3_config.stop_speech_token + offset],
+                max_tokens=min(max_tokens, getattr(model, "max_model_len", max_tokens)),
+                top_p=top_p,
+                repetition_penalty=repetition_penalty,
+                **sampling_kwargs
+            )
+        )
+        return [
+            (
+                torch.tensor([token - offset for token in result.outputs[0].token_ids], dtype=torch.long),
+                len(result.prompt_token_ids or []),
+                getattr(result, "num_cached_tokens", None) or 0
+            )
+            for result in batch_results
+        ]
+    
+    def clean_speech_tokens(self, speech_tokens: torch.Tensor) -> torch.Tensor:
+        import chatterbox_vllm.tts as chatterbox_tts
+        
+        tokens = chatterbox_tts.drop_invalid_tokens(speech_tokens)
+        return tokens[tokens < S3_SPEECH_VOCAB_SIZE]
+
+
+def _accepts_keyword(function: Callable, name: str) -> bool:
+    """Check whether ``function`` takes a keyword argument ``name`` (directly or through **kwargs)"""
+    try:
+        parameters = inspect.signature(function).parameters.values()
+    except (TypeError, ValueError):
+        return False
+    return any(p.name == name or p.kind is inspect.Parameter.VAR_KEYWORD for p in parameters)
+
+
+@lru_cache(maxsize=1)
+def _staged_generation_tested() -> bool:
+    """Check whether the installed chatterbox-vllm is a release the staged T3 path was written against"""
+    try:
+        version = importlib.metadata.version("chatterbox-vllm")
+    except importlib.metadata.PackageNotFoundError:
+        version = None
+    if version in STAGED_CHATTERBOX_VLLM_VERSIONS:
+        return True
+    print(
+        f"⚠️ Staged generation is untested with chatterbox-vllm {version or '(unknown version)'} "
+        f"(tested: {', '.join(STAGED_CHATTERBOX_VLLM_VERSIONS)}); generating without separate T3/S3Gen stages"
+    )
+    return False
+
+
+class SyntheticBackend(TTSBackend):
+    """Deterministic CPU stand-in with simulated latency (see app.core.synthetic_tts)"""
+    
+    name = "synthetic"
+    label = "synthetic"
+    
+    def detect_device(self) -> str:
+        return "cpu"
+    
+    def load_variant(self, variant: str, device: str):
+        from app.core.synthetic_tts import SyntheticTTS
+        
+        print(f"Loading synthetic {variant} TTS model...")
+        return SyntheticTTS(
+            variant="multilingual" if variant == "multilingual" else "english",
+            latency_per_char_ms=Config.SYNTHETIC_LATENCY_PER_CHAR_MS,
+            latency_per_batch_ms=Config.SYNTHETIC_LATENCY_PER_BATCH_MS,
+            latency_per_step_ms=Config.SYNTHETIC_LATENCY_PER_STEP_MS,
+            supported_languages=SUPPORTED_LANGUAGES
+        )
+    
+    def supports_staged_generation(self, model) -> bool:
+        return True
+    
+    def generate_speech_tokens(
+        self,
+        model,
+        prompts: List[str],
+        cond_emb: torch.Tensor,
+        language_id: str,
+        exaggeration: float,
+        temperature: float,
+        max_tokens: int,
+        top_p: float,
+        repetition_penalty: float,
+        **sampling_kwargs
+    ) -> List[Tuple[torch.Tensor, int, int]]:
+        return model.generate_speech_tokens(
+            prompts,
+            cond_emb,
+            language_id=language_id,
+            exaggeration=exaggeration,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            seed=sampling_kwargs.get("seed")
+        )
+    
+    def clean_speech_tokens(self, speech_tokens: torch.Tensor) -> torch.Tensor:
+        return speech_tokens[(speech_tokens >= 0) & (speech_tokens < S3_SPEECH_VOCAB_SIZE)]
+
+
+TTS_BACKENDS: Dict[str, type] = {
+    VLLMBackend.name: VLLMBackend,
+    SyntheticBackend.name: SyntheticBackend,
+}
+
+_backend: Optional[TTSBackend] = None
+
+
+def get_backend() -> TTSBackend:
+    """Get the synthesis backend selected by TTS_BACKEND"""
+    global _backend
+    if _backend is None:
+        if Config.TTS_BACKEND not in TTS_BACKENDS:
+            raise ValueError(f"Unknown TTS_BACKEND '{Config.TTS_BACKEND}'. Available: {', '.join(TTS_BACKENDS)}")
+        _backend = TTS_BACKENDS[Config.TTS_BACKEND]()
+    return _backend
+
+
 async def initialize_model():
-    """Initialize the Chatterbox TTS model with vLLM backend"""
-    global _model, _device, _initialization_state, _initialization_error, _initialization_progress, _is_multilingual, _supported_languages
+    """Initialize the TTS model on the configured backend"""
+    global _device, _initialization_state, _initialization_error, _initialization_progress, _secondary_load_task
     
     try:
         _initialization_state = InitializationState.INITIALIZING.value
         _initialization_progress = "Validating configuration..."
         
         Config.validate()
-        _device = detect_device()
+        backend = get_backend()
+        loop = asyncio.get_event_loop()
+        
+        # detect_device() is the first torch import; keep it off the event loop
+        _initialization_progress = "Importing torch..."
+        with startup_phase("torch_import"):
+            _device = await loop.run_in_executor(None, backend.detect_device)
         
-        print(f"Initializing Chatterbox TTS model with vLLM backend...")
+        print(f"Initializing Chatterbox TTS model with {backend.label} backend...")
         print(f"Device: {_device}")
         print(f"Voice sample: {Config.VOICE_SAMPLE_PATH}")
         print(f"Max batch size: {Config.VLLM_MAX_BATCH_SIZE}")
@@ -84,50 +413,44 @@ async def initialize_model():
         if not os.path.exists(Config.VOICE_SAMPLE_PATH):
             raise FileNotFoundError(f"Voice sample not found: {Config.VOICE_SAMPLE_PATH}")
         
-        # Determine if we should use multilingual model
-        use_multilingual = Config.USE_MULTILINGUAL_MODEL
+        # Determine which model variant is loaded first
+        primary_variant = configured_variant()
         
-        _initialization_progress = "Loading TTS model with vLLM (this may take a while)..."
+        _initialization_progress = f"Loading TTS model with {backend.label} backend (this may take a while)..."
         # Initialize model with run_in_executor for non-blocking
-        loop = asyncio.get_event_loop()
+        with startup_phase("model_imports"):
+            await loop.run_in_executor(None, backend.import_modules)
+        with startup_phase("model_load"):
+            model, footprint = await loop.run_in_executor(None, _load_variant_sync, primary_variant)
+        _register_model(primary_variant, model, footprint, activate=True)
         
-        def load_model():
-            """Load the model synchronously"""
-            if use_multilingual:
-                print(f"Loading Chatterbox vLLM Multilingual TTS model...")
-                return ChatterboxTTS.from_pretrained_multilingual(
-                    max_batch_size=Config.VLLM_MAX_BATCH_SIZE,
-                    max_model_len=Config.VLLM_MAX_MODEL_LEN,
-                    compile=Config.VLLM_COMPILE,
-                    s3gen_use_fp16=Config.VLLM_S3GEN_FP16,
-                    target_device=_device
-                )
-            else:
-                print(f"Loading standard Chatterbox vLLM TTS model...")
-                return ChatterboxTTS.from_pretrained(
-                    max_batch_size=Config.VLLM_MAX_BATCH_SIZE,
-                    max_model_len=Config.VLLM_MAX_MODEL_LEN,
-                    compile=Config.VLLM_COMPILE,
-                    s3gen_use_fp16=Config.VLLM_S3GEN_FP16,
-                    target_device=_device
-                )
+        if Config.PINNED_VOICES:
+            _initialization_progress = "Preparing pinned voices..."
+            with startup_phase("pinned_voices"):
+                await loop.run_in_executor(None, preload_pinned_voices, _model)
         
-        _model = await loop.run_in_executor(None, load_model)
-        
-        # Get supported languages from the model
-        _is_multilingual = use_multilingual
-        _supported_languages = _model.get_supported_languages()
+        if Config.ENABLE_WARMUP:
+            _initialization_progress = "Warming up model..."
+            with startup_phase("warmup"):
+                await loop.run_in_executor(None, warmup_model, _model)
         
         if _is_multilingual:
-            print(f"✓ Multilingual vLLM model initialized with {len(_supported_languages)} languages")
+            print(f"✓ Multilingual {backend.label} model initialized with {len(_supported_languages)} languages")
         else:
-            print(f"✓ Standard vLLM model initialized (English only)")
+            print(f"✓ Standard {backend.label} model initialized (English only)")
         
         _initialization_state = InitializationState.READY.value
         _initialization_progress = "Model ready"
         _initialization_error = None
         print(f"✓ Model initialized successfully on {_device}")
-        print(f"✓ vLLM backend provides ~4x speedup over standard implementation")
+        if backend.name == VLLMBackend.name:
+            print(f"✓ vLLM backend provides ~4x speedup over standard implementation")
+        mark_model_ready()
+        get_readiness_gate().mark_ready()
+        
+        if Config.LOAD_SECONDARY_MODEL:
+            secondary_variant = "standard" if primary_variant == "multilingual" else "multilingual"
+            _secondary_load_task = asyncio.create_task(_load_secondary_model(secondary_variant))
         return _model
         
     except Exception as e:
@@ -135,12 +458,262 @@ async def initialize_model():
         _initialization_error = str(e)
         _initialization_progress = f"Failed: {str(e)}"
         print(f"✗ Failed to initialize model: {e}")
+        get_readiness_gate().mark_failed(str(e))
         raise e
 
 
-def get_model():
-    """Get the current model instance"""
-    return _model
+def get_model(language_id: Optional[str] = None):
+    """
+    Get the model to use for a request.
+
+    Without a language this is the active model. When both variants are resident,
+    English goes to the English-only standard model (if ROUTE_ENGLISH_TO_STANDARD_MODEL)
+    and other languages go to the multilingual model.
+    """
+    if language_id is None or len(_models) < 2:
+        return _model
+    if language_id.lower() == "en":
+        if Config.ROUTE_ENGLISH_TO_STANDARD_MODEL and "standard" in _models:
+            return _models["standard"]
+        return _model
+    return _models.get("multilingual", _model)
+
+
+def model_variant(model) -> str:
+    """Registry variant name of a loaded model"""
+    return "multilingual" if getattr(model, "variant", None) == "multilingual" else "standard"
+
+
+def configured_variant(language_id: Optional[str] = None) -> str:
+    """
+    Variant get_model() will route a request to once initialization finishes,
+    derived from configuration alone (for use while no model is loaded yet)
+    """
+    primary_variant = "multilingual" if Config.USE_MULTILINGUAL_MODEL else "standard"
+    if language_id is None or not Config.LOAD_SECONDARY_MODEL:
+        return primary_variant
+    if language_id.lower() == "en":
+        return "standard" if Config.ROUTE_ENGLISH_TO_STANDARD_MODEL else primary_variant
+    return "multilingual"
+
+
+def _gpu_free_bytes() -> Optional[int]:
+    """Free memory on the current CUDA device, or None when not running on CUDA"""
+    import torch
+    
+    if _device != "cuda" or not torch.cuda.is_available():
+        return None
+    return torch.cuda.mem_get_info()[0]
+
+
+def _load_variant_sync(variant: str):
+    """Load one model variant synchronously; returns the model and the GPU memory it took"""
+    free_before = _gpu_free_bytes()
+    model = get_backend().load_variant(variant, _device)
+    free_after = _gpu_free_bytes()
+    footprint = max(0, free_before - free_after) if free_before is not None and free_after is not None else 0
+    return model, footprint
+
+
+def _register_model(variant: str, model, footprint: int, activate: bool = False):
+    """Add a loaded model to the registry, optionally making it the active model"""
+    global _model, _primary_variant
+    _models[variant] = model
+    _model_footprints[variant] = footprint
+    if activate or _model is None:
+        # A single reference swap: new batches pick up the new model, in-flight ones keep theirs
+        _model = model
+        _primary_variant = variant
+    _refresh_language_support()
+
+
+def _refresh_language_support():
+    """Recompute the languages served by the resident models"""
+    global _is_multilingual, _supported_languages
+    languages = {}
+    for model in _models.values():
+        languages.update(model.get_supported_languages())
+    _is_multilingual = "multilingual" in _models
+    _supported_languages = languages
+
+
+def _check_memory_budget(variant: str, allow_over_budget: bool = False):
+    """Raise ModelRegistryError if loading ``variant`` next to the resident models wouldn't fit"""
+    # Both variants share an architecture, so a resident model's footprint is the best estimate
+    estimate = max(_model_footprints.values(), default=0)
+    resident = sum(_model_footprints.values())
+    budget = Config.MODEL_MEMORY_BUDGET_MB * 1024 * 1024
+    
+    if budget and not allow_over_budget and resident + estimate > budget:
+        raise ModelRegistryError(
+            f"Loading the {variant} model (~{estimate / 1024**2:.0f}MB) would exceed "
+            f"MODEL_MEMORY_BUDGET_MB ({resident / 1024**2:.0f}MB already resident)"
+        )
+    free = _gpu_free_bytes()
+    if free is not None and estimate and free < estimate:
+        raise ModelRegistryError(
+            f"Not enough free GPU memory to load the {variant} model "
+            f"(~{estimate / 1024**2:.0f}MB needed, {free / 1024**2:.0f}MB free)"
+        )
+
+
+def check_can_load_variant(variant: str, allow_over_budget: bool = False):
+    """Raise the error load_model_variant() would raise before it starts loading, if any"""
+    if variant not in MODEL_VARIANTS:
+        raise ValueError(f"Unknown model variant '{variant}'. Available: {', '.join(MODEL_VARIANTS)}")
+    if not is_ready():
+        raise ModelRegistryError("The model is still initializing")
+    if variant in _loading_variants:
+        raise ModelRegistryError(f"The {variant} model is already loading")
+    if variant not in _models:
+        _check_memory_budget(variant, allow_over_budget)
+
+
+async def load_model_variant(variant: str, allow_over_budget: bool = False):
+    """
+    Load another model variant in the background and keep it resident next to the active one.
+
+    Requests keep being served by the resident models while it loads. Returns the
+    model (immediately if already resident). Raises ModelRegistryError if it's
+    already loading or doesn't fit the memory budget.
+    """
+    async with _registry_lock:
+        check_can_load_variant(variant, allow_over_budget)
+        if variant in _models:
+            return _models[variant]
+        _loading_variants.add(variant)
+    
+    loop = asyncio.get_running_loop()
+    try:
+        model, footprint = await loop.run_in_executor(None, _load_variant_sync, variant)
+        if Config.PINNED_VOICES:
+            await loop.run_in_executor(None, preload_pinned_voices, model)
+        if Config.ENABLE_WARMUP:
+            await loop.run_in_executor(None, warmup_model, model)
+        async with _registry_lock:
+            _register_model(variant, model, footprint)
+        print(f"✓ {variant.capitalize()} model loaded ({footprint / 1024**2:.0f}MB), resident models: {', '.join(_models)}")
+        return model
+    finally:
+        _loading_variants.discard(variant)
+
+
+async def _load_secondary_model(variant: str):
+    """Startup task that loads the second model variant once the first is serving"""
+    try:
+        await load_model_variant(variant)
+    except Exception as e:
+        print(f"⚠️ Not loading the {variant} model: {e}")
+
+
+async def activate_model_variant(variant: str):
+    """
+    Make ``variant`` the active model, loading it first if it isn't resident.
+
+    The swap is a single reference change: requests already running finish on the
+    model they started with. If the memory budget can't hold both models, the
+    previously active model is unloaded once its in-flight work has drained.
+    """
+    global _model, _primary_variant
+    
+    if variant == _primary_variant:
+        return
+    if variant not in _models:
+        await load_model_variant(variant, allow_over_budget=True)
+    
+    async with _registry_lock:
+        previous = _primary_variant
+        _model = _models[variant]
+        _primary_variant = variant
+    print(f"✓ Active model switched from {previous} to {variant}")
+    
+    await _enforce_memory_budget()
+
+
+async def _enforce_memory_budget():
+    """Unload inactive models while the resident models exceed MODEL_MEMORY_BUDGET_MB"""
+    budget = Config.MODEL_MEMORY_BUDGET_MB * 1024 * 1024
+    if not budget:
+        return
+    for variant in [v for v in _models if v != _primary_variant]:
+        if sum(_model_footprints.values()) <= budget:
+            break
+        print(f"Unloading the {variant} model to stay within MODEL_MEMORY_BUDGET_MB")
+        await unload_model_variant(variant)
+
+
+async def unload_model_variant(variant: str):
+    """
+    Remove an inactive model from the registry and free its memory.
+
+    New requests stop being routed to it immediately; its memory is released
+    once generation calls already running on it have finished.
+    """
+    async with _registry_lock:
+        if variant == _primary_variant:
+            raise ModelRegistryError(f"The {variant} model is active; activate another model before unloading it")
+        model = _models.pop(variant, None)
+        if model is None:
+            raise ModelRegistryError(f"The {variant} model is not loaded")
+        _model_footprints.pop(variant, None)
+        _refresh_language_support()
+    
+    # In-flight generation calls hold a lease on the model
+    while _lease_count(model) > 0:
+        await asyncio.sleep(0.1)
+    
+    from app.core.voice_conditioning import get_conditioning_cache
+    get_conditioning_cache().invalidate_variant(variant)
+    await asyncio.get_running_loop().run_in_executor(None, _shutdown_model, model)
+    print(f"✓ {variant.capitalize()} model unloaded")
+
+
+def _shutdown_model(model):
+    """Release a model's GPU memory"""
+    from app.core.memory import cleanup_memory
+    
+    if hasattr(model, "shutdown"):
+        model.shutdown()
+    cleanup_memory(force_cuda_clear=True)
+
+
+@contextmanager
+def model_lease(model):
+    """Mark ``model`` as in use for the duration of a generation call"""
+    key = id(model)
+    with _lease_lock:
+        _model_leases[key] = _model_leases.get(key, 0) + 1
+    try:
+        yield model
+    finally:
+        with _lease_lock:
+            _model_leases[key] -= 1
+            if not _model_leases[key]:
+                del _model_leases[key]
+
+
+def _lease_count(model) -> int:
+    with _lease_lock:
+        return _model_leases.get(id(model), 0)
+
+
+def get_loaded_models() -> Dict[str, Any]:
+    """Describe the model registry: resident and loading variants, footprints and routing"""
+    return {
+        "active": _primary_variant,
+        "resident": {
+            variant: {
+                "active": variant == _primary_variant,
+                "languages": len(model.get_supported_languages()),
+                "footprint_mb": round(_model_footprints.get(variant, 0) / 1024 / 1024, 1),
+                "in_flight_calls": _lease_count(model)
+            }
+            for variant, model in _models.items()
+        },
+        "loading": sorted(_loading_variants),
+        "memory_budget_mb": Config.MODEL_MEMORY_BUDGET_MB,
+        "route_english_to_standard": Config.ROUTE_ENGLISH_TO_STANDARD_MODEL
+    }
 
 
 def get_device():
@@ -191,7 +764,7 @@ def supports_language(language_id: str):
 def get_model_info() -> Dict[str, Any]:
     """Get comprehensive model information"""
     return {
-        "backend": "vLLM",
+        "backend": get_backend().label,
         "model_type": "multilingual" if _is_multilingual else "standard",
         "is_multilingual": _is_multilingual,
         "supported_languages": _supported_languages,
@@ -202,5 +775,413 @@ def get_model_info() -> Dict[str, Any]:
         "vllm_max_batch_size": Config.VLLM_MAX_BATCH_SIZE,
         "vllm_max_model_len": Config.VLLM_MAX_MODEL_LEN,
         "vllm_compile": Config.VLLM_COMPILE,
-        "vllm_diffusion_steps": Config.VLLM_DIFFUSION_STEPS
-    }
\ No newline at end of file
+        "vllm_diffusion_steps": Config.VLLM_DIFFUSION_STEPS,
+        "warmup_enabled": Config.ENABLE_WARMUP,
+        "warmup_seconds": _warmup_seconds,
+        "compile_cache_dir": os.path.join(Config.MODEL_CACHE_DIR, "compile_cache"),
+        "models": get_loaded_models()
+    }
+
+
+def configure_compile_caches():
+    """
+    Point vLLM, TorchInductor and Triton compile caches at MODEL_CACHE_DIR.
+
+    Compiled graphs and autotuning results then survive restarts (and container
+    rebuilds when MODEL_CACHE_DIR is a volume). Explicitly set variables win.
+    """
+    cache_root = os.path.join(Config.MODEL_CACHE_DIR, "compile_cache")
+    for env_var, subdir in (
+        ("VLLM_CACHE_ROOT", "vllm"),
+        ("TORCHINDUCTOR_CACHE_DIR", "inductor"),
+        ("TRITON_CACHE_DIR", "triton"),
+    ):
+        path = os.environ.setdefault(env_var, os.path.join(cache_root, subdir))
+        os.makedirs(path, exist_ok=True)
+    print(f"Compile caches: {cache_root}")
+
+
+def _warmup_text(length: int) -> str:
+    """Representative prompt text of roughly ``length`` characters"""
+    text = (_WARMUP_SENTENCE * (length // len(_WARMUP_SENTENCE) + 1))[:length]
+    return text.rsplit(" ", 1)[0] if " " in text else text
+
+
+def warmup_model(model):
+    """
+    Run representative generations before the model is reported READY.
+
+    Prepares the default voice's conditioning, then generates each configured
+    batch size and prompt length through the same path requests use, so CUDA
+    graph capture, compilation and allocator growth happen here instead of in
+    the first requests. Failures are logged and don't block startup.
+    """
+    global _warmup_seconds, _initialization_progress
+    import torch
+    from app.core.voice_conditioning import get_conditioning_cache
+
+    started = time.monotonic()
+    language_id = "en"
+    batch_sizes = Config.WARMUP_BATCH_SIZES or sorted({1, Config.VLLM_MAX_BATCH_SIZE})
+    text_lengths = Config.WARMUP_TEXT_LENGTHS or sorted({50, Config.MAX_CHUNK_LENGTH})
+
+    try:
+        if Config.ENABLE_VOICE_CONDITIONING_CACHE and hasattr(model, "get_audio_conditionals"):
+            s3gen_ref, cond_emb = get_conditioning_cache().get_or_prepare(
+                Config.VOICE_SAMPLE_PATH, model.get_audio_conditionals, device=_device, variant=model_variant(model)
+            )
+        elif hasattr(model, "get_audio_conditionals"):
+            s3gen_ref, cond_emb = model.get_audio_conditionals(Config.VOICE_SAMPLE_PATH)
+        else:
+            s3gen_ref, cond_emb = None, None
+
+        for batch_size in batch_sizes:
+            for length in text_lengths:
+                _initialization_progress = f"Warming up model (batch {batch_size}, {length} chars)..."
+                prompts = [_warmup_text(length)] * batch_size
+                step_started = time.monotonic()
+
+                with torch.no_grad():
+                    if cond_emb is not None and supports_staged_generation(model):
+                        speech_tokens = generate_speech_tokens(
+                            prompts, cond_emb, language_id=language_id, max_tokens=_WARMUP_MAX_TOKENS, model=model
+                        )
+                        for tokens in speech_tokens:
+                            vocode_speech_tokens(tokens, s3gen_ref, Config.VLLM_DIFFUSION_STEPS, model=model)
+                    else:
+                        model.generate(
+                            prompts=prompts,
+                            audio_prompt_path=Config.VOICE_SAMPLE_PATH,
+                            language_id=language_id,
+                            diffusion_steps=Config.VLLM_DIFFUSION_STEPS
+                        )
+
+                print(f"  Warmup batch {batch_size} x {length} chars: {time.monotonic() - step_started:.2f}s")
+
+        if torch.cuda.is_available():
+            torch.cuda.synchronize()
+    except Exception as e:
+        print(f"⚠️ Warmup failed, continuing without it: {e}")
+    finally:
+        # Warmup prompts shouldn't count towards request statistics
+        for key in _prefill_stats:
+            _prefill_stats[key] = 0
+        elapsed = time.monotonic() - started
+        if model is _model:
+            _warmup_seconds = elapsed
+        print(f"✓ Warmup completed in {elapsed:.1f}s")
+
+
+def preload_pinned_voices(model) -> List[str]:
+    """
+    Prepare and pin the conditioning of every voice in PINNED_VOICES.
+
+    Pinned voices stay in the GPU tier of the conditioning cache, so their
+    conditioning prefix is built once at startup and never rebuilt. Returns the
+    names of the voices that were pinned.
+    """
+    from app.core.voice_conditioning import get_conditioning_cache
+    from app.core.voice_library import get_voice_library
+
+    if not Config.ENABLE_VOICE_CONDITIONING_CACHE or not hasattr(model, "get_audio_conditionals"):
+        print("⚠️ PINNED_VOICES requires the voice conditioning cache; skipping")
+        return []
+
+    cache = get_conditioning_cache()
+    voice_lib = get_voice_library()
+    pinned = []
+    for voice_name in Config.PINNED_VOICES:
+        voice_path = Config.VOICE_SAMPLE_PATH if voice_name == "default" else voice_lib.get_voice_path(voice_name)
+        if not voice_path or not os.path.exists(voice_path):
+            print(f"⚠️ Pinned voice '{voice_name}' not found in voice library")
+            continue
+        try:
+            cache.get_or_prepare(voice_path, model.get_audio_conditionals, device=_device, variant=model_variant(model))
+            cache.pin(cache.get_content_hash(voice_path))
+            pinned.append(voice_name)
+        except Exception as e:
+            print(f"⚠️ Failed to pin voice '{voice_name}': {e}")
+
+    if pinned:
+        print(f"✓ Pinned voice conditioning for: {', '.join(pinned)}")
+    return pinned
+
+
+def supports_staged_generation(model=None) -> bool:
+    """Check whether the model exposes the T3 (tokens) and S3Gen (vocoder) stages separately"""
+    model = model if model is not None else _model
+    if model is None:
+        return False
+    return get_backend().supports_staged_generation(model)
+
+
+def generate_speech_tokens(
+    prompts: List[str],
+    cond_emb: torch.Tensor,
+    language_id: str = "en",
+    exaggeration: float = 0.5,
+    temperature: float = 0.8,
+    max_tokens: int = 1000,
+    top_p: float = 1.0,
+    repetition_penalty: float = 2.0,
+    model=None,
+    **sampling_kwargs
+) -> List[torch.Tensor]:
+    """
+    T3 stage: generate S3 speech tokens for a batch of prompts.
+
+    Runs the backend's token generation so the vocoder stage can run separately.
+    Returns one CPU token tensor per prompt. Runs on ``model`` (default: the
+    active model).
+    """
+    import torch
+
+    model = model if model is not None else _model
+    if model is None:
+        raise RuntimeError("Model not loaded")
+
+    if language_id and language_id.lower() not in model.get_supported_languages():
+        supported_langs = ", ".join(model.get_supported_languages().keys())
+        raise ValueError(f"Unsupported language_id '{language_id}'. Supported languages: {supported_langs}")
+
+    with torch.inference_mode(), model_lease(model):
+        results = get_backend().generate_speech_tokens(
+            model,
+            prompts,
+            cond_emb,
+            language_id,
+            exaggeration,
+            temperature,
+            max_tokens,
+            top_p,
+            repetition_penalty,
+            **sampling_kwargs
+        )
+
+    for _, prompt_tokens, cached_prompt_tokens in results:
+        _prefill_stats["prompts"] += 1
+        _prefill_stats["prompt_tokens"] += prompt_tokens
+        _prefill_stats["cached_prompt_tokens"] += cached_prompt_tokens
+
+    return [speech_tokens for speech_tokens, _, _ in results]
+
+
+def clean_speech_tokens(speech_tokens: torch.Tensor) -> torch.Tensor:
+    """Strip start/stop markers and out-of-vocabulary ids from a T3 token sequence"""
+    return get_backend().clean_speech_tokens(speech_tokens)
+
+
+@contextmanager
+def vocoder_rng(seed: Optional[int] = None):
+    """
+    Serialize use of torch's global RNG by the vocoder, seeding it when ``seed`` is given.
+
+    S3Gen draws its source-filter noise from the global RNG, so a seeded call runs
+    under a forked RNG state seeded on CPU and the current CUDA device; the caller's
+    RNG state is restored afterwards. The lock keeps unseeded vocoding on other threads
+    from drawing in between; it covers only the vocoder call, not token generation.
+    """
+    import torch
+
+    with _vocoder_rng_lock:
+        if seed is None:
+            yield
+            return
+        devices = [torch.cuda.current_device()] if _device == "cuda" and torch.cuda.is_available() else []
+        with torch.random.fork_rng(devices=devices):
+            torch.manual_seed(seed)
+            yield
+
+
+def _reseed_load_time_noise(model):
+    """
+    Redraw the noise S3Gen's flow decoder samples once at construction from a fixed seed.
+
+    The buffer is drawn from the global RNG while the model loads, so without this
+    seeded requests would give different audio after every restart.
+    """
+    import torch
+
+    decoder = getattr(getattr(getattr(model, "s3gen", None), "flow", None), "decoder", None)
+    noise = getattr(decoder, "rand_noise", None)
+    if not isinstance(noise, torch.Tensor):
+        return
+    generator = torch.Generator().manual_seed(_MODEL_LOAD_SEED)
+    with torch.no_grad():
+        noise.copy_(torch.randn(noise.shape, generator=generator).to(noise))
+
+
+def vocode_speech_tokens(
+    speech_tokens: torch.Tensor,
+    s3gen_ref: Dict[str, Any],
+    diffusion_steps: int,
+    no_trim: bool = False,
+    model=None,
+    seed: Optional[int] = None
+) -> torch.Tensor:
+    """
+    S3Gen stage: turn one prompt's speech tokens into a waveform.
+
+    On CUDA this runs on its own stream so it can overlap with T3 token generation.
+    ``no_trim`` skips the fade-in S3Gen applies to the start of an utterance, for
+    windows that continue earlier audio. ``model`` should be the model that
+    prepared ``s3gen_ref`` (default: the active model). With ``seed`` the
+    vocoder's noise is drawn from a seeded RNG, so the waveform is reproducible.
+    """
+    global _s3gen_cuda_stream
+    import torch
+
+    model = model if model is not None else _model
+    if model is None:
+        raise RuntimeError("Model not loaded")
+
+    stream_context = nullcontext()
+    if _device == "cuda" and torch.cuda.is_available():
+        if _s3gen_cuda_stream is None:
+            _s3gen_cuda_stream = torch.cuda.Stream()
+        stream_context = torch.cuda.stream(_s3gen_cuda_stream)
+
+    with torch.inference_mode(), stream_context, model_lease(model), vocoder_rng(seed):
+        tokens = clean_speech_tokens(speech_tokens.to(_device))
+        wav, _ = model.s3gen.inference(
+            speech_tokens=tokens,
+            ref_dict=s3gen_ref,
+            n_timesteps=diffusion_steps,
+            no_trim=no_trim
+        )
+        return wav.cpu()
+
+
+async def vocode_speech_tokens_incrementally(
+    speech_tokens: torch.Tensor,
+    s3gen_ref: Dict[str, Any],
+    diffusion_steps: int,
+    window_tokens: int,
+    overlap_tokens: int,
+    model=None,
+    seed: Optional[int] = None
+) -> AsyncGenerator[torch.Tensor, None]:
+    """
+    Vocode a token sequence in fixed windows, yielding audio as each window is done.
+
+    Each window is vocoded with ``overlap_tokens`` of context on both sides. The
+    audio of the last ``2 * overlap_tokens`` tokens of a window is held back and
+    cross-faded (overlap-add) with the start of the next window, so boundaries
+    stay smooth. Every window is a separate S3Gen stage call, letting other work
+    interleave between them. Every window is vocoded with ``seed``.
+    """
+    import torch
+    
+    tokens = clean_speech_tokens(speech_tokens.cpu())
+    total = tokens.shape[-1]
+
+    if total <= window_tokens + overlap_tokens:
+        yield await run_in_s3gen_stage(vocode_speech_tokens, 1, tokens, s3gen_ref, diffusion_steps, False, model, seed)
+        return
+
+    tail = None
+    for start in range(0, total, window_tokens):
+        end = min(total, start + window_tokens)
+        span_start = max(0, start - overlap_tokens)
+        span_end = min(total, end + overlap_tokens)
+
+        wav = await run_in_s3gen_stage(
+            vocode_speech_tokens, 1, tokens[span_start:span_end], s3gen_ref, diffusion_steps, start > 0, model, seed
+        )
+        samples_per_token = wav.shape[-1] / (span_end - span_start)
+
+        pieces = []
+        body_start = 0
+        if tail is not None:
+            overlap = min(tail.shape[-1], wav.shape[-1])
+            ramp = torch.linspace(0.0, 1.0, overlap)
+            pieces.append(tail[..., :overlap] * (1.0 - ramp) + wav[..., :overlap] * ramp)
+            body_start = overlap
+
+        if end >= total:
+            pieces.append(wav[..., body_start:])
+            tail = None
+        else:
+            hold_from = max(body_start, round((end - overlap_tokens - span_start) * samples_per_token))
+            pieces.append(wav[..., body_start:hold_from])
+            tail = wav[..., hold_from:]
+
+        yield torch.cat(pieces, dim=-1)
+
+
+def _get_stage_executor(stage: str) -> ThreadPoolExecutor:
+    """Get the single-worker executor for a generation stage, creating it if needed"""
+    global _t3_executor, _s3gen_executor
+    if stage == "t3":
+        if _t3_executor is None:
+            _t3_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tts-t3")
+        return _t3_executor
+    if _s3gen_executor is None:
+        _s3gen_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tts-s3gen")
+    return _s3gen_executor
+
+
+async def _run_in_stage(stage: str, func: Callable, items: int, *args):
+    """Run ``func`` on a stage's worker, recording queue depth and busy time"""
+    stats = _stage_stats[stage]
+
+    def timed():
+        started = time.monotonic()
+        try:
+            return func(*args)
+        finally:
+            stats["busy_seconds"] += time.monotonic() - started
+
+    loop = asyncio.get_running_loop()
+    stats["queued"] += items
+    try:
+        result = await loop.run_in_executor(_get_stage_executor(stage), timed)
+    finally:
+        stats["queued"] -= items
+    stats["calls"] += 1
+    stats["items"] += items
+    return result
+
+
+async def run_in_t3_stage(func: Callable, items: int, *args):
+    """Run a token generation call on the T3 stage worker"""
+    return await _run_in_stage("t3", func, items, *args)
+
+
+async def run_in_s3gen_stage(func: Callable, items: int, *args):
+    """Run a vocoding call on the S3Gen stage worker"""
+    return await _run_in_stage("s3gen", func, items, *args)
+
+
+def shutdown_stage_executors():
+    """Stop the stage workers (called during app shutdown)"""
+    global _t3_executor, _s3gen_executor
+    for executor in (_t3_executor, _s3gen_executor):
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+    _t3_executor = None
+    _s3gen_executor = None
+
+
+def get_stage_stats() -> Dict[str, Any]:
+    """Get per-stage statistics for the staged T3/S3Gen pipeline"""
+    return {
+        "enabled": Config.ENABLE_STAGED_PIPELINE,
+        "supported": supports_staged_generation(),
+        "stages": {name: dict(stats) for name, stats in _stage_stats.items()},
+        "prefill": get_prefill_stats()
+    }
+
+
+def get_prefill_stats() -> Dict[str, Any]:
+    """
+    T3 prefill accounting for staged generation.
+
+    ``conditioning_prefix_tokens`` is the voice prefix share of the prefilled
+    tokens; ``cached_prompt_tokens`` is what vLLM's prefix cache actually served.
+    """
+    stats = dict(_prefill_stats)
+    stats["prefix_caching_enabled"] = Config.VLLM_ENABLE_PREFIX_CACHING
+    stats["conditioning_prefix_tokens"] = stats["prompts"] * T3_CONDITIONING_TOKENS
+    stats["prefix_cache_hit_rate"] = (stats["cached_prompt_tokens"] / max(1, stats["prompt_tokens"])) * 100
+    return stats
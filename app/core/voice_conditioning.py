@@ -0,0 +1,290 @@
+"""
+Content-hash keyed cache of prepared voice conditioning
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+from app.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of path -> content hash entries remembered for non-library files
+_PATH_HASH_MEMO_SIZE = 256
+
+
+def _tensor_nbytes(obj: Any) -> int:
+    """Total size in bytes of all tensors contained in a (nested) conditioning object"""
+    import torch
+    
+    if isinstance(obj, torch.Tensor):
+        return obj.element_size() * obj.nelement()
+    if isinstance(obj, dict):
+        return sum(_tensor_nbytes(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return sum(_tensor_nbytes(v) for v in obj)
+    return 0
+
+
+def _move_to_device(obj: Any, device: str) -> Any:
+    """Move all tensors contained in a (nested) conditioning object to a device"""
+    import torch
+    
+    if isinstance(obj, torch.Tensor):
+        return obj.to(device)
+    if isinstance(obj, dict):
+        return {k: _move_to_device(v, device) for k, v in obj.items()}
+    if isinstance(obj, tuple):
+        return tuple(_move_to_device(v, device) for v in obj)
+    if isinstance(obj, list):
+        return [_move_to_device(v, device) for v in obj]
+    return obj
+
+
+def _entry_key(content_hash: str, variant: Optional[str]) -> str:
+    """Cache key for a voice prepared by a given model variant"""
+    return f"{content_hash}:{variant}" if variant else content_hash
+
+
+def _base_hash(key: str) -> str:
+    """Content hash part of a cache key"""
+    return key.split(":", 1)[0]
+
+
+class VoiceConditioningCache:
+    """
+    Two-tier LRU cache of prepared voice conditioning (speaker embedding plus
+    prompt tokens/features), keyed by the reference clip's content hash and the
+    model variant that prepared it (each variant has its own conditioning encoder).
+
+    Entries live in the GPU tier while hot. When the GPU byte budget is exceeded
+    the least recently used entries are demoted to the CPU tier, and entries that
+    overflow the CPU budget are dropped. Pinned entries (hot voices) are never
+    demoted or evicted.
+    """
+
+    def __init__(self, gpu_budget_mb: Optional[int] = None, cpu_budget_mb: Optional[int] = None):
+        gpu_budget_mb = gpu_budget_mb if gpu_budget_mb is not None else Config.VOICE_CONDITIONING_GPU_CACHE_MB
+        cpu_budget_mb = cpu_budget_mb if cpu_budget_mb is not None else Config.VOICE_CONDITIONING_CPU_CACHE_MB
+        self.gpu_budget_bytes = gpu_budget_mb * 1024 * 1024
+        self.cpu_budget_bytes = cpu_budget_mb * 1024 * 1024
+
+        self._lock = threading.RLock()
+        self._gpu: "OrderedDict[str, Tuple[Any, int]]" = OrderedDict()
+        self._cpu: "OrderedDict[str, Tuple[Any, int]]" = OrderedDict()
+        self._gpu_bytes = 0
+        self._cpu_bytes = 0
+        self._path_hashes: "OrderedDict[Tuple[str, float, int], str]" = OrderedDict()
+        self._pinned: Set[str] = set()
+
+        # Statistics
+        self._gpu_hits = 0
+        self._cpu_hits = 0
+        self._misses = 0
+        self._demotions = 0
+        self._evictions = 0
+        self._invalidations = 0
+        self._pinned_hits = 0
+
+    def get_content_hash(self, voice_path: str) -> str:
+        """
+        Get the content hash for a voice file.
+
+        Library voices reuse the ``file_hash`` recorded by the voice library;
+        other files (default sample, uploads) are hashed once per (path, mtime, size).
+        """
+        from app.core.voice_library import get_voice_library
+
+        library_hash = get_voice_library().get_hash_for_path(voice_path)
+        if library_hash:
+            return library_hash
+
+        stat = os.stat(voice_path)
+        memo_key = (os.path.abspath(voice_path), stat.st_mtime, stat.st_size)
+
+        with self._lock:
+            if memo_key in self._path_hashes:
+                self._path_hashes.move_to_end(memo_key)
+                return self._path_hashes[memo_key]
+
+        hash_md5 = hashlib.md5()
+        with open(voice_path, "rb") as f:
+            for chunk in iter(lambda: f.read(4096), b""):
+                hash_md5.update(chunk)
+        content_hash = hash_md5.hexdigest()
+
+        with self._lock:
+            self._path_hashes[memo_key] = content_hash
+            while len(self._path_hashes) > _PATH_HASH_MEMO_SIZE:
+                self._path_hashes.popitem(last=False)
+
+        return content_hash
+
+    def get_or_prepare(
+        self,
+        voice_path: str,
+        prepare: Callable[[str], Any],
+        device: Optional[str] = None,
+        variant: Optional[str] = None
+    ) -> Any:
+        """
+        Return cached conditioning for ``voice_path``, preparing it on a miss.
+
+        Args:
+            voice_path: Path to the reference clip
+            prepare: Function that builds the conditioning from a file path
+            device: Device the conditioning must be on when returned
+            variant: Model variant ``prepare`` belongs to, when several are loaded
+        """
+        key = _entry_key(self.get_content_hash(voice_path), variant)
+
+        with self._lock:
+            if key in self._gpu:
+                self._gpu.move_to_end(key)
+                self._gpu_hits += 1
+                if _base_hash(key) in self._pinned:
+                    self._pinned_hits += 1
+                return self._gpu[key][0]
+
+            if key in self._cpu:
+                conds, nbytes = self._cpu.pop(key)
+                self._cpu_bytes -= nbytes
+                self._cpu_hits += 1
+                conds = _move_to_device(conds, device) if device else conds
+                self._insert_gpu(key, conds, nbytes)
+                return conds
+
+            self._misses += 1
+
+        # Prepare outside the lock; a concurrent miss for the same voice just does the work twice
+        conds = prepare(voice_path)
+        nbytes = _tensor_nbytes(conds)
+
+        with self._lock:
+            if key not in self._gpu:
+                self._insert_gpu(key, conds, nbytes)
+
+        return conds
+
+    def _insert_gpu(self, key: str, conds: Any, nbytes: int):
+        """Insert into the GPU tier, demoting least recently used entries to CPU"""
+        self._gpu[key] = (conds, nbytes)
+        self._gpu_bytes += nbytes
+
+        while self._gpu_bytes > self.gpu_budget_bytes and len(self._gpu) > 1:
+            old_key = next((k for k in self._gpu if _base_hash(k) not in self._pinned and k != key), None)
+            if old_key is None:
+                # Only pinned voices (and the new entry) left; allow going over budget
+                break
+            old_conds, old_bytes = self._gpu.pop(old_key)
+            self._gpu_bytes -= old_bytes
+            self._demotions += 1
+            self._insert_cpu(old_key, _move_to_device(old_conds, "cpu"), old_bytes)
+
+    def _insert_cpu(self, key: str, conds: Any, nbytes: int):
+        """Insert into the CPU tier, evicting least recently used entries"""
+        self._cpu[key] = (conds, nbytes)
+        self._cpu_bytes += nbytes
+
+        while self._cpu_bytes > self.cpu_budget_bytes and self._cpu:
+            _, (_, old_bytes) = self._cpu.popitem(last=False)
+            self._cpu_bytes -= old_bytes
+            self._evictions += 1
+
+    def pin(self, content_hash: str) -> bool:
+        """Keep a cached voice (for every model variant) in the GPU tier permanently; returns False if it isn't cached"""
+        with self._lock:
+            if not any(_base_hash(key) == content_hash for key in self._gpu):
+                return False
+            self._pinned.add(content_hash)
+            return True
+
+    def unpin(self, content_hash: str):
+        """Let a pinned voice be demoted and evicted again"""
+        with self._lock:
+            self._pinned.discard(content_hash)
+
+    def invalidate(self, content_hash: str) -> bool:
+        """Drop all cached conditioning for a content hash"""
+        removed = False
+        with self._lock:
+            self._pinned.discard(content_hash)
+            for key in [k for k in self._gpu if _base_hash(k) == content_hash]:
+                _, nbytes = self._gpu.pop(key)
+                self._gpu_bytes -= nbytes
+                removed = True
+            for key in [k for k in self._cpu if _base_hash(k) == content_hash]:
+                _, nbytes = self._cpu.pop(key)
+                self._cpu_bytes -= nbytes
+                removed = True
+            for memo_key in [k for k, v in self._path_hashes.items() if v == content_hash]:
+                del self._path_hashes[memo_key]
+            if removed:
+                self._invalidations += 1
+        return removed
+
+    def invalidate_variant(self, variant: str):
+        """Drop conditioning prepared by a model variant (e.g. after the model was unloaded)"""
+        suffix = f":{variant}"
+        with self._lock:
+            for key in [k for k in self._gpu if k.endswith(suffix)]:
+                self._gpu_bytes -= self._gpu.pop(key)[1]
+            for key in [k for k in self._cpu if k.endswith(suffix)]:
+                self._cpu_bytes -= self._cpu.pop(key)[1]
+
+    def invalidate_path(self, voice_path: str):
+        """Forget the remembered content hash of a path (e.g. after the file was replaced)"""
+        abs_path = os.path.abspath(voice_path)
+        with self._lock:
+            for memo_key in [k for k in self._path_hashes if k[0] == abs_path]:
+                del self._path_hashes[memo_key]
+
+    def clear(self):
+        """Drop every cached entry"""
+        with self._lock:
+            self._gpu.clear()
+            self._cpu.clear()
+            self._path_hashes.clear()
+            self._pinned.clear()
+            self._gpu_bytes = 0
+            self._cpu_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            hits = self._gpu_hits + self._cpu_hits
+            return {
+                "enabled": Config.ENABLE_VOICE_CONDITIONING_CACHE,
+                "hits": hits,
+                "gpu_hits": self._gpu_hits,
+                "cpu_hits": self._cpu_hits,
+                "misses": self._misses,
+                "hit_rate": (hits / max(1, hits + self._misses)) * 100,
+                "gpu_entries": len(self._gpu),
+                "cpu_entries": len(self._cpu),
+                "gpu_bytes": self._gpu_bytes,
+                "cpu_bytes": self._cpu_bytes,
+                "gpu_budget_bytes": self.gpu_budget_bytes,
+                "cpu_budget_bytes": self.cpu_budget_bytes,
+                "demotions": self._demotions,
+                "evictions": self._evictions,
+                "invalidations": self._invalidations,
+                "pinned_entries": len(self._pinned),
+                "pinned_hits": self._pinned_hits
+            }
+
+
+# Global cache instance
+_conditioning_cache: Optional[VoiceConditioningCache] = None
+
+
+def get_conditioning_cache() -> VoiceConditioningCache:
+    """Get the global voice conditioning cache instance"""
+    global _conditioning_cache
+    if _conditioning_cache is None:
+        _conditioning_cache = VoiceConditioningCache()
+    return _conditioning_cache
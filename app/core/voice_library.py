@@ -24,6 +24,10 @@ class VoiceLibrary:
         self._ensure_library_dir()
         self._metadata = self._load_metadata()
         self._config = self._load_config()
+        # Voice file path (as stored and resolved) -> file_hash, for get_hash_for_path()
+        self._hash_by_path: Dict[str, str] = {}
+        for metadata in self._metadata["voices"].values():
+            self._index_hash(metadata)
     
     def _ensure_library_dir(self):
         """Ensure the voice library directory exists"""
@@ -73,6 +77,58 @@ class VoiceLibrary:
                 hash_md5.update(chunk)
         return hash_md5.hexdigest()
     
+    def _invalidate_conditioning(self, metadata: Dict):
+        """Drop any cached voice conditioning prepared from this voice's file"""
+        from app.core.voice_conditioning import get_conditioning_cache
+        
+        cache = get_conditioning_cache()
+        if metadata.get("file_hash"):
+            cache.invalidate(metadata["file_hash"])
+        if metadata.get("path"):
+            cache.invalidate_path(metadata["path"])
+    
+    def _index_hash(self, metadata: Dict):
+        """Record a voice's file_hash under its stored and resolved path"""
+        if not metadata.get("file_hash") or not metadata.get("path"):
+            return
+        self._hash_by_path[metadata["path"]] = metadata["file_hash"]
+        try:
+            self._hash_by_path[str(Path(metadata["path"]).resolve())] = metadata["file_hash"]
+        except OSError:
+            pass
+    
+    def _unindex_hash(self, metadata: Dict):
+        """Forget the path -> file_hash entries of a removed or renamed voice"""
+        if not metadata.get("path"):
+            return
+        self._hash_by_path.pop(metadata["path"], None)
+        try:
+            self._hash_by_path.pop(str(Path(metadata["path"]).resolve()), None)
+        except OSError:
+            pass
+    
+    def get_hash_for_path(self, voice_path: str) -> Optional[str]:
+        """
+        Get the recorded content hash of a library voice file
+        
+        Paths returned by get_voice_path() are found without touching the
+        filesystem; other spellings of a library path cost one resolve().
+        
+        Args:
+            voice_path: Path to a voice file
+            
+        Returns:
+            The voice's file_hash, or None if the path is not a library voice
+        """
+        file_hash = self._hash_by_path.get(voice_path)
+        if file_hash is not None:
+            return file_hash
+        
+        try:
+            return self._hash_by_path.get(str(Path(voice_path).resolve()))
+        except OSError:
+            return None
+    
     def add_voice(self, voice_name: str, file_content: bytes, original_filename: str, language: str = "en") -> Dict:
         """
         Add a voice to the library
@@ -123,6 +179,9 @@ class VoiceLibrary:
         voice_filename = f"{voice_name}{file_ext}"
         voice_path = self.library_dir / voice_filename
         
+        # A leftover file at this path is being replaced, so forget its conditioning
+        self._invalidate_conditioning({"path": str(voice_path)})
+        
         with open(voice_path, 'wb') as f:
             f.write(file_content)
         
@@ -146,6 +205,7 @@ class VoiceLibrary:
         # Save metadata
         self._metadata["voices"][voice_name] = metadata
         self._save_metadata()
+        self._index_hash(metadata)
         
         return metadata
     
@@ -168,6 +228,7 @@ class VoiceLibrary:
                 # File is missing, remove from metadata
                 del self._metadata["voices"][voice_name]
                 self._save_metadata()
+                self._unindex_hash(metadata)
                 return None
             
             return str(voice_path)
@@ -206,7 +267,7 @@ class VoiceLibrary:
         
         # Clean up missing files from metadata
         for voice_name in voices_to_remove:
-            del self._metadata["voices"][voice_name]
+            self._unindex_hash(self._metadata["voices"].pop(voice_name))
         
         if voices_to_remove:
             self._save_metadata()
@@ -241,6 +302,9 @@ class VoiceLibrary:
         # Remove from metadata
         del self._metadata["voices"][voice_name]
         self._save_metadata()
+        self._unindex_hash(metadata)
+        
+        self._invalidate_conditioning(metadata)
         
         return True
     
@@ -299,9 +363,14 @@ class VoiceLibrary:
         metadata["path"] = str(new_path)
         
         # Save under new name and remove old
+        old_metadata = self._metadata["voices"][old_name]
         self._metadata["voices"][new_name] = metadata
         del self._metadata["voices"][old_name]
         self._save_metadata()
+        self._unindex_hash(old_metadata)
+        self._index_hash(metadata)
+        
+        self._invalidate_conditioning(old_metadata)
         
         return True
     
@@ -327,6 +396,7 @@ class VoiceLibrary:
             # File is missing, remove from metadata
             del self._metadata["voices"][actual_name]
             self._save_metadata()
+            self._unindex_hash(metadata)
             return None
         
         return {
@@ -349,6 +419,8 @@ class VoiceLibrary:
             if not voice_path.exists():
                 del self._metadata["voices"][voice_name]
                 removed_voices.append(voice_name)
+                self._unindex_hash(metadata)
+                self._invalidate_conditioning(metadata)
         
         if removed_voices:
             self._save_metadata()
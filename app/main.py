@@ -2,6 +2,12 @@
 Main FastAPI application
 """
 
+import time
+
+_imports_started = time.perf_counter()
+
+from app.core.startup_timing import record_phase, startup_phase, mark_server_ready
+
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
@@ -10,10 +16,14 @@ from fastapi.responses import JSONResponse
 from app.core.tts_model import initialize_model
 from app.core.voice_library import get_voice_library
 from app.core.background_tasks import start_background_processor, stop_background_processor
+from app.core.inference_scheduler import start_inference_scheduler, stop_inference_scheduler
+from app.core.audio_encoding import shutdown_audio_encoder
 from app.api.router import api_router
 from app.config import Config
 from app.core.version import get_version
 
+record_phase("imports", time.perf_counter() - _imports_started)
+
 
 ascii_art = r"""
   ____ _           _   _            _               
@@ -39,20 +49,27 @@ async def lifespan(app: FastAPI):
     
     # Initialize voice library to restore default voice settings
     print("Initializing voice library...")
-    voice_lib = get_voice_library()
-    default_voice = voice_lib.get_default_voice()
+    with startup_phase("voice_library"):
+        voice_lib = get_voice_library()
+        default_voice = voice_lib.get_default_voice()
     if default_voice:
         print(f"Restored default voice: {default_voice}")
     else:
         print("Using system default voice")
 
-    # Start background processor for long text TTS jobs
-    print("Starting long text background processor...")
-    await start_background_processor()
-    print("Long text background processor started")
+    with startup_phase("processor"):
+        # Start the inference scheduler that batches chunks across requests
+        print("Starting inference scheduler...")
+        await start_inference_scheduler()
+
+        # Start background processor for long text TTS jobs
+        print("Starting long text background processor...")
+        await start_background_processor()
+        print("Long text background processor started")
 
     # Note: We don't await the model initialization here
     # The server will start immediately and health checks will show initialization status
+    mark_server_ready()
     
     yield
     
@@ -62,6 +79,10 @@ async def lifespan(app: FastAPI):
     await stop_background_processor()
     print("Long text background processor stopped")
 
+    # Stop the inference scheduler
+    await stop_inference_scheduler()
+    shutdown_audio_encoder()
+
     # Cancel model initialization if it's still running
     if not model_init_task.done():
         model_init_task.cancel()
@@ -106,7 +127,8 @@ app.include_router(api_router)
 async def http_exception_handler(request, exc):
     return JSONResponse(
         status_code=exc.status_code,
-        content=exc.detail
+        content=exc.detail,
+        headers=getattr(exc, "headers", None)
     )
 
 
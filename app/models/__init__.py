@@ -13,6 +13,9 @@ from .responses import (
     SSEAudioInfo,
     SSEAudioDelta,
     SSEAudioDone,
+    WebSocketSessionEvent,
+    WebSocketSegmentEvent,
+    WebSocketErrorEvent,
     TTSProgressResponse,
     TTSStatusResponse,
     TTSStatisticsResponse,
@@ -48,6 +51,9 @@ __all__ = [
     "SSEAudioInfo",
     "SSEAudioDelta",
     "SSEAudioDone",
+    "WebSocketSessionEvent",
+    "WebSocketSegmentEvent",
+    "WebSocketErrorEvent",
     "TTSProgressResponse",
     "TTSStatusResponse",
     "TTSStatisticsResponse",
@@ -34,6 +34,8 @@ class LongTextRequest(BaseModel):
     exaggeration: Optional[float] = Field(None, ge=0.25, le=2.0, description="Emotion intensity")
     cfg_weight: Optional[float] = Field(None, ge=0.0, le=1.0, description="Pace control")
     temperature: Optional[float] = Field(None, ge=0.05, le=5.0, description="Sampling temperature")
+    seed: Optional[int] = Field(None, ge=0, le=4294967295, description="Random seed for reproducible generation")
+    reuse_existing: bool = Field(True, description="Reuse the output of an identical completed job; set false for fresh sampling")
     session_id: Optional[str] = Field(None, description="Frontend session ID for tracking")
     
     # Streaming parameters (same as standard streaming)
@@ -94,6 +96,8 @@ class LongTextJobMetadata(BaseModel):
     total_duration_seconds: Optional[float] = Field(None, ge=0, description="Total audio duration in seconds")
     retry_count: int = Field(default=0, ge=0, description="Number of times job has been retried")
     original_job_id: Optional[str] = Field(None, description="Original job ID if this is a retry")
+    reuse_key: Optional[str] = Field(None, description="Hash of text, voice, parameters and format identifying the output")
+    reused_from_job_id: Optional[str] = Field(None, description="Completed job whose output this job reused")
     is_archived: bool = Field(default=False, description="Whether job is archived in history")
     last_accessed: Optional[datetime] = Field(None, description="When user last interacted with this job")
     display_name: Optional[str] = Field(None, description="User-friendly name for the job")
@@ -167,6 +171,7 @@ class LongTextJobCreateResponse(BaseModel):
     total_chunks: int = Field(..., ge=1)
     status_url: str = Field(..., description="URL to check job status")
     sse_url: str = Field(..., description="URL for real-time progress updates")
+    reused_from_job_id: Optional[str] = Field(None, description="Identical completed job whose output was reused")
 
 
 class LongTextJobAction(BaseModel):
@@ -11,7 +11,7 @@ class TTSRequest(BaseModel):
     
     input: str = Field(..., description="The text to generate audio for", min_length=1, max_length=999999)
     voice: Optional[str] = Field("alloy", description="Voice to use (ignored - uses voice sample)")
-    response_format: Optional[str] = Field("wav", description="Audio format (always returns WAV)")
+    response_format: Optional[str] = Field("wav", description="Audio format: wav, mp3, opus, aac, flac, webm or pcm; mulaw or alaw (8 kHz telephony frames) when streaming")
     speed: Optional[float] = Field(1.0, description="Speed of speech (ignored)")
     stream_format: Optional[str] = Field("audio", description="Streaming format: 'audio' for raw audio stream, 'sse' for Server-Side Events")
     
@@ -19,12 +19,15 @@ class TTSRequest(BaseModel):
     exaggeration: Optional[float] = Field(None, description="Emotion intensity", ge=0.25, le=2.0)
     cfg_weight: Optional[float] = Field(None, description="Pace control", ge=0.0, le=1.0)
     temperature: Optional[float] = Field(None, description="Sampling temperature", ge=0.05, le=5.0)
+    seed: Optional[int] = Field(None, description="Random seed for reproducible generation", ge=0, le=4294967295)
     
     # Streaming-specific parameters
     streaming_chunk_size: Optional[int] = Field(None, description="Characters per streaming chunk", ge=50, le=500)
     streaming_strategy: Optional[str] = Field(None, description="Chunking strategy for streaming")
-    streaming_buffer_size: Optional[int] = Field(None, description="Number of chunks to buffer", ge=1, le=10)
+    streaming_buffer_size: Optional[int] = Field(None, description="Number of chunks generated ahead of playback", ge=1, le=10)
     streaming_quality: Optional[str] = Field(None, description="Speed vs quality trade-off")
+    streaming_frame_ms: Optional[int] = Field(None, description="Split streamed audio into frames of this many ms (0 = one piece per chunk)", ge=0, le=200)
+    streaming_pacing: Optional[bool] = Field(None, description="Send streamed audio frames in real time")
     
     @validator('input')
     def validate_input(cls, v):
@@ -32,6 +35,15 @@ class TTSRequest(BaseModel):
             raise ValueError('Input text cannot be empty')
         return v.strip()
     
+    @validator('response_format')
+    def validate_response_format(cls, v):
+        if v is not None:
+            allowed_formats = ['wav', 'mp3', 'opus', 'aac', 'flac', 'webm', 'pcm', 'mulaw', 'alaw']
+            if v.lower() not in allowed_formats:
+                raise ValueError(f'response_format must be one of: {", ".join(allowed_formats)}')
+            return v.lower()
+        return v
+    
     @validator('stream_format')
     def validate_stream_format(cls, v):
         if v is not None:
@@ -54,4 +66,9 @@ class TTSRequest(BaseModel):
             allowed_qualities = ['fast', 'balanced', 'high']
             if v not in allowed_qualities:
                 raise ValueError(f'streaming_quality must be one of: {", ".join(allowed_qualities)}')
-        return v 
\ No newline at end of file
+        return v 
+    @validator('streaming_frame_ms')
+    def validate_streaming_frame_ms(cls, v):
+        if v is not None and 0 < v < 20:
+            raise ValueError('streaming_frame_ms must be 0 or between 20 and 200')
+        return v
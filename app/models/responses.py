@@ -67,6 +67,8 @@ class SSEAudioInfo(BaseModel):
     sample_rate: int
     channels: int
     bits_per_sample: int
+    encoding: str = "pcm_s16le"  # pcm_s16le, mulaw or alaw
+    frame_ms: Optional[int] = None  # Duration of every delta when audio is sent in fixed frames
 
 
 class SSEAudioDelta(BaseModel):
@@ -83,6 +85,36 @@ class SSEAudioDone(BaseModel):
     usage: SSEUsageInfo
 
 
+class WebSocketSessionEvent(BaseModel):
+    """WebSocket session event model (session.ready, session.closed)"""
+    
+    type: str
+    session_id: str
+    response_format: Optional[str] = None
+    sample_rate: Optional[int] = None
+    channels: Optional[int] = None
+    segments: Optional[int] = None  # Segments spoken, on session.closed
+    audio_ms: Optional[float] = None  # Audio sent, on session.closed
+
+
+class WebSocketSegmentEvent(BaseModel):
+    """WebSocket per-segment event model (segment.queued, .started, .done, .failed, .cancelled)"""
+    
+    type: str
+    segment_id: int
+    text: Optional[str] = None  # On segment.queued
+    audio_ms: Optional[float] = None  # On segment.done
+    error: Optional[str] = None  # On segment.failed
+
+
+class WebSocketErrorEvent(BaseModel):
+    """WebSocket error event model"""
+    
+    type: str = "error"
+    message: str
+    error_type: str
+
+
 class TTSProgressResponse(BaseModel):
     """TTS progress response model"""
     
@@ -108,6 +140,7 @@ class TTSStatusResponse(BaseModel):
     progress: Optional[TTSProgressResponse] = None
     error_message: Optional[str] = None
     memory_usage: Optional[Dict[str, float]] = None
+    queue_wait_seconds: Optional[float] = None
     total_requests: int = 0
     message: Optional[str] = None
 
@@ -118,10 +151,12 @@ class TTSStatisticsResponse(BaseModel):
     total_requests: int
     completed_requests: int
     error_requests: int
+    cancelled_requests: int = 0
     success_rate: float
     average_duration_seconds: float
     average_text_length: float
     is_processing: bool
+    average_queue_wait_seconds: float = 0.0
 
 
 class APIInfoResponse(BaseModel):
@@ -2,6 +2,7 @@
 Pytest configuration file with shared fixtures and utilities for Chatterbox TTS API tests
 """
 
+import asyncio
 import os
 import sys
 import pytest
@@ -95,13 +96,68 @@ def api_client():
     return APIClient()
 
 
-@pytest.fixture(scope="session", autouse=True)
-def check_api_health(api_client):
-    """Ensure API is running before running tests"""
-    if not api_client.wait_for_health():
+@pytest.fixture(scope="session")
+def api_available(api_client):
+    """Check once whether the API is running"""
+    return api_client.wait_for_health()
+
+
+@pytest.fixture(autouse=True)
+def check_api_health(request):
+    """Ensure API is running before running tests (unit tests don't need it)"""
+    if request.node.get_closest_marker("unit"):
+        return
+    if not request.getfixturevalue("api_available"):
         pytest.skip(f"API not available at {BASE_URL}. Please start the server first.")
 
 
+@pytest.fixture
+def synthetic_model(monkeypatch):
+    """Serve generation in-process from the synthetic backend's standard model"""
+    pytest.importorskip("torch")
+    from app.config import Config
+    from app.core import tts_model
+    
+    monkeypatch.setattr(Config, "TTS_BACKEND", "synthetic")
+    for name in ("SYNTHETIC_LATENCY_PER_CHAR_MS", "SYNTHETIC_LATENCY_PER_BATCH_MS", "SYNTHETIC_LATENCY_PER_STEP_MS"):
+        monkeypatch.setattr(Config, name, 0.0)
+    monkeypatch.setattr(Config, "ENABLE_WARMUP", False)
+    monkeypatch.setattr(Config, "PINNED_VOICES", [])
+    monkeypatch.setattr(tts_model, "_backend", None)
+    monkeypatch.setattr(tts_model, "_device", "cpu")
+    monkeypatch.setattr(tts_model, "_model", None)
+    monkeypatch.setattr(tts_model, "_models", {})
+    monkeypatch.setattr(tts_model, "_model_footprints", {})
+    monkeypatch.setattr(tts_model, "_primary_variant", None)
+    monkeypatch.setattr(tts_model, "_is_multilingual", None)
+    monkeypatch.setattr(tts_model, "_supported_languages", {})
+    monkeypatch.setattr(tts_model, "_loading_variants", set())
+    monkeypatch.setattr(tts_model, "_registry_lock", asyncio.Lock())
+    monkeypatch.setattr(tts_model, "_initialization_state", tts_model.InitializationState.READY.value)
+    
+    model, footprint = tts_model._load_variant_sync("standard")
+    tts_model._register_model("standard", model, footprint, activate=True)
+    yield model
+    tts_model.shutdown_stage_executors()
+
+
+@pytest.fixture
+def settle():
+    """Await this to let ready tasks and callbacks on the running event loop run"""
+    async def settle():
+        for _ in range(5):
+            await asyncio.sleep(0)
+    return settle
+
+
+@pytest.fixture
+def voice_file(tmp_path):
+    """A stand-in reference clip; the synthetic backend derives a voice from its bytes"""
+    path = tmp_path / "voice.wav"
+    path.write_bytes(b"synthetic reference voice")
+    return str(path)
+
+
 @pytest.fixture
 def test_output_dir():
     """Create and provide test output directory"""
@@ -176,6 +232,7 @@ def pytest_configure(config):
     config.addinivalue_line("markers", "memory: memory management tests")
     config.addinivalue_line("markers", "voice: voice-related tests")
     config.addinivalue_line("markers", "regression: regression tests")
+    config.addinivalue_line("markers", "unit: unit tests that run in-process without the API server")
 
 
 def pytest_collection_modifyitems(config, items):
@@ -188,6 +188,153 @@ class TestTextToSpeechJSON:
         
         assert result["success"], f"TTS failed: {result.get('error', 'Unknown error')}"
         assert result["audio_size"] > 0
+        
+    def test_tts_json_with_seed(self, api_client):
+        """Test that seeded requests generate identical audio"""
+        payload = {"input": TEST_TEXTS["short"], "seed": 1234}
+        headers = {"Cache-Control": "no-cache"}
+        
+        first = api_client.post("/v1/audio/speech", json=payload, headers=headers)
+        second = api_client.post("/v1/audio/speech", json=payload, headers=headers)
+        
+        assert first.status_code == 200 and second.status_code == 200
+        # Both were generated, not served from the response cache
+        assert first.headers.get("X-Cache") != "HIT" and second.headers.get("X-Cache") != "HIT"
+        assert second.content == first.content
+        
+    def test_tts_result_url(self, api_client):
+        """Test fetching a seeded result by its content-addressed URL"""
+        response = api_client.post("/v1/audio/speech", json={"input": TEST_TEXTS["short"], "seed": 42})
+        assert response.status_code == 200
+        
+        location = response.headers.get("Content-Location")
+        if not location:
+            pytest.skip("Result URLs are disabled on this server")
+        
+        result = api_client.get(location)
+        assert result.status_code == 200
+        assert result.content == response.content
+        etag = result.headers["ETag"]
+        assert etag == response.headers["ETag"]
+        
+        not_modified = api_client.get(location, headers={"If-None-Match": etag})
+        assert not_modified.status_code == 304
+        
+        partial = api_client.get(location, headers={"Range": "bytes=0-43"})
+        assert partial.status_code == 206
+        assert partial.content == response.content[:44]
+        assert partial.headers["Content-Range"] == f"bytes 0-43/{len(response.content)}"
+        
+        assert api_client.get("/v1/audio/results/" + "0" * 64).status_code == 404
+
+    @pytest.mark.parametrize("response_format,content_type,magic", [
+        ("mp3", "audio/mpeg", None),
+        ("opus", "audio/ogg", b"OggS"),
+        ("flac", "audio/flac", b"fLaC"),
+        ("pcm", "audio/pcm", None),
+    ])
+    def test_tts_response_format(self, api_client, response_format, content_type, magic):
+        """Test compressed and raw response formats"""
+        data = {"input": TEST_TEXTS["short"], "response_format": response_format}
+        response = api_client.post("/v1/audio/speech", json=data)
+        if response.status_code == 400 and "ffmpeg" in response.text:
+            pytest.skip("ffmpeg is not installed on this server")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith(content_type)
+        assert response.headers["content-disposition"].endswith(f".{response_format}")
+        assert len(response.content) > 0
+        if magic:
+            assert response.content.startswith(magic)
+        if response_format == "pcm":
+            # 16-bit mono samples, no header
+            assert len(response.content) % 2 == 0
+            assert not response.content.startswith(b"RIFF")
+
+    def test_tts_stream_opus(self, api_client):
+        """Test incremental Ogg/Opus streaming"""
+        data = {"input": TEST_TEXTS["medium"], "response_format": "opus", "streaming_chunk_size": 50}
+        response = api_client.post("/v1/audio/speech/stream", json=data)
+        if response.status_code == 400 and "ffmpeg" in response.text:
+            pytest.skip("ffmpeg is not installed on this server")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("audio/ogg")
+        assert response.content.startswith(b"OggS")
+        # One continuous logical stream: a single beginning-of-stream page
+        assert response.content.count(b"OpusHead") == 1
+
+    def test_tts_stream_mulaw(self, api_client):
+        """Test 8 kHz μ-law telephony streaming in whole 20 ms frames"""
+        data = {"input": TEST_TEXTS["short"], "response_format": "mulaw"}
+        response = api_client.post("/v1/audio/speech/stream", json=data)
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("audio/basic")
+        assert len(response.content) > 0
+        assert len(response.content) % 160 == 0
+
+        # Only available as a framed stream
+        response = api_client.post("/v1/audio/speech", json=data)
+        assert response.status_code == 400
+
+    def test_tts_sse_fixed_frames(self, api_client):
+        """Test that SSE deltas carry exactly streaming_frame_ms of PCM each"""
+        import base64
+        import json
+
+        data = {"input": TEST_TEXTS["short"], "stream_format": "sse", "streaming_frame_ms": 100}
+        response = api_client.post("/v1/audio/speech", json=data)
+        assert response.status_code == 200
+
+        events = [json.loads(line[len("data: "):]) for line in response.text.splitlines() if line.startswith("data: ")]
+        info = events[0]
+        assert info["type"] == "speech.audio.info"
+        assert info["frame_ms"] == 100
+
+        frame_bytes = info["sample_rate"] // 10 * 2
+        deltas = [base64.b64decode(e["audio"]) for e in events if e["type"] == "speech.audio.delta"]
+        assert deltas
+        assert all(len(delta) == frame_bytes for delta in deltas)
+
+    def test_tts_invalid_response_format(self, api_client):
+        """Test that unknown response formats are rejected"""
+        data = {"input": TEST_TEXTS["short"], "response_format": "mp4"}
+        response = api_client.post("/v1/audio/speech", json=data)
+        assert response.status_code == 422
+
+
+class TestSpeechWebSocket:
+    """Test incremental text-in / audio-out over /v1/audio/speech/ws"""
+
+    def test_websocket_text_deltas(self, api_client):
+        """Test that text sent in pieces is segmented, acknowledged and spoken in order"""
+        import json
+        client = pytest.importorskip("websockets.sync.client")
+
+        url = api_client.base_url.replace("http", "ws", 1).rstrip("/") + "/v1/audio/speech/ws?response_format=pcm"
+        text = "Hello there. This sentence arrives in small pieces, like tokens from a language model."
+        events = []
+        audio_bytes = 0
+        with client.connect(url) as websocket:
+            for start in range(0, len(text), 7):
+                websocket.send(json.dumps({"type": "text", "text": text[start:start + 7]}))
+            websocket.send(json.dumps({"type": "close"}))
+            for message in websocket:
+                if isinstance(message, bytes):
+                    audio_bytes += len(message)
+                else:
+                    events.append(json.loads(message))
+
+        types = [event["type"] for event in events]
+        assert types[0] == "session.ready"
+        assert types[-1] == "session.closed"
+        queued = [event for event in events if event["type"] == "segment.queued"]
+        done = [event for event in events if event["type"] == "segment.done"]
+        # The first sentence is dispatched as soon as it is complete, the rest on close
+        assert len(queued) == 2
+        assert queued[0]["text"] == "Hello there."
+        assert [event["segment_id"] for event in done] == [event["segment_id"] for event in queued]
+        assert audio_bytes > 0 and audio_bytes % 2 == 0
 
 
 class TestTextToSpeechUpload:
@@ -271,6 +418,14 @@ class TestErrorHandling:
         )
         assert response.status_code == 422
         
+    def test_invalid_seed_json(self, api_client):
+        """Test negative seed (JSON)"""
+        response = api_client.post(
+            "/v1/audio/speech",
+            json={"input": "test", "seed": -1}
+        )
+        assert response.status_code == 422
+        
     def test_text_too_long_json(self, api_client):
         """Test very long text (JSON)"""
         long_text = TEST_TEXTS["very_long"]
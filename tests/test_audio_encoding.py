@@ -0,0 +1,172 @@
+"""
+Unit tests for response encoding: container magic bytes per format, encoder stats and streaming
+"""
+
+import asyncio
+import shutil
+import sys
+
+import pytest
+
+from app.core.audio_encoding import AudioEncoder, AudioEncodingError
+
+torch = pytest.importorskip("torch")
+
+pytestmark = pytest.mark.unit
+
+SAMPLE_RATE = 24000
+
+requires_ffmpeg = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg is not installed")
+
+
+def tone(seconds: float = 0.5) -> "torch.Tensor":
+    t = torch.arange(int(SAMPLE_RATE * seconds)) / SAMPLE_RATE
+    return (0.3 * torch.sin(2 * torch.pi * 220 * t)).unsqueeze(0)
+
+
+def is_adts(data: bytes) -> bool:
+    return data[0] == 0xFF and data[1] & 0xF6 == 0xF0
+
+
+@pytest.mark.parametrize("response_format, check", [
+    ("wav", lambda data: data[:4] == b"RIFF" and data[8:12] == b"WAVE"),
+    ("pcm", lambda data: len(data) == 12000 * 2),
+    ("mulaw", lambda data: len(data) == 4000 and set(data) != {0xFF}),
+    ("alaw", lambda data: len(data) == 4000 and set(data) != {0xD5}),
+])
+def test_native_formats(response_format, check):
+    assert check(AudioEncoder(max_workers=1).encode_sync(tone(), SAMPLE_RATE, response_format))
+
+
+@requires_ffmpeg
+@pytest.mark.parametrize("response_format, check", [
+    ("mp3", lambda data: data[:3] == b"ID3" or (data[0] == 0xFF and data[1] & 0xE0 == 0xE0)),
+    ("opus", lambda data: data[:4] == b"OggS" and b"OpusHead" in data[:64]),
+    ("aac", is_adts),
+    ("flac", lambda data: data[:4] == b"fLaC"),
+    ("webm", lambda data: data[:4] == b"\x1a\x45\xdf\xa3"),
+])
+def test_compressed_formats(response_format, check):
+    assert check(AudioEncoder(max_workers=1).encode_sync(tone(), SAMPLE_RATE, response_format))
+
+
+def test_stats_count_time_and_compression():
+    encoder = AudioEncoder(max_workers=1)
+
+    async def run():
+        try:
+            await encoder.encode(tone(), SAMPLE_RATE, "mulaw")
+            await encoder.encode(tone(), SAMPLE_RATE, "mulaw")
+            await encoder.encode(tone(), SAMPLE_RATE, "pcm")
+        finally:
+            encoder.shutdown()
+
+    asyncio.run(run())
+    formats = encoder.get_stats()["formats"]
+
+    assert formats["mulaw"]["encoded"] == 2
+    assert (formats["mulaw"]["pcm_bytes"], formats["mulaw"]["encoded_bytes"]) == (48000, 8000)
+    # 24 kHz 16-bit in, 8 kHz 8-bit out
+    assert formats["mulaw"]["compression_ratio"] == 6.0
+    assert formats["mulaw"]["total_encode_seconds"] > 0
+    assert formats["pcm"]["compression_ratio"] == 1.0
+
+
+def test_ffmpeg_formats_are_unavailable_without_ffmpeg():
+    encoder = AudioEncoder(max_workers=1)
+    encoder._ffmpeg_path = None
+
+    assert encoder.is_available("wav") and encoder.is_available("alaw")
+    assert not encoder.is_available("mp3") and not encoder.is_available("ogg")
+    assert encoder.get_stats()["available_formats"] == ["wav", "pcm"]
+    with pytest.raises(AudioEncodingError, match="requires ffmpeg"):
+        encoder.encode_sync(tone(), SAMPLE_RATE, "mp3")
+    with pytest.raises(AudioEncodingError, match="Unsupported"):
+        encoder.encode_sync(tone(), SAMPLE_RATE, "ogg")
+
+
+@pytest.fixture
+def passthrough_encoder(tmp_path):
+    """An encoder whose "ffmpeg" copies its input straight through, as soon as it arrives"""
+    script = tmp_path / "ffmpeg"
+    script.write_text(
+        f"#!{sys.executable}\n"
+        "import sys\n"
+        "while data := sys.stdin.buffer.read1(65536):\n"
+        "    sys.stdout.buffer.write(data)\n"
+        "    sys.stdout.buffer.flush()\n"
+    )
+    script.chmod(0o755)
+    encoder = AudioEncoder(max_workers=1)
+    encoder._ffmpeg_path = str(script)
+    return encoder
+
+
+async def first_page_before_input_ends(encoder, first_chunk: bytes, response_format: str):
+    """Feed one chunk, then read from the encoder while the input is still open"""
+    more_input = asyncio.Event()
+
+    async def pcm_chunks():
+        yield first_chunk
+        await more_input.wait()
+        yield first_chunk
+
+    pages = encoder.encode_stream(pcm_chunks(), SAMPLE_RATE, response_format)
+    try:
+        first = await asyncio.wait_for(pages.__anext__(), timeout=10)
+        more_input.set()
+        rest = [page async for page in pages]
+    finally:
+        await pages.aclose()
+    return first, rest
+
+
+def test_stream_yields_output_before_input_ends(passthrough_encoder):
+    first, rest = asyncio.run(first_page_before_input_ends(passthrough_encoder, b"pcm!", "opus"))
+
+    assert first == b"pcm!"
+    assert b"".join(rest) == b"pcm!"
+    stats = passthrough_encoder.get_stats()["streaming"]["opus"]
+    assert (stats["streams"], stats["pcm_bytes"], stats["encoded_bytes"]) == (1, 8, 8)
+
+
+def test_stream_passes_on_received_output_then_raises_feeder_errors(passthrough_encoder):
+    async def pcm_chunks():
+        yield b"audio"
+        raise RuntimeError("generation failed")
+
+    async def run():
+        pages = []
+        with pytest.raises(RuntimeError, match="generation failed"):
+            async for page in passthrough_encoder.encode_stream(pcm_chunks(), SAMPLE_RATE, "webm"):
+                pages.append(page)
+        return pages
+
+    assert b"".join(asyncio.run(run())) == b"audio"
+    assert passthrough_encoder.get_stats()["streaming"] == {}
+
+
+def test_stream_rejects_formats_that_cant_be_streamed(passthrough_encoder):
+    async def no_pcm():
+        return
+        yield
+
+    async def run(response_format):
+        async for _ in passthrough_encoder.encode_stream(no_pcm(), SAMPLE_RATE, response_format):
+            pass
+
+    for response_format in ("flac", "wav"):
+        with pytest.raises(AudioEncodingError, match="Unsupported streaming format"):
+            asyncio.run(run(response_format))
+
+
+@requires_ffmpeg
+@pytest.mark.parametrize("response_format, magic", [("opus", b"OggS"), ("webm", b"\x1a\x45\xdf\xa3")])
+def test_first_container_page_arrives_before_input_ends(response_format, magic):
+    encoder = AudioEncoder(max_workers=1)
+    pcm = bytes(tone(0.5).mul(32767).to(torch.int16).numpy().tobytes())
+
+    first, rest = asyncio.run(first_page_before_input_ends(encoder, pcm, response_format))
+
+    assert first.startswith(magic)
+    assert rest
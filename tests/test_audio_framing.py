@@ -0,0 +1,215 @@
+"""
+Unit tests for G.711 encoding, stream resampling and fixed-size framing
+"""
+
+import asyncio
+import math
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import audio_framing
+from app.core.audio_framing import (
+    FrameAssembler, FramePacer, PcmFramer, StreamingResampler, TelephonyEncoder, _g711_table
+)
+
+torch = pytest.importorskip("torch")
+
+pytestmark = pytest.mark.unit
+
+
+def reference_ulaw(sample: int) -> int:
+    """linear2ulaw of the ITU-T G.711 reference code, one sample at a time"""
+    value = sample >> 2
+    mask = 0xFF
+    if value < 0:
+        value, mask = -value, 0x7F
+    value = min(value, 8159) + 33
+    for segment, end in enumerate((0x3F, 0x7F, 0xFF, 0x1FF, 0x3FF, 0x7FF, 0xFFF, 0x1FFF)):
+        if value <= end:
+            return ((segment << 4) | ((value >> (segment + 1)) & 0xF)) ^ mask
+    return 0x7F ^ mask
+
+
+def reference_alaw(sample: int) -> int:
+    """linear2alaw of the ITU-T G.711 reference code, one sample at a time"""
+    value = sample >> 3
+    mask = 0xD5
+    if value < 0:
+        value, mask = -value - 1, 0x55
+    for segment, end in enumerate((0x1F, 0x3F, 0x7F, 0xFF, 0x1FF, 0x3FF, 0x7FF, 0xFFF)):
+        if value <= end:
+            shift = 1 if segment < 2 else segment
+            return ((segment << 4) | ((value >> shift) & 0xF)) ^ mask
+    return 0x7F ^ mask
+
+
+@pytest.mark.parametrize("law, reference", [("mulaw", reference_ulaw), ("alaw", reference_alaw)])
+def test_g711_table_matches_the_reference_encoder(law, reference):
+    table = _g711_table(law).tolist()
+    assert table == [reference(sample) for sample in range(-32768, 32768)]
+
+
+@pytest.mark.parametrize("law, silence, full_scale, negative_full_scale", [
+    ("mulaw", 0xFF, 0x80, 0x00),
+    ("alaw", 0xD5, 0xAA, 0x2A),
+])
+def test_g711_known_codes(law, silence, full_scale, negative_full_scale):
+    assert audio_framing.g711_silence(law) == silence
+    encoded = audio_framing.g711_encode(torch.tensor([0.0, 1.0, -1.0, 2.0]), law)
+    # Out-of-range input is clipped to full scale
+    assert list(encoded) == [silence, full_scale, negative_full_scale, full_scale]
+
+
+def test_g711_rejects_unknown_laws():
+    with pytest.raises(ValueError):
+        _g711_table("ulaw")
+
+
+def test_resampler_output_is_continuous_across_pieces():
+    generator = torch.Generator().manual_seed(0)
+    audio = torch.randn(24000, generator=generator) * 0.1
+
+    whole = StreamingResampler(24000, 8000)
+    expected = torch.cat([whole.process(audio), whole.flush()])
+
+    pieces = StreamingResampler(24000, 8000)
+    output, start = [], 0
+    for size in (1, 7, 100, 333, 4000, 19559):
+        output.append(pieces.process(audio[start:start + size]))
+        start += size
+    output.append(pieces.flush())
+
+    assert expected.numel() == 8000
+    assert torch.allclose(torch.cat(output), expected, atol=1e-6)
+
+
+def test_resampler_preserves_a_tone_without_delay():
+    tone = 0.5 * torch.sin(2 * math.pi * 440 * torch.arange(24000) / 24000)
+    resampler = StreamingResampler(24000, 8000)
+    output = torch.cat([resampler.process(tone), resampler.flush()])
+
+    expected = 0.5 * torch.sin(2 * math.pi * 440 * torch.arange(8000) / 8000)
+    # Away from the edges of the stream the output is the tone at the new rate, in phase
+    assert (output - expected)[200:-200].abs().max() < 1e-3
+
+
+def test_resampler_handles_non_integer_ratios_and_equal_rates():
+    resampler = StreamingResampler(22050, 8000)
+    audio = torch.zeros(22050)
+    length = sum(piece.numel() for piece in (resampler.process(audio[:10000]), resampler.process(audio[10000:])))
+    assert abs(length + resampler.flush().numel() - 8000) <= 1
+
+    same = StreamingResampler(8000, 8000)
+    assert torch.equal(same.process(torch.ones(1, 5)), torch.ones(5))
+    assert same.flush().numel() == 0
+
+
+def test_assembler_frames_straddling_pushes():
+    assembler = FrameAssembler(4, silence=0xFF)
+
+    assert [bytes(frame) for frame in assembler.push(b"abcdef")] == [b"abcd"]
+    assert assembler.push(b"g") == []
+    assert [bytes(frame) for frame in assembler.push(b"hijklm")] == [b"efgh", b"ijkl"]
+    assert bytes(assembler.flush()) == b"m\xff\xff\xff"
+    assert assembler.flush() is None
+
+
+def test_assembler_frames_are_views_of_the_pushed_data():
+    data = bytearray(b"abcdefgh")
+    frames = FrameAssembler(4).push(data)
+
+    data[0:1] = b"X"
+    assert [bytes(frame) for frame in frames] == [b"Xbcd", b"efgh"]
+
+    with pytest.raises(ValueError):
+        FrameAssembler(0)
+
+
+def test_telephony_frames_are_exactly_20_ms():
+    encoder = TelephonyEncoder(24000, "alaw", frame_ms=20)
+    frames = []
+    for _ in range(7):
+        # 70 ms per piece at 24 kHz, which never lines up with 20 ms frames
+        frames += encoder.push(torch.full((1, 1680), 0.25))
+    frames += encoder.flush()
+
+    assert len(frames) == 25
+    assert {len(frame) for frame in frames} == {160}
+    # The padding after the last sample is silence
+    assert bytes(frames[-1])[-1] == audio_framing.g711_silence("alaw")
+
+
+def test_pcm_frames_have_exact_sizes_and_share_one_buffer():
+    framer = PcmFramer(24000, 20)
+    frames = framer.push(torch.full((1, 1500), 0.5))
+
+    # 20 ms of 16-bit mono at 24 kHz is 960 bytes
+    assert [len(frame) for frame in frames] == [960, 960, 960]
+    assert len({id(frame.obj) for frame in frames}) == 1
+    assert bytes(frames[0][:2]) == (16383).to_bytes(2, "little", signed=True)
+
+    assert framer.push(torch.full((1, 300), -1.0)) == []
+    frames = framer.flush()
+    assert [len(frame) for frame in frames] == [960]
+    last = bytes(frames[-1])
+    # 60 samples carried over plus 300 pushed, then silence
+    assert last[718:720] == (-32767).to_bytes(2, "little", signed=True)
+    assert last[720:] == bytes(240)
+    assert framer.flush() == []
+
+
+class FakeClock:
+    """Stands in for the event loop's clock; sleeping advances it exactly"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def time(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(audio_framing, "asyncio", SimpleNamespace(get_running_loop=lambda: clock, sleep=clock.sleep))
+    return clock
+
+
+def release_times(pacer, clock, frames, stall_after=None, stall=0.0):
+    async def run():
+        times = []
+        for index in range(frames):
+            await pacer.wait()
+            times.append(round(clock.now, 6))
+            if index == stall_after:
+                clock.now += stall
+        return times
+    return asyncio.run(run())
+
+
+def test_pacer_sends_lead_frames_then_one_per_frame_duration(clock):
+    pacer = FramePacer(0.02, lead_frames=3)
+
+    assert release_times(pacer, clock, 6) == [0.0, 0.0, 0.0, 0.0, 0.02, 0.04]
+    assert pacer.underruns == 0
+
+
+def test_pacer_absorbs_small_delays_without_drift(clock):
+    pacer = FramePacer(0.02)
+
+    # Half a frame late: still on the original schedule afterwards
+    assert release_times(pacer, clock, 5, stall_after=1, stall=0.03) == [0.0, 0.02, 0.05, 0.06, 0.08]
+    assert pacer.underruns == 0
+
+
+def test_pacer_restarts_the_schedule_after_an_underrun(clock):
+    pacer = FramePacer(0.02, lead_frames=1)
+
+    # Generation stalls for 100 ms after the third frame; the backlog isn't burst out
+    times = release_times(pacer, clock, 6, stall_after=2, stall=0.1)
+    assert times == [0.0, 0.0, 0.02, 0.12, 0.14, 0.16]
+    assert pacer.underruns == 1
@@ -0,0 +1,143 @@
+"""
+Unit tests for the voice conditioning cache: tiering under byte budgets, counters and invalidation
+"""
+
+import pytest
+
+from app.core import voice_conditioning, voice_library
+from app.core.voice_conditioning import VoiceConditioningCache
+from app.core.voice_library import VoiceLibrary
+
+torch = pytest.importorskip("torch")
+
+pytestmark = pytest.mark.unit
+
+
+class Preparer:
+    """Builds 100 bytes of conditioning per voice and records which files it read"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, voice_path):
+        self.calls.append(voice_path)
+        with open(voice_path, "rb") as f:
+            first_byte = f.read(1)[0]
+        return {"speaker_emb": torch.full((25,), float(first_byte)), "tokens": (torch.zeros(0),)}
+
+
+@pytest.fixture
+def library(tmp_path, monkeypatch):
+    library = VoiceLibrary(str(tmp_path / "library"))
+    monkeypatch.setattr(voice_library, "_voice_library", library)
+    return library
+
+
+@pytest.fixture
+def cache(library, monkeypatch):
+    cache = VoiceConditioningCache(gpu_budget_mb=1, cpu_budget_mb=1)
+    cache.gpu_budget_bytes = 250
+    cache.cpu_budget_bytes = 150
+    monkeypatch.setattr(voice_conditioning, "_conditioning_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def voices(tmp_path):
+    paths = {}
+    for name in "abcd":
+        paths[name] = tmp_path / f"{name}.wav"
+        paths[name].write_bytes(name.encode() * 10)
+    return {name: str(path) for name, path in paths.items()}
+
+
+def test_least_recently_used_entries_are_demoted_then_evicted(cache, voices):
+    prepare = Preparer()
+    for name in "abc":
+        cache.get_or_prepare(voices[name], prepare)
+
+    # Two entries fit the 250 byte GPU budget; the oldest moves to the CPU tier
+    stats = cache.get_stats()
+    assert (stats["gpu_entries"], stats["gpu_bytes"], stats["cpu_entries"], stats["cpu_bytes"]) == (2, 200, 1, 100)
+    assert stats["demotions"] == 1
+
+    # A CPU hit is promoted back, demoting the now least recently used "b"
+    conds = cache.get_or_prepare(voices["a"], prepare)
+    assert conds["speaker_emb"][0] == ord("a")
+    assert prepare.calls == [voices[name] for name in "abc"]
+
+    # Demoting "c" overflows the 150 byte CPU budget, so "b" is dropped
+    cache.get_or_prepare(voices["d"], prepare)
+    stats = cache.get_stats()
+    assert (stats["gpu_entries"], stats["cpu_entries"], stats["cpu_bytes"]) == (2, 1, 100)
+    assert (stats["demotions"], stats["evictions"]) == (3, 1)
+
+    cache.get_or_prepare(voices["c"], prepare)
+    cache.get_or_prepare(voices["b"], prepare)
+    assert prepare.calls[-1] == voices["b"]
+
+
+def test_hit_and_miss_counters(cache, voices):
+    prepare = Preparer()
+    cache.get_or_prepare(voices["a"], prepare)
+    cache.get_or_prepare(voices["a"], prepare)
+    cache.get_or_prepare(voices["b"], prepare)
+    cache.get_or_prepare(voices["c"], prepare)
+    cache.get_or_prepare(voices["a"], prepare)
+
+    stats = cache.get_stats()
+    assert (stats["gpu_hits"], stats["cpu_hits"], stats["misses"]) == (1, 1, 3)
+    assert stats["hits"] == 2
+    assert stats["hit_rate"] == pytest.approx(40.0)
+    assert len(prepare.calls) == 3
+
+
+def test_identical_files_share_one_entry(cache, voices, tmp_path):
+    copy = tmp_path / "copy.wav"
+    copy.write_bytes(open(voices["a"], "rb").read())
+    prepare = Preparer()
+
+    cache.get_or_prepare(voices["a"], prepare)
+    cache.get_or_prepare(str(copy), prepare)
+
+    assert prepare.calls == [voices["a"]]
+    assert cache.get_stats()["gpu_entries"] == 1
+
+
+def test_deleting_a_library_voice_drops_its_conditioning(cache, library):
+    library.add_voice("alice", b"alice's reference clip", "alice.wav")
+    path = library.get_voice_path("alice")
+    cache.get_or_prepare(path, Preparer())
+
+    assert library.delete_voice("alice")
+
+    stats = cache.get_stats()
+    assert (stats["gpu_entries"], stats["invalidations"]) == (0, 1)
+
+
+def test_renaming_a_library_voice_drops_its_conditioning(cache, library):
+    library.add_voice("bob", b"bob's reference clip", "bob.wav")
+    cache.get_or_prepare(library.get_voice_path("bob"), Preparer())
+
+    assert library.rename_voice("bob", "robert")
+    assert cache.get_stats()["gpu_entries"] == 0
+
+    prepare = Preparer()
+    cache.get_or_prepare(library.get_voice_path("robert"), prepare)
+    assert prepare.calls == [library.get_voice_path("robert")]
+
+
+def test_replacing_a_file_at_a_library_path_drops_its_conditioning(cache, library):
+    # A leftover file from an earlier upload, used directly by path
+    leftover = library.library_dir / "carol.wav"
+    leftover.write_bytes(b"old clip")
+    prepare = Preparer()
+    assert cache.get_or_prepare(str(leftover), prepare)["speaker_emb"][0] == ord("o")
+
+    library.add_voice("carol", b"new clip", "carol.wav")
+    # The hash remembered for the old file at that path is forgotten
+    assert cache._path_hashes == {}
+    conds = cache.get_or_prepare(library.get_voice_path("carol"), prepare)
+
+    assert conds["speaker_emb"][0] == ord("n")
+    assert len(prepare.calls) == 2
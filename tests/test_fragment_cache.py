@@ -0,0 +1,71 @@
+"""
+Unit tests for the chunk-level audio fragment cache
+"""
+
+import asyncio
+
+import pytest
+
+from app.config import Config
+from app.core import fragment_cache, inference_scheduler
+from app.core.fragment_cache import FragmentCache
+from app.core.inference_scheduler import GenerationParams, InferenceScheduler
+
+torch = pytest.importorskip("torch")
+
+pytestmark = pytest.mark.unit
+
+PARAMS = GenerationParams(
+    voice_sample_path="voice.wav", language_id="en", exaggeration=0.5, temperature=0.8, diffusion_steps=2
+)
+
+
+def test_lru_eviction_by_bytes():
+    cache = FragmentCache(budget_mb=1)
+    # Room for two 100-sample float32 fragments
+    cache.budget_bytes = 800
+
+    cache.put("a", torch.zeros(1, 100))
+    cache.put("b", torch.zeros(1, 100))
+    assert cache.get("a") is not None
+    cache.put("c", torch.zeros(1, 100))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    # Larger than the whole budget: not stored
+    cache.put("huge", torch.zeros(1, 1000))
+    assert cache.get("huge") is None
+
+    stats = cache.get_stats()
+    assert (stats["entries"], stats["bytes"], stats["evictions"]) == (2, 800, 1)
+    assert (stats["hits"], stats["misses"]) == (3, 2)
+
+
+def test_generate_many_reuses_fragments_across_requests(monkeypatch):
+    generated = []
+
+    def generate_batch(prompts, params):
+        generated.extend(prompts)
+        return [torch.full((1, 10), float(len(prompt))) for prompt in prompts]
+
+    monkeypatch.setattr(inference_scheduler, "_generate_batch_sync", generate_batch)
+    monkeypatch.setattr(fragment_cache, "_fragment_cache", FragmentCache(budget_mb=1))
+    monkeypatch.setattr(Config, "ENABLE_FRAGMENT_CACHE", True)
+    monkeypatch.setattr(Config, "ENABLE_BATCH_SCHEDULER", True)
+    monkeypatch.setattr(Config, "ENABLE_STAGED_PIPELINE", False)
+    scheduler = InferenceScheduler(max_batch_size=4, collection_window_ms=0, max_queue_chunks=100)
+
+    async def run():
+        try:
+            first = await scheduler.generate_many(["Hello there.", "Welcome back."], PARAMS)
+            # Whitespace differences still hit the cache; only the new sentence is generated
+            second = await scheduler.generate_many(["Hello  there.", "Goodbye now."], PARAMS)
+            return first, second
+        finally:
+            await scheduler.stop()
+
+    first, second = asyncio.run(run())
+
+    assert generated == ["Hello there.", "Welcome back.", "Goodbye now."]
+    assert second[0].equal(first[0])
+    assert fragment_cache.get_fragment_cache().get_stats()["hits"] == 1
@@ -0,0 +1,297 @@
+"""
+Unit tests for the inference scheduler, run in-process on the synthetic backend
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.config import Config
+from app.core import inference_scheduler, tts_model
+from app.core.inference_scheduler import GenerationParams, InferenceScheduler, Priority, _PendingChunk
+
+pytestmark = pytest.mark.unit
+
+TEXTS = ["Hello there.", "This is the second chunk.", "And a third one to finish."]
+
+
+def make_params(voice_file: str, **overrides) -> GenerationParams:
+    values = dict(
+        voice_sample_path=voice_file,
+        language_id="en",
+        exaggeration=0.5,
+        temperature=0.8,
+        diffusion_steps=2
+    )
+    values.update(overrides)
+    return GenerationParams(**values)
+
+
+async def generate_and_stop(scheduler: InferenceScheduler, texts, params, **kwargs):
+    try:
+        return await scheduler.generate_many(texts, params, **kwargs)
+    finally:
+        await scheduler.stop()
+
+
+@pytest.fixture
+def recorded_batches(monkeypatch):
+    """Replace the model call with one that records each batch's prompts"""
+    batches = []
+
+    def generate_batch(prompts, params):
+        batches.append(list(prompts))
+        return [f"audio:{prompt}" for prompt in prompts]
+
+    monkeypatch.setattr(inference_scheduler, "_generate_batch_sync", generate_batch)
+    monkeypatch.setattr(Config, "ENABLE_BATCH_SCHEDULER", True)
+    monkeypatch.setattr(Config, "ENABLE_STAGED_PIPELINE", False)
+    monkeypatch.setattr(Config, "ENABLE_FRAGMENT_CACHE", False)
+    return batches
+
+
+@pytest.fixture
+def staged_scheduler(monkeypatch, synthetic_model):
+    monkeypatch.setattr(Config, "ENABLE_BATCH_SCHEDULER", True)
+    monkeypatch.setattr(Config, "ENABLE_STAGED_PIPELINE", True)
+    monkeypatch.setattr(Config, "ENABLE_FRAGMENT_CACHE", False)
+    return InferenceScheduler(max_batch_size=4, collection_window_ms=10, max_queue_chunks=100)
+
+
+def test_staged_pipeline_runs_on_synthetic_backend(staged_scheduler, voice_file):
+    """The synthetic model exposes both stages, so batches go through T3 then S3Gen"""
+    assert tts_model.supports_staged_generation()
+    stages_before = {name: dict(stats) for name, stats in tts_model._stage_stats.items()}
+    prompts_before = tts_model._prefill_stats["prompts"]
+
+    audio_list = asyncio.run(generate_and_stop(staged_scheduler, TEXTS, make_params(voice_file)))
+
+    assert len(audio_list) == len(TEXTS)
+    assert all(audio.shape[-1] > 0 for audio in audio_list)
+    assert tts_model._stage_stats["t3"]["calls"] > stages_before["t3"]["calls"]
+    assert tts_model._stage_stats["s3gen"]["calls"] >= stages_before["s3gen"]["calls"] + len(TEXTS)
+    assert tts_model._prefill_stats["prompts"] == prompts_before + len(TEXTS)
+    assert staged_scheduler.get_stats()["chunks_generated"] == len(TEXTS)
+
+
+def test_seeded_generation_is_reproducible(staged_scheduler, voice_file):
+    """The seed reaches both stages: vocoder noise is drawn from a seeded RNG"""
+    params = make_params(voice_file, seed=1234)
+
+    async def run():
+        try:
+            first = await staged_scheduler.generate_many(TEXTS, params)
+            second = await staged_scheduler.generate_many(TEXTS, params)
+            unseeded = await staged_scheduler.generate_many(TEXTS, make_params(voice_file))
+            return first, second, unseeded
+        finally:
+            await staged_scheduler.stop()
+
+    first, second, unseeded = asyncio.run(run())
+
+    for a, b, c in zip(first, second, unseeded):
+        assert a.equal(b)
+        assert not a.equal(c)
+
+
+def test_incremental_vocoding_uses_producing_model(staged_scheduler, synthetic_model, voice_file):
+    """Token-only results carry the model that generated them; windows cover the whole chunk"""
+    async def run():
+        try:
+            tokens, s3gen_ref, model = await staged_scheduler.generate_tokens(TEXTS[2], make_params(voice_file))
+            pieces = [
+                piece async for piece in tts_model.vocode_speech_tokens_incrementally(
+                    tokens, s3gen_ref, 2, window_tokens=8, overlap_tokens=2, model=model
+                )
+            ]
+            return tokens, model, pieces
+        finally:
+            await staged_scheduler.stop()
+
+    tokens, model, pieces = asyncio.run(run())
+
+    assert model is synthetic_model
+    assert len(pieces) > 1
+    samples_per_token = synthetic_model.sr // tts_model.S3_TOKENS_PER_SECOND
+    assert sum(piece.shape[-1] for piece in pieces) == tokens.shape[-1] * samples_per_token
+
+
+def test_concurrent_requests_share_batches(recorded_batches):
+    """Chunks of concurrent requests are batched together and routed back in order"""
+    scheduler = InferenceScheduler(max_batch_size=4, collection_window_ms=50, max_queue_chunks=100)
+    params = make_params("voice.wav")
+
+    async def run():
+        try:
+            return await asyncio.gather(
+                scheduler.generate_many(["a1", "a2", "a3"], params, request_id="a"),
+                scheduler.generate_many(["b1", "b2"], params, request_id="b")
+            )
+        finally:
+            await scheduler.stop()
+
+    first, second = asyncio.run(run())
+
+    assert first == ["audio:a1", "audio:a2", "audio:a3"]
+    assert second == ["audio:b1", "audio:b2"]
+    assert [len(batch) for batch in recorded_batches] == [4, 1]
+    assert scheduler.get_stats()["largest_batch"] == 4
+
+
+def test_chunks_with_different_params_are_not_batched(recorded_batches):
+    scheduler = InferenceScheduler(max_batch_size=4, collection_window_ms=50, max_queue_chunks=100)
+
+    async def run():
+        try:
+            return await asyncio.gather(
+                scheduler.generate_many(["calm"], make_params("voice.wav", exaggeration=0.3)),
+                scheduler.generate_many(["excited"], make_params("voice.wav", exaggeration=0.9))
+            )
+        finally:
+            await scheduler.stop()
+
+    assert asyncio.run(run()) == [["audio:calm"], ["audio:excited"]]
+    assert sorted(recorded_batches) == [["calm"], ["excited"]]
+
+
+@pytest.mark.parametrize("scheduler_enabled", [True, False])
+def test_generate_many_slices_request_into_batches(recorded_batches, monkeypatch, scheduler_enabled):
+    """All chunks of a request go out as max-size multi-prompt calls, in chunk order"""
+    monkeypatch.setattr(Config, "ENABLE_BATCH_SCHEDULER", scheduler_enabled)
+    scheduler = InferenceScheduler(max_batch_size=2, collection_window_ms=0, max_queue_chunks=100)
+    texts = ["one", "two", "three", "two", "four"]
+
+    async def run():
+        try:
+            return await scheduler.generate_many(texts, make_params("voice.wav"))
+        finally:
+            await scheduler.stop()
+
+    assert asyncio.run(run()) == [f"audio:{text}" for text in texts]
+    # The repeated chunk is generated once
+    assert recorded_batches == [["one", "two"], ["three", "four"]]
+
+
+def test_full_queue_rejects_new_work_but_not_admitted_streams(recorded_batches):
+    """Interactive chunks are held to the queue bound; streaming chunks of admitted requests are not"""
+    scheduler = InferenceScheduler(max_batch_size=4, collection_window_ms=0, max_queue_chunks=2)
+    params = make_params("voice.wav")
+    scheduler._chunks_per_second = 0.5
+
+    with pytest.raises(inference_scheduler.AdmissionRejectedError) as rejected:
+        scheduler.check_admission(3)
+    # One chunk over the limit drains in two seconds at the measured throughput
+    assert rejected.value.retry_after == 2
+
+    async def run():
+        try:
+            with pytest.raises(inference_scheduler.AdmissionRejectedError):
+                await scheduler.generate_many(["a", "b", "c"], params)
+            return await scheduler.generate_many(
+                ["s1", "s2", "s3"], params, priority=Priority.INTERACTIVE_STREAMING
+            )
+        finally:
+            await scheduler.stop()
+
+    assert asyncio.run(run()) == ["audio:s1", "audio:s2", "audio:s3"]
+    assert scheduler.get_stats()["rejected_requests"] == 2
+
+
+def test_take_batch_serves_higher_priority_first():
+    """The highest-priority chunk picks the batch; lower priorities fill spare slots"""
+    scheduler = InferenceScheduler(max_batch_size=2, collection_window_ms=0, max_queue_chunks=100)
+    shared = make_params("voice.wav")
+    other = make_params("other.wav")
+
+    async def run():
+        loop = asyncio.get_running_loop()
+
+        def chunk(text, params, priority, enqueued_at):
+            return _PendingChunk(text, params, loop.create_future(), priority=priority, enqueued_at=enqueued_at)
+
+        scheduler._pending = [
+            chunk("background", shared, Priority.BACKGROUND, 1.0),
+            chunk("interactive", shared, Priority.INTERACTIVE, 2.0),
+            chunk("other voice", other, Priority.INTERACTIVE, 3.0),
+            chunk("streaming", shared, Priority.INTERACTIVE_STREAMING, 4.0),
+        ]
+        return [[p.text for p in scheduler._take_batch()] for _ in range(3)]
+
+    assert asyncio.run(run()) == [["streaming", "interactive"], ["other voice"], ["background"]]
+
+
+def test_interactive_chunks_overtake_queued_background_work(recorded_batches, monkeypatch):
+    """Background chunks wait behind interactive ones and don't count towards admission"""
+    release = threading.Event()
+
+    def blocking_generate(prompts, params):
+        release.wait(5)
+        recorded_batches.append(list(prompts))
+        return [f"audio:{prompt}" for prompt in prompts]
+
+    monkeypatch.setattr(inference_scheduler, "_generate_batch_sync", blocking_generate)
+    scheduler = InferenceScheduler(max_batch_size=1, collection_window_ms=0, max_queue_chunks=100)
+    params = make_params("voice.wav")
+
+    async def run():
+        try:
+            running = asyncio.create_task(scheduler.generate_many(["running"], params))
+            await asyncio.sleep(0.05)
+            background = asyncio.create_task(
+                scheduler.generate_many(["job1", "job2"], params, priority=Priority.BACKGROUND)
+            )
+            await asyncio.sleep(0.01)
+            interactive = asyncio.create_task(scheduler.generate_many(["speech"], params))
+            await asyncio.sleep(0.01)
+
+            # Only the running chunk and the waiting interactive one count
+            assert scheduler.queued_chunks == 2
+            release.set()
+            await asyncio.gather(running, background, interactive)
+        finally:
+            release.set()
+            await scheduler.stop()
+
+    asyncio.run(run())
+
+    assert recorded_batches == [["running"], ["speech"], ["job1"], ["job2"]]
+    priorities = scheduler.get_stats()["priorities"]
+    assert priorities["background"]["max_queue_wait_seconds"] >= priorities["interactive"]["max_queue_wait_seconds"]
+
+
+def test_cancel_request_drops_queued_chunks(recorded_batches, monkeypatch):
+    """Cancelled chunks never reach the model; other requests are unaffected"""
+    release = threading.Event()
+
+    def blocking_generate(prompts, params):
+        release.wait(5)
+        recorded_batches.append(list(prompts))
+        return [f"audio:{prompt}" for prompt in prompts]
+
+    monkeypatch.setattr(inference_scheduler, "_generate_batch_sync", blocking_generate)
+    scheduler = InferenceScheduler(max_batch_size=1, collection_window_ms=0, max_queue_chunks=100)
+    params = make_params("voice.wav")
+
+    async def run():
+        try:
+            running = asyncio.create_task(scheduler.generate_many(["running"], params, request_id="keep"))
+            await asyncio.sleep(0.05)
+            cancelled = asyncio.create_task(scheduler.generate_many(["c1", "c2"], params, request_id="drop"))
+            kept = asyncio.create_task(scheduler.generate_many(["kept"], params, request_id="keep"))
+            await asyncio.sleep(0.05)
+
+            assert scheduler.cancel_request("drop") == 2
+            assert scheduler.cancel_request("drop") == 0
+            release.set()
+
+            with pytest.raises(asyncio.CancelledError):
+                await cancelled
+            return await running, await kept
+        finally:
+            release.set()
+            await scheduler.stop()
+
+    assert asyncio.run(run()) == (["audio:running"], ["audio:kept"])
+    assert recorded_batches == [["running"], ["kept"]]
+    assert scheduler.get_stats()["cancelled_chunks"] == 2
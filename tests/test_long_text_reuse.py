@@ -0,0 +1,105 @@
+"""
+Unit tests for reusing the output of identical completed long text jobs
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.api.endpoints import speech
+from app.config import Config
+from app.core import long_text_jobs, tts_model
+from app.core.long_text_jobs import LongTextJobManager
+from app.models.long_text import LongTextJobStatus
+
+pytestmark = pytest.mark.unit
+
+TEXT = "A long passage of text. " * 200
+
+
+class EmptyVoiceLibrary:
+    def get_default_voice(self):
+        return None
+
+    def get_voice_path(self, voice_name):
+        return None
+
+    def get_voice_language(self, voice_name):
+        return None
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    voice = tmp_path / "voice.wav"
+    voice.write_bytes(b"reference voice")
+    monkeypatch.setattr(Config, "LONG_TEXT_DATA_DIR", str(tmp_path / "jobs"))
+    monkeypatch.setattr(Config, "VOICE_SAMPLE_PATH", str(voice))
+    monkeypatch.setattr(Config, "LONG_TEXT_REUSE_OUTPUT", True)
+    monkeypatch.setattr(long_text_jobs, "get_voice_library", EmptyVoiceLibrary)
+    monkeypatch.setattr(speech, "get_voice_library", EmptyVoiceLibrary)
+    return LongTextJobManager()
+
+
+def finish(manager: LongTextJobManager, job_id: str, audio: bytes = b"ID3 audio"):
+    """Complete a job as the processor would, with ``audio`` as its output"""
+    output = manager._get_job_file_paths(job_id)['output_dir'] / "long_text.mp3"
+    output.write_bytes(audio)
+    assert manager.complete_job(job_id, "output/long_text.mp3", len(audio), 12.5)
+
+
+def test_identical_submission_reuses_completed_output(manager):
+    source_id, _ = manager.create_job(TEXT, exaggeration=0.5)
+    finish(manager, source_id)
+
+    # Spelling out the defaults matches a submission that omits them
+    job_id, _ = manager.create_job(TEXT, exaggeration=Config.EXAGGERATION, reuse_existing=True)
+
+    metadata = manager._load_job_metadata(job_id)
+    assert metadata.status == LongTextJobStatus.COMPLETED
+    assert metadata.reused_from_job_id == source_id
+    assert manager.get_job_file_path(job_id, 'output').read_bytes() == b"ID3 audio"
+
+
+def test_different_or_unrequested_submissions_are_generated(manager):
+    source_id, _ = manager.create_job(TEXT)
+    finish(manager, source_id)
+
+    for job_id, _ in (
+        manager.create_job(TEXT, temperature=0.3, reuse_existing=True),
+        manager.create_job(TEXT, output_format="wav", reuse_existing=True),
+        manager.create_job(TEXT),
+    ):
+        assert manager._load_job_metadata(job_id).status == LongTextJobStatus.PENDING
+
+
+def test_reuse_index_is_rebuilt_from_disk_and_skips_missing_output(manager):
+    source_id, _ = manager.create_job(TEXT)
+    finish(manager, source_id)
+
+    restarted = LongTextJobManager()
+    job_id, _ = restarted.create_job(TEXT, reuse_existing=True)
+    assert restarted._load_job_metadata(job_id).reused_from_job_id == source_id
+
+    for job in (source_id, job_id):
+        restarted.get_job_file_path(job, 'output').unlink()
+    job_id, _ = restarted.create_job(TEXT, reuse_existing=True)
+    assert restarted._load_job_metadata(job_id).status == LongTextJobStatus.PENDING
+
+
+def test_submissions_during_initialization_match_the_configured_model(manager, monkeypatch):
+    monkeypatch.setattr(Config, "USE_MULTILINGUAL_MODEL", True)
+    monkeypatch.setattr(Config, "LOAD_SECONDARY_MODEL", False)
+    monkeypatch.setattr(tts_model, "_model", None)
+    monkeypatch.setattr(tts_model, "_models", {})
+    text_hash = manager._generate_text_hash(TEXT)
+    initializing = manager._generate_reuse_key(text_hash, None, {}, "mp3")
+
+    multilingual = SimpleNamespace(variant="multilingual")
+    monkeypatch.setattr(tts_model, "_model", multilingual)
+    monkeypatch.setattr(tts_model, "_models", {"multilingual": multilingual})
+    assert manager._generate_reuse_key(text_hash, None, {}, "mp3") == initializing
+
+    monkeypatch.setattr(tts_model, "_model", None)
+    monkeypatch.setattr(tts_model, "_models", {})
+    monkeypatch.setattr(Config, "USE_MULTILINGUAL_MODEL", False)
+    assert manager._generate_reuse_key(text_hash, None, {}, "mp3") != initializing
@@ -0,0 +1,89 @@
+"""
+Unit tests for loading, activating and unloading model variants on the synthetic backend
+"""
+
+import asyncio
+
+import pytest
+
+from app.api.endpoints import speech
+from app.config import Config
+from app.core import tts_model
+from app.core.tts_model import ModelRegistryError, get_model, model_variant
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def registry(monkeypatch, synthetic_model):
+    monkeypatch.setattr(Config, "ROUTE_ENGLISH_TO_STANDARD_MODEL", True)
+    monkeypatch.setattr(Config, "MODEL_MEMORY_BUDGET_MB", 0)
+    return synthetic_model
+
+
+def test_load_keeps_both_variants_resident_and_routes_by_language(registry):
+    multilingual = asyncio.run(tts_model.load_model_variant("multilingual"))
+
+    assert get_model() is registry
+    assert get_model("en") is registry
+    assert get_model("fr") is multilingual
+    assert sorted(tts_model.get_loaded_models()["resident"]) == ["multilingual", "standard"]
+    # Already resident: returned without loading again
+    assert asyncio.run(tts_model.load_model_variant("multilingual")) is multilingual
+
+
+def test_load_rejects_unknown_and_concurrent_loads(registry, monkeypatch):
+    with pytest.raises(ValueError):
+        tts_model.check_can_load_variant("turbo")
+
+    monkeypatch.setattr(tts_model, "_loading_variants", {"multilingual"})
+    with pytest.raises(ModelRegistryError, match="already loading"):
+        asyncio.run(tts_model.load_model_variant("multilingual"))
+
+
+def test_activate_swaps_the_active_model(registry):
+    asyncio.run(tts_model.activate_model_variant("multilingual"))
+
+    assert model_variant(get_model()) == "multilingual"
+    assert tts_model.get_loaded_models()["active"] == "multilingual"
+    # English still goes to the resident English-only model
+    assert get_model("en") is registry
+
+
+def test_unload_waits_for_leases_and_reroutes_immediately(registry):
+    async def run():
+        await tts_model.activate_model_variant("multilingual")
+        with pytest.raises(ModelRegistryError, match="active"):
+            await tts_model.unload_model_variant("multilingual")
+
+        lease = tts_model.model_lease(registry)
+        lease.__enter__()
+        unload = asyncio.ensure_future(tts_model.unload_model_variant("standard"))
+        await asyncio.sleep(0.2)
+
+        # New requests no longer go to the unloading model, but it isn't shut down under the lease
+        assert model_variant(get_model("en")) == "multilingual"
+        assert not unload.done()
+
+        lease.__exit__(None, None, None)
+        await asyncio.wait_for(unload, timeout=5)
+
+    asyncio.run(run())
+    assert list(tts_model.get_loaded_models()["resident"]) == ["multilingual"]
+
+
+def test_cache_keys_follow_the_serving_variant(registry, monkeypatch, voice_file):
+    monkeypatch.setattr(Config, "ENABLE_SINGLE_FLIGHT", True)
+    monkeypatch.setattr(Config, "ENABLE_RESULT_URLS", True)
+
+    def keys():
+        return (
+            speech.single_flight_key("Bonjour.", voice_file, "fr", None, None, 1, "wav"),
+            speech.response_cache_key("Bonjour.", voice_file, "fr", None, None, 1, "wav")
+        )
+
+    before = keys()
+    asyncio.run(tts_model.load_model_variant("multilingual"))
+    after = keys()
+
+    assert before[0] != after[0] and before[1] != after[1]
@@ -0,0 +1,75 @@
+"""
+Unit tests for the readiness gate that holds requests during model initialization
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.readiness import ModelNotReadyError, ReadinessGate
+
+pytestmark = pytest.mark.unit
+
+
+def test_waiters_are_released_in_arrival_order(settle):
+    gate = ReadinessGate(max_waiters=10, timeout_seconds=5)
+    released = []
+
+    async def request(name):
+        await gate.wait()
+        released.append(name)
+
+    async def run():
+        requests = [asyncio.ensure_future(request(name)) for name in ("a", "b", "c")]
+        await settle()
+        assert gate.get_stats()["waiting"] == 3
+        gate.mark_ready()
+        await asyncio.gather(*requests)
+        # Once ready, requests pass straight through
+        assert await gate.wait() == 0.0
+
+    asyncio.run(run())
+    assert released == ["a", "b", "c"]
+    assert gate.get_stats()["released"] == 3
+
+
+def test_wait_times_out_with_retry_after():
+    gate = ReadinessGate(max_waiters=10, timeout_seconds=0.05)
+
+    with pytest.raises(ModelNotReadyError) as error:
+        asyncio.run(gate.wait())
+
+    assert error.value.retry_after == 1
+    stats = gate.get_stats()
+    assert (stats["timed_out"], stats["waiting"]) == (1, 0)
+
+
+def test_full_queue_rejects_new_waiters(settle):
+    gate = ReadinessGate(max_waiters=1, timeout_seconds=5)
+
+    async def run():
+        first = asyncio.ensure_future(gate.wait())
+        await settle()
+        with pytest.raises(ModelNotReadyError):
+            await gate.wait()
+        gate.mark_ready()
+        await first
+
+    asyncio.run(run())
+    assert gate.get_stats()["rejected_full"] == 1
+
+
+def test_failed_initialization_rejects_waiting_and_later_requests(settle):
+    gate = ReadinessGate(max_waiters=10, timeout_seconds=5)
+
+    async def run():
+        waiting = asyncio.ensure_future(gate.wait())
+        await settle()
+        gate.mark_failed("out of memory")
+        with pytest.raises(ModelNotReadyError, match="out of memory"):
+            await waiting
+        with pytest.raises(ModelNotReadyError, match="out of memory"):
+            await gate.wait()
+
+    asyncio.run(run())
+    assert gate.get_stats()["failed"] == 1
@@ -0,0 +1,98 @@
+"""
+Unit tests for the two-tier response cache and the keys requests are stored under
+"""
+
+import pytest
+
+from app.api.endpoints import speech
+from app.config import Config
+from app.core.response_cache import ResponseCache
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResponseCache(cache_dir=str(tmp_path / "responses"), memory_budget_mb=1, disk_budget_mb=1)
+    # Room for two 100-byte entries in memory and three on disk
+    cache.memory_budget_bytes = 200
+    cache.disk_budget_bytes = 300
+    return cache
+
+
+def test_recent_entries_are_served_from_memory_and_older_ones_from_disk(cache):
+    for key in ("a", "b", "c"):
+        cache.put(key, key.encode() * 100, "mp3")
+
+    assert cache.get("c") == (b"c" * 100, "mp3")
+    # Evicted from memory, still on disk; reading it promotes it again
+    assert cache.get("a") == (b"a" * 100, "mp3")
+    assert cache.get("a") == (b"a" * 100, "mp3")
+    assert cache.get("missing") is None
+
+    stats = cache.get_stats()
+    assert (stats["memory_hits"], stats["disk_hits"], stats["misses"]) == (2, 1, 1)
+    assert (stats["memory_entries"], stats["memory_bytes"]) == (2, 200)
+
+
+def test_tiers_evict_least_recently_used_by_bytes(cache):
+    for key in ("a", "b", "c"):
+        cache.put(key, key.encode() * 100, "wav")
+    cache.get("a")
+    cache.put("d", b"d" * 100, "wav")
+
+    stats = cache.get_stats()
+    assert (stats["disk_entries"], stats["disk_bytes"], stats["disk_evictions"]) == (3, 300, 1)
+    assert not (cache.cache_dir / "b.wav.audio").exists()
+    assert cache.get("b") is None
+
+    # Larger than a tier's budget: kept out of that tier only
+    cache.put("large", b"x" * 250, "wav")
+    assert cache.get("large") == (b"x" * 250, "wav")
+    assert cache.get_stats()["memory_bytes"] <= cache.memory_budget_bytes
+
+
+def test_disk_tier_is_reloaded_with_formats_after_restart(cache):
+    cache.put("a", b"a" * 100, "mp3")
+    cache.put("b", b"b" * 100, "opus")
+    # Leftovers of an interrupted write and of the old unformatted layout are removed
+    (cache.cache_dir / "c.wav.tmp").write_bytes(b"partial")
+    (cache.cache_dir / "d.audio").write_bytes(b"unknown format")
+
+    restarted = ResponseCache(cache_dir=str(cache.cache_dir), memory_budget_mb=1, disk_budget_mb=1)
+
+    assert restarted.get("b") == (b"b" * 100, "opus")
+    assert restarted.get("a") == (b"a" * 100, "mp3")
+    assert restarted.get_stats()["disk_hits"] == 2
+    assert sorted(path.name for path in cache.cache_dir.iterdir()) == ["a.mp3.audio", "b.opus.audio"]
+
+
+def test_replacing_an_entry_in_another_format_removes_the_old_file(cache):
+    cache.put("a", b"a" * 100, "mp3")
+    cache.put("a", b"A" * 50, "wav")
+
+    assert cache.get("a") == (b"A" * 50, "wav")
+    assert [path.name for path in cache.cache_dir.iterdir()] == ["a.wav.audio"]
+    assert cache.get_stats()["disk_bytes"] == 50
+
+
+def test_seeded_requests_are_keyed_only_when_the_seed_is_honoured(monkeypatch, voice_file):
+    monkeypatch.setattr(Config, "ENABLE_RESPONSE_CACHE", False)
+    monkeypatch.setattr(Config, "ENABLE_RESULT_URLS", True)
+    monkeypatch.setattr(speech, "get_model", lambda language_id=None: object())
+    staged = True
+    monkeypatch.setattr(speech, "supports_staged_generation", lambda model=None: staged)
+
+    def key(seed):
+        return speech.response_cache_key("Hello.", voice_file, "en", None, None, seed, "wav")
+
+    assert key(None) is None
+    assert key(7) is not None and key(7) != key(8)
+    headers = speech.speech_response_headers(b"audio", "MISS", key(7), 7)
+    assert headers["Content-Location"] == f"/audio/results/{key(7)}"
+
+    # The model would ignore the seed: nothing is stored or advertised as deterministic
+    staged = False
+    assert key(7) is None
+    headers = speech.speech_response_headers(b"audio", "BYPASS", key(7), 7)
+    assert "ETag" not in headers and "Content-Location" not in headers
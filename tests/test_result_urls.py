@@ -0,0 +1,103 @@
+"""
+Unit tests for serving stored results: ETag matching, byte ranges and If-Range
+"""
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.endpoints import speech
+from app.api.endpoints.speech import etag_matches, parse_byte_range
+from app.core.response_cache import ResponseCache
+
+pytestmark = pytest.mark.unit
+
+KEY = "ab" * 32
+AUDIO = bytes(range(100))
+
+
+class FakeRequest:
+    def __init__(self, **headers):
+        self.headers = {name.replace("_", "-"): value for name, value in headers.items()}
+
+
+@pytest.fixture
+def stored(tmp_path, monkeypatch):
+    cache = ResponseCache(cache_dir=str(tmp_path / "responses"), memory_budget_mb=1, disk_budget_mb=1)
+    cache.put(KEY, AUDIO, "mp3")
+    monkeypatch.setattr(speech, "get_response_cache", lambda: cache)
+    return speech.audio_etag(AUDIO)
+
+
+def fetch(**headers):
+    return asyncio.run(speech.get_audio_result(KEY, FakeRequest(**headers)))
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("bytes=0-9", (0, 9)),
+    ("bytes=90-", (90, 99)),
+    ("bytes=-10", (90, 99)),
+    ("bytes=-500", (0, 99)),
+    ("bytes=95-500", (95, 99)),
+    ("BYTES = 5-5", (5, 5)),
+    ("bytes=100-", None),
+    ("bytes=10-5", None),
+    ("bytes=-0", None),
+    ("bytes=0-4,10-14", None),
+    ("items=0-9", None),
+    ("bytes=a-b", None),
+])
+def test_parse_byte_range(header, expected):
+    assert parse_byte_range(header, 100) == expected
+
+
+def test_etag_matches_weakly_and_with_wildcard():
+    etag = '"abc"'
+    assert etag_matches('"abc"', etag)
+    assert etag_matches('W/"abc"', etag)
+    assert etag_matches('"xyz", W/"abc"', etag)
+    assert etag_matches(" * ", etag)
+    assert not etag_matches('"xyz"', etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches("", etag)
+
+
+def test_result_is_served_in_its_stored_format(stored):
+    response = fetch()
+
+    assert response.status_code == 200
+    assert response.body == AUDIO
+    assert response.media_type == "audio/mpeg"
+    assert response.headers["etag"] == stored
+
+
+def test_conditional_and_range_requests(stored):
+    assert fetch(if_none_match=f'W/{stored}').status_code == 304
+
+    partial = fetch(range="bytes=-10")
+    assert partial.status_code == 206
+    assert partial.body == AUDIO[90:]
+    assert partial.headers["content-range"] == "bytes 90-99/100"
+
+    with pytest.raises(HTTPException) as error:
+        fetch(range="bytes=200-")
+    assert error.value.status_code == 416
+    assert error.value.headers["Content-Range"] == "bytes */100"
+
+
+def test_if_range_only_applies_the_range_to_the_same_content(stored):
+    partial = fetch(range="bytes=0-9", if_range=stored)
+    assert (partial.status_code, partial.body) == (206, AUDIO[:10])
+
+    # Stale validator (or a date, which isn't supported): the whole result is sent
+    for validator in ('"stale"', "Wed, 21 Oct 2015 07:28:00 GMT"):
+        full = fetch(range="bytes=0-9", if_range=validator)
+        assert (full.status_code, full.body) == (200, AUDIO)
+
+
+def test_unknown_or_malformed_addresses_are_not_found(stored):
+    for content_hash in ("cd" * 32, "not-a-hash"):
+        with pytest.raises(HTTPException) as error:
+            asyncio.run(speech.get_audio_result(content_hash, FakeRequest()))
+        assert error.value.status_code == 404
@@ -0,0 +1,179 @@
+"""
+Unit tests for single-flight deduplication of in-flight requests
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.singleflight import SingleFlight
+
+pytestmark = pytest.mark.unit
+
+
+def test_do_shares_one_computation(settle):
+    flight = SingleFlight()
+    calls = []
+    release = None
+
+    async def work():
+        calls.append(1)
+        await release.wait()
+        return b"audio"
+
+    async def run():
+        nonlocal release
+        release = asyncio.Event()
+        callers = [asyncio.ensure_future(flight.do("key", work)) for _ in range(3)]
+        await settle()
+        release.set()
+        results = await asyncio.gather(*callers)
+        # Finished work isn't reused: the next caller starts over
+        results.append(await flight.do("key", work))
+        return results
+
+    assert asyncio.run(run()) == [b"audio"] * 4
+    assert len(calls) == 2
+    stats = flight.get_stats()
+    assert (stats["leaders"], stats["followers"], stats["in_flight_calls"]) == (2, 2, 0)
+
+
+def test_do_shares_errors():
+    flight = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.01)
+        raise ValueError("generation failed")
+
+    async def run():
+        return await asyncio.gather(flight.do("key", work), flight.do("key", work), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_do_cancels_work_only_when_every_caller_is_gone(settle):
+    flight = SingleFlight()
+    cancelled = []
+
+    async def work():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(1)
+            raise
+
+    async def run():
+        first = asyncio.ensure_future(flight.do("key", work))
+        second = asyncio.ensure_future(flight.do("key", work))
+        await settle()
+
+        first.cancel()
+        await settle()
+        assert not cancelled
+
+        second.cancel()
+        await settle()
+        assert cancelled == [1]
+
+    asyncio.run(run())
+    assert flight.get_stats()["cancelled"] == 1
+
+
+def test_stream_fans_out_with_replay_for_late_subscribers(settle):
+    flight = SingleFlight(poll_interval=0.01)
+    produced = []
+    gate = None
+
+    async def producer():
+        for item in ("a", "b", "c"):
+            if item == "b":
+                await gate.wait()
+            produced.append(item)
+            yield item
+
+    async def collect(subscription):
+        return [item async for item in subscription]
+
+    async def run():
+        nonlocal gate
+        gate = asyncio.Event()
+        first = asyncio.ensure_future(collect(flight.stream("key", producer)))
+        await settle()
+        # Joins after "a" was produced and still receives it
+        second = asyncio.ensure_future(collect(flight.stream("key", producer)))
+        await settle()
+        gate.set()
+        return await asyncio.gather(first, second)
+
+    assert asyncio.run(run()) == [["a", "b", "c"], ["a", "b", "c"]]
+    assert produced == ["a", "b", "c"]
+    assert flight.get_stats()["followers"] == 1
+
+
+def test_stream_stops_producer_when_last_subscriber_leaves(settle):
+    flight = SingleFlight(poll_interval=0.01)
+    disconnected = False
+    stopped = []
+
+    async def producer():
+        try:
+            yield "first"
+            await asyncio.sleep(10)
+            yield "never"
+        finally:
+            stopped.append(1)
+
+    async def is_disconnected():
+        return disconnected
+
+    async def run():
+        nonlocal disconnected
+        subscription = flight.stream("key", producer, is_disconnected=is_disconnected)
+        assert await subscription.__anext__() == "first"
+
+        disconnected = True
+        # The subscription ends quietly instead of raising
+        assert [item async for item in subscription] == []
+        await settle()
+
+    asyncio.run(run())
+    assert stopped == [1]
+    stats = flight.get_stats()
+    assert (stats["cancelled"], stats["in_flight_streams"]) == (1, 0)
+
+
+def test_stream_releases_items_and_runs_its_own_stream_for_requests_too_late_to_replay(settle):
+    flight = SingleFlight(poll_interval=0.01, replay_items=2)
+    started = []
+    gate = None
+
+    async def producer():
+        started.append(1)
+        for item in ("a", "b", "c", "d"):
+            if item == "d":
+                await gate.wait()
+            yield item
+
+    async def collect(subscription):
+        return [item async for item in subscription]
+
+    async def run():
+        nonlocal gate
+        gate = asyncio.Event()
+        first = flight.stream("key", producer)
+        assert [await first.__anext__() for _ in range(3)] == ["a", "b", "c"]
+        broadcast = flight._broadcasts["key"]
+        # Past the replay limit, items every subscriber has received are released
+        assert broadcast.items == [] and broadcast.start == 3
+
+        # Three items in, a new request can't be replayed from the start; it gets its own stream
+        late = asyncio.ensure_future(collect(flight.stream("key", producer)))
+        await settle()
+        gate.set()
+        return [item async for item in first], await late
+
+    assert asyncio.run(run()) == (["d"], ["a", "b", "c", "d"])
+    assert len(started) == 2
+    stats = flight.get_stats()
+    assert (stats["leaders"], stats["followers"], stats["too_late_to_join"]) == (2, 0, 1)
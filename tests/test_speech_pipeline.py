@@ -0,0 +1,96 @@
+"""
+Unit tests for the streaming chunk pipeline (lookahead and client disconnects)
+"""
+
+import asyncio
+from collections import defaultdict
+
+import pytest
+
+from app.api.endpoints import speech
+from app.core.inference_scheduler import GenerationParams
+
+pytestmark = pytest.mark.unit
+
+PARAMS = GenerationParams(
+    voice_sample_path="voice.wav", language_id="en", exaggeration=0.5, temperature=0.8, diffusion_steps=2
+)
+CHUNKS = ["first", "second", "third", "fourth"]
+
+
+class FakeScheduler:
+    """Stands in for the inference scheduler; chunks finish when the test releases them"""
+
+    def __init__(self):
+        self.started = []
+        self.cancelled = []
+        self.release = defaultdict(asyncio.Event)
+
+    async def generate(self, text, params, request_id=None, **options):
+        self.started.append(text)
+        try:
+            await self.release[text].wait()
+        except asyncio.CancelledError:
+            self.cancelled.append(text)
+            raise
+        return f"audio:{text}"
+
+
+class FakeRequest:
+    def __init__(self):
+        self.disconnected = False
+
+    async def is_disconnected(self):
+        return self.disconnected
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    fake = FakeScheduler()
+    monkeypatch.setattr(speech, "get_inference_scheduler", lambda: fake)
+    monkeypatch.setattr(speech, "DISCONNECT_POLL_INTERVAL", 0.01)
+    return fake
+
+
+def test_pipeline_keeps_lookahead_chunks_in_flight(scheduler, settle):
+    """Up to ``lookahead`` chunks generate ahead of the consumer, and results stay in order"""
+    async def run():
+        pipeline = speech.generate_chunks_pipelined(CHUNKS, PARAMS, lookahead=2)
+        first = asyncio.ensure_future(pipeline.__anext__())
+        await settle()
+        assert scheduler.started == ["first", "second"]
+
+        # A later chunk finishing first is held back until the earlier one is done
+        scheduler.release["second"].set()
+        scheduler.release["first"].set()
+        results = [await first]
+        await settle()
+        assert scheduler.started == ["first", "second", "third"]
+
+        for text in CHUNKS[2:]:
+            scheduler.release[text].set()
+        async for item in pipeline:
+            results.append(item)
+        return results
+
+    assert asyncio.run(run()) == [(index, f"audio:{text}") for index, text in enumerate(CHUNKS)]
+
+
+def test_pipeline_stops_when_client_disconnects(scheduler, settle):
+    """A disconnect while waiting raises ClientDisconnectedError and cancels chunks in flight"""
+    request = FakeRequest()
+
+    async def run():
+        pipeline = speech.generate_chunks_pipelined(CHUNKS, PARAMS, lookahead=3, http_request=request)
+        consumer = asyncio.ensure_future(pipeline.__anext__())
+        await settle()
+        request.disconnected = True
+        with pytest.raises(speech.ClientDisconnectedError):
+            await consumer
+        await pipeline.aclose()
+        await settle()
+        # Checked before asyncio.run() cancels whatever is left over
+        assert scheduler.started == ["first", "second", "third"]
+        assert sorted(scheduler.cancelled) == ["first", "second", "third"]
+
+    asyncio.run(run())
@@ -0,0 +1,160 @@
+"""
+Unit tests for WebSocket speech sessions: per-session limits and encoder failures
+"""
+
+import asyncio
+import json
+from collections import defaultdict
+
+import pytest
+
+from app.api.endpoints import speech_websocket
+from app.api.endpoints.speech_websocket import SpeechWebSocketSession
+from app.config import Config
+from app.core.inference_scheduler import GenerationParams
+from app.core.text_processing import IncrementalTextSegmenter
+
+torch = pytest.importorskip("torch")
+
+pytestmark = pytest.mark.unit
+
+PARAMS = GenerationParams(
+    voice_sample_path="voice.wav", language_id="en", exaggeration=0.5, temperature=0.8, diffusion_steps=2
+)
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.incoming = asyncio.Queue()
+        self.events = []
+        self.audio = []
+        self.close_code = None
+
+    def send_message(self, **message):
+        self.incoming.put_nowait({"type": "websocket.receive", "text": json.dumps(message)})
+
+    async def receive(self):
+        return await self.incoming.get()
+
+    async def send_text(self, text):
+        self.events.append(json.loads(text))
+
+    async def send_bytes(self, data):
+        self.audio.append(data)
+
+    async def close(self, code=1000):
+        self.close_code = code
+        self.incoming.put_nowait({"type": "websocket.disconnect"})
+
+    def of_type(self, kind):
+        return [event for event in self.events if event["type"] == kind]
+
+
+class FakeScheduler:
+    def check_admission(self, chunks):
+        pass
+
+    def cancel_request(self, request_id):
+        pass
+
+    def pop_request_queue_wait(self, request_id):
+        pass
+
+
+class FailingEncoder:
+    """Takes the first piece of PCM, then fails like an ffmpeg process that exited"""
+
+    async def encode_stream(self, pcm_chunks, sample_rate, response_format):
+        async for _ in pcm_chunks:
+            yield b"page"
+            raise RuntimeError("ffmpeg exited with code 1")
+
+
+@pytest.fixture
+def session(monkeypatch):
+    release = defaultdict(asyncio.Event)
+
+    def start_chunk_generation(text, params, request_id, incremental):
+        async def generate():
+            await release[text].wait()
+            return text
+        return asyncio.ensure_future(generate())
+
+    async def chunk_audio_pieces(result, params, incremental):
+        for _ in range(10):
+            yield torch.zeros(1, 240)
+
+    monkeypatch.setattr(speech_websocket, "get_model", lambda language_id=None: type("Model", (), {"sr": 24000}))
+    monkeypatch.setattr(speech_websocket, "use_incremental_vocoding", lambda: False)
+    monkeypatch.setattr(speech_websocket, "start_chunk_generation", start_chunk_generation)
+    monkeypatch.setattr(speech_websocket, "chunk_audio_pieces", chunk_audio_pieces)
+    monkeypatch.setattr(speech_websocket, "get_inference_scheduler", FakeScheduler)
+    monkeypatch.setattr(speech_websocket, "get_audio_encoder", FailingEncoder)
+
+    def create(response_format="pcm"):
+        websocket = FakeWebSocket()
+        segmenter = IncrementalTextSegmenter(50, "sentence")
+        return SpeechWebSocketSession(websocket, PARAMS, segmenter, response_format), websocket, release
+    return create
+
+
+def test_text_beyond_the_unspoken_length_limit_is_rejected(session, monkeypatch):
+    monkeypatch.setattr(Config, "MAX_TOTAL_LENGTH", 40)
+    ws_session, websocket, _ = session()
+
+    async def run():
+        websocket.send_message(type="text", text="The first sentence. ")
+        websocket.send_message(type="text", text="Then a second one ")
+        websocket.send_message(type="text", text="and more")
+        websocket.incoming.put_nowait({"type": "websocket.disconnect"})
+        await asyncio.wait_for(ws_session.run(), timeout=5)
+
+    asyncio.run(run())
+
+    assert [event["text"] for event in websocket.of_type("segment.queued")] == ["The first sentence."]
+    errors = websocket.of_type("error")
+    assert len(errors) == 1 and errors[0]["error_type"] == "validation_error"
+    assert ws_session.segmenter.pending == "Then a second one "
+
+
+def test_segments_beyond_the_queue_limit_fail(session, monkeypatch):
+    monkeypatch.setattr(Config, "WEBSOCKET_MAX_ACTIVE_SEGMENTS", 1)
+    monkeypatch.setattr(Config, "WEBSOCKET_MAX_QUEUED_SEGMENTS", 2)
+    ws_session, websocket, release = session()
+
+    async def run():
+        for text in ("One. ", "Two. ", "Three. "):
+            websocket.send_message(type="text", text=text)
+        websocket.send_message(type="close")
+        task = asyncio.ensure_future(ws_session.run())
+        while len(websocket.of_type("segment.queued")) + len(websocket.of_type("segment.failed")) < 3:
+            await asyncio.sleep(0.01)
+        release["One."].set()
+        release["Two."].set()
+        await asyncio.wait_for(task, timeout=5)
+
+    asyncio.run(run())
+
+    assert [event["segment_id"] for event in websocket.of_type("segment.done")] == [0, 1]
+    failed = websocket.of_type("segment.failed")
+    assert [event["segment_id"] for event in failed] == [2]
+    assert "Too many segments" in failed[0]["error"]
+
+
+def test_encoder_failure_is_reported_and_closes_the_session(session):
+    ws_session, websocket, release = session("mp3")
+
+    async def run():
+        release["Hello there."].set()
+        websocket.send_message(type="text", text="Hello there. ")
+        websocket.send_message(type="close")
+        # Without the failure callback the sender blocks on the full PCM queue and close never returns
+        await asyncio.wait_for(ws_session.run(), timeout=5)
+
+    asyncio.run(run())
+
+    errors = websocket.of_type("error")
+    assert [error["error_type"] for error in errors] == ["encoding_error"]
+    assert "ffmpeg exited" in errors[0]["message"]
+    assert websocket.close_code == 1011
+    assert websocket.of_type("session.closed") == []
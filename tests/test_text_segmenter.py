@@ -0,0 +1,77 @@
+"""
+Unit tests for splitting incrementally arriving text into streaming chunks
+"""
+
+import pytest
+
+from app.core.text_processing import IncrementalTextSegmenter
+
+pytestmark = pytest.mark.unit
+
+
+def test_sentence_chunks_complete_once_the_following_whitespace_arrives():
+    segmenter = IncrementalTextSegmenter(50, "sentence")
+
+    assert segmenter.push("Hello there. How are") == ["Hello there."]
+    assert segmenter.push(" you?") == []
+    assert segmenter.pending == "How are you?"
+    assert segmenter.push(" Fine") == ["How are you?"]
+    assert segmenter.flush() == ["Fine"]
+    assert segmenter.pending == ""
+
+
+def test_paragraph_chunks_end_at_a_blank_line():
+    segmenter = IncrementalTextSegmenter(50, "paragraph")
+
+    assert segmenter.push("First paragraph. Still first.\n") == []
+    assert segmenter.push("\nSecond") == ["First paragraph. Still first."]
+    assert segmenter.flush() == ["Second"]
+
+
+def test_word_chunks_keep_the_last_word_until_it_is_complete():
+    segmenter = IncrementalTextSegmenter(50, "word")
+
+    assert segmenter.push("one two three four five") == []
+    assert segmenter.push(" six seven eight nine ten eleven") == ["one two three four five six seven eight nine ten"]
+    assert segmenter.pending == "eleven"
+
+
+def test_fixed_chunks_are_cut_at_the_chunk_size():
+    segmenter = IncrementalTextSegmenter(50, "fixed")
+
+    assert segmenter.push("x" * 120) == ["x" * 50, "x" * 50]
+    assert segmenter.pending == "x" * 20
+
+
+def test_quality_presets_choose_size_and_strategy():
+    segmenter = IncrementalTextSegmenter(quality="fast")
+    assert (segmenter.chunk_size, segmenter.strategy) == (100, "word")
+
+    segmenter = IncrementalTextSegmenter(quality="high")
+    assert (segmenter.chunk_size, segmenter.strategy) == (300, "paragraph")
+
+
+def test_text_without_a_boundary_breaks_at_clauses_then_words_then_size():
+    segmenter = IncrementalTextSegmenter(50, "sentence")
+    assert segmenter.push("a clause that goes on, and on and on without any end in sight at all ") == [
+        "a clause that goes on,"
+    ]
+
+    segmenter = IncrementalTextSegmenter(20, "sentence")
+    assert segmenter.push("no commas in this text at all") == ["no commas in this"]
+
+    segmenter = IncrementalTextSegmenter(50, "sentence")
+    assert segmenter.push("x" * 120) == ["x" * 50, "x" * 50]
+    assert len(segmenter.pending) == 20
+
+
+def test_flush_and_clear():
+    segmenter = IncrementalTextSegmenter(50, "sentence")
+    assert segmenter.flush() == []
+    assert segmenter.push("   ") == []
+    assert segmenter.flush() == []
+
+    segmenter.push("Pending words")
+    segmenter.clear()
+    assert segmenter.pending == ""
+    assert segmenter.flush() == []
@@ -0,0 +1,89 @@
+"""
+Unit tests for the vLLM backend's compatibility checks against the installed chatterbox-vllm
+"""
+
+import importlib.metadata
+import sys
+from types import ModuleType, SimpleNamespace
+
+import pytest
+
+from app.config import Config
+from app.core import tts_model
+from app.core.tts_model import VLLMBackend
+
+pytestmark = pytest.mark.unit
+
+STAGED_MODEL = SimpleNamespace(
+    t3=None, s3gen=None, t3_config=None, update_exaggeration=None, get_supported_languages=None
+)
+
+
+@pytest.fixture
+def chatterbox_vllm(monkeypatch):
+    """A stand-in chatterbox_vllm.tts module with the hooks staged generation uses"""
+    module = ModuleType("chatterbox_vllm.tts")
+    module.punc_norm = str
+    module.SPEECH_TOKEN_OFFSET = 0
+    module.drop_invalid_tokens = lambda tokens: tokens
+    module.calls = []
+
+    class ChatterboxTTS:
+        @classmethod
+        def from_pretrained(cls, max_batch_size, max_model_len, compile, s3gen_use_fp16, target_device):
+            module.calls.append({})
+            return SimpleNamespace(variant="english")
+
+        @classmethod
+        def from_pretrained_multilingual(cls, *args, **kwargs):
+            module.calls.append(kwargs)
+            return SimpleNamespace(variant="multilingual")
+
+    module.ChatterboxTTS = ChatterboxTTS
+    package = ModuleType("chatterbox_vllm")
+    package.tts = module
+    monkeypatch.setitem(sys.modules, "chatterbox_vllm", package)
+    monkeypatch.setitem(sys.modules, "chatterbox_vllm.tts", module)
+    tts_model._staged_generation_tested.cache_clear()
+    yield module
+    tts_model._staged_generation_tested.cache_clear()
+
+
+def installed_version(monkeypatch, version):
+    def fake_version(name):
+        if version is None:
+            raise importlib.metadata.PackageNotFoundError(name)
+        return version
+    monkeypatch.setattr(importlib.metadata, "version", fake_version)
+
+
+def test_prefix_caching_is_off_by_default_and_only_passed_when_accepted(chatterbox_vllm, monkeypatch):
+    pytest.importorskip("torch")
+    backend = VLLMBackend()
+
+    monkeypatch.setattr(Config, "VLLM_ENABLE_PREFIX_CACHING", False)
+    backend.load_variant("multilingual", "cpu")
+    assert "enable_prefix_caching" not in chatterbox_vllm.calls[-1]
+
+    monkeypatch.setattr(Config, "VLLM_ENABLE_PREFIX_CACHING", True)
+    backend.load_variant("multilingual", "cpu")
+    assert chatterbox_vllm.calls[-1]["enable_prefix_caching"] is True
+
+    # A loader without the keyword (or **kwargs) is called without it
+    backend.load_variant("standard", "cpu")
+    assert chatterbox_vllm.calls[-1] == {}
+
+
+@pytest.mark.parametrize("version, staged", [("0.2.1", True), ("0.3.0", False), (None, False)])
+def test_staged_generation_requires_a_tested_library_version(chatterbox_vllm, monkeypatch, version, staged):
+    installed_version(monkeypatch, version)
+
+    assert VLLMBackend().supports_staged_generation(STAGED_MODEL) is staged
+
+
+def test_staged_generation_requires_the_library_hooks(chatterbox_vllm, monkeypatch):
+    installed_version(monkeypatch, "0.2.1")
+    assert not VLLMBackend().supports_staged_generation(SimpleNamespace(t3=None))
+
+    del chatterbox_vllm.punc_norm
+    assert not VLLMBackend().supports_staged_generation(STAGED_MODEL)